@@ -4,18 +4,42 @@ Aplikasi Streamlit untuk membuat dan memverifikasi tanda tangan digital
 """
 
 import streamlit as st
-from io import BytesIO
 import base64
+import hashlib
+import re
+import textwrap
+import time
+from contextlib import nullcontext
 
 # Import modules
-from crypto.rsa_utils import (
-    f20221310104_generate_key_pair,
-    f20221310104_export_public_key,
-    f20221310104_export_private_key,
-    f20221310104_import_public_key
+# Package crypto/qris memuat submodul (PyCryptodome, qrcode, Pillow, zxing-cpp)
+# secara lazy saat atribut pertama kali dipakai, sehingga halaman yang tidak
+# membutuhkannya tidak ikut menanggung biaya import
+import crypto
+import qris
+from instrumentation import (
+    f20221310104_record_stage,
+    f20221310104_reset_tracing,
+    f20221310104_stage_rows,
+    f20221310104_tracing_scope
 )
-from crypto.signature import f20221310104_sign_message, f20221310104_verify_signature, f20221310104_get_hash_hex
-from qris.qr_generator import f20221310104_create_signature_qris, f20221310104_decode_qris_data, f20221310104_qris_to_bytes
+from session_store import f20221310104_get_session_store
+
+# Awal eksekusi script; Streamlit menjalankan ulang seluruh script di tiap rerun
+_RUN_START = time.perf_counter()
+
+# Level kompresi PNG untuk QRIS (0 = cepat/besar, 9 = lambat/kecil)
+QRIS_PNG_COMPRESS_LEVEL = 6
+
+# Pilihan kebijakan versi/error correction QR (label -> jenis kebijakan qris.qr_policy)
+QR_POLICY_OPTIONS = {
+    "H tetap (tahan rusak, untuk cetak)": "fixed",
+    "QR terkecil (layar ke layar)": "smallest",
+    "ECC maksimum pada versi tertentu": "max_ecc",
+}
+
+# Pesan lebih panjang dari ini tidak di-hash untuk preview; hash dihitung saat signing
+HASH_PREVIEW_MAX_CHARS = 256 * 1024
 
 # Page configuration
 st.set_page_config(
@@ -26,7 +50,7 @@ st.set_page_config(
 )
 
 # Custom CSS untuk tampilan menarik
-st.markdown("""
+APP_CSS = """
 <style>
     /* Import font */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
@@ -427,7 +451,151 @@ st.markdown("""
         color: rgba(255, 255, 255, 0.9) !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_resource
+def f20221310104_app_css() -> str:
+    """
+    CSS aplikasi yang sudah diminify (komentar dan whitespace dibuang)
+    
+    Di-cache per proses sehingga rerun hanya mengirim string yang sama
+    tanpa membangunnya ulang.
+    """
+    css = re.sub(r"/\*.*?\*/", "", APP_CSS, flags=re.S)
+    return re.sub(r"\s+", " ", css).strip()
+
+
+def f20221310104_minify_html(html: str) -> str:
+    """Buang indentasi dan baris kosong dari potongan HTML statis"""
+    return "\n".join(line.strip() for line in html.splitlines() if line.strip())
+
+
+st.markdown(f20221310104_app_css(), unsafe_allow_html=True)
+
+
+def f20221310104_hash_preview(message: str):
+    """
+    Hitung hash SHA-256 untuk preview dengan cache di session state
+
+    Digest disimpan bersama isi pesan sehingga rerun tanpa perubahan pesan
+    tidak menghitung ulang hash. Pesan di atas HASH_PREVIEW_MAX_CHARS tidak
+    di-hash (ditunda sampai signing).
+
+    Args:
+        message: Pesan yang akan di-hash
+
+    Returns:
+        Tuple (hash hex atau None jika ditunda, waktu hashing dalam ms,
+        True jika diambil dari cache)
+    """
+    cached = st.session_state.get('hash_preview')
+    if cached is not None and cached["message"] == message:
+        return cached["digest"], cached["elapsed_ms"], True
+    
+    if len(message) > HASH_PREVIEW_MAX_CHARS:
+        return None, 0.0, False
+    
+    start = time.perf_counter()
+    digest = crypto.f20221310104_get_hash_hex(message)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    st.session_state.hash_preview = {"message": message, "digest": digest, "elapsed_ms": elapsed_ms}
+    return digest, elapsed_ms, False
+
+
+def f20221310104_read_uploaded_qris(images: list):
+    """
+    Decode QRIS dari gambar upload dengan cache di session state
+
+    Hasil disimpan bersama digest SHA-256 tiap gambar sehingga rerun tanpa
+    perubahan upload (misalnya klik tombol verifikasi) tidak men-decode dan
+    membinarisasi ulang gambar.
+
+    Args:
+        images: List isi file gambar (bytes)
+
+    Returns:
+        Tuple (QrisReadResult, True jika diambil dari cache)
+    """
+    digests = [hashlib.sha256(image).digest() for image in images]
+    cached = st.session_state.get('qris_read')
+    if cached is not None and cached["digests"] == digests:
+        return cached["result"], True
+    
+    result = qris.f20221310104_read_qris_images(images)
+    st.session_state.qris_read = {"digests": digests, "result": result}
+    return result, False
+
+
+def f20221310104_signing_session():
+    """
+    State penandatanganan sesi ini
+    
+    st.session_state hanya menyimpan ID sesi; key, signature, dan PNG QRIS
+    disimpan di SigningSession (``__slots__``) pada SessionStore bersama
+    yang men-spill/membuang sesi idle.
+    
+    Returns:
+        SigningSession milik sesi ini
+    """
+    store = f20221310104_get_session_store()
+    if 'signing_session_id' not in st.session_state:
+        st.session_state.signing_session_id = store.new_session_id()
+    return store.get(st.session_state.signing_session_id)
+
+
+def f20221310104_use_key(private_key, public_key_pem: str = None):
+    """
+    Jadikan private key sebagai kunci aktif sesi dan daftarkan public key-nya
+    
+    Args:
+        private_key: Private key (RSA atau ECC)
+        public_key_pem: Public key PEM jika sudah diketahui (misalnya dari
+            index keystore) agar tidak perlu export ulang
+    """
+    # Public key didaftarkan agar QRIS mode key ID bisa diverifikasi
+    f20221310104_signing_session().set_key(private_key, public_key_pem)
+
+
+def f20221310104_keystore_panel():
+    """Panel keystore: pilih kunci tersimpan atau simpan kunci aktif"""
+    with st.expander("🗄️ Keystore (kunci tersimpan)", expanded=False):
+        # Keystore hanya dibuka saat passphrase dikirim, bukan di setiap rerun
+        with st.form("keystore_unlock"):
+            passphrase = st.text_input("Passphrase keystore", type="password", key="keystore_passphrase")
+            unlock = st.form_submit_button("🔓 Buka Keystore")
+        if unlock:
+            st.session_state.keystore = crypto.f20221310104_open_keystore(passphrase) if passphrase else None
+        keystore = st.session_state.get("keystore")
+        if keystore is None:
+            st.caption("Masukkan passphrase lalu buka keystore untuk memakai atau menyimpan kunci")
+            return
+        entries = {entry.key_id: entry for entry in keystore.entries()}
+        
+        if entries:
+            key_id = st.selectbox(
+                "Kunci tersimpan",
+                list(entries),
+                format_func=lambda key_id: f"{entries[key_id].label or key_id} ({entries[key_id].algorithm})",
+                key="keystore_key"
+            )
+            if st.button("📂 Gunakan Kunci", key="keystore_load"):
+                try:
+                    # Dekripsi hanya saat pertama; berikutnya dari cache in-process
+                    private_key = keystore.load(key_id)
+                except crypto.IncorrectPassphraseError:
+                    st.error("❌ Passphrase salah atau file kunci rusak")
+                else:
+                    f20221310104_use_key(private_key, entries[key_id].public_key_pem)
+                    st.success(f"✅ Kunci {key_id} dimuat dari keystore")
+        else:
+            st.caption(f"Belum ada kunci di {keystore.directory}")
+        
+        label = st.text_input("Label kunci", key="keystore_label")
+        private_key = f20221310104_signing_session().private_key
+        if st.button("💾 Simpan Kunci Aktif", disabled=private_key is None, key="keystore_save"):
+            key_id = keystore.save(private_key, label or None)
+            st.success(f"✅ Kunci disimpan dengan key ID {key_id}")
 
 
 def f20221310104_sender_page():
@@ -436,15 +604,10 @@ def f20221310104_sender_page():
     st.markdown('<h1 class="main-header">🔐 Pengirim Pesan</h1>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Generate kunci RSA, tanda tangani pesan, dan buat QRIS</p>', unsafe_allow_html=True)
     
-    # Initialize session state
-    if 'private_key' not in st.session_state:
-        st.session_state.private_key = None
-    if 'public_key' not in st.session_state:
-        st.session_state.public_key = None
-    if 'signature' not in st.session_state:
-        st.session_state.signature = None
-    if 'qris_image' not in st.session_state:
-        st.session_state.qris_image = None
+    session = f20221310104_signing_session()
+    
+    # Mulai isi pool kunci di background sejak halaman dibuka
+    key_pool = crypto.f20221310104_get_key_pool()
     
     col1, col2 = st.columns([1, 1])
     
@@ -454,26 +617,50 @@ def f20221310104_sender_page():
         <div class="custom-card">
             <div class="card-title">
                 <span class="step-indicator">1</span>
-                Generate Kunci RSA
+                Generate Kunci
             </div>
         </div>
         """, unsafe_allow_html=True)
         
-        if st.button("🔑 Generate Pasangan Kunci RSA", key="gen_keys"):
-            with st.spinner("Generating RSA key pair..."):
-                private_key, public_key = f20221310104_generate_key_pair(2048)
-                st.session_state.private_key = private_key
-                st.session_state.public_key = public_key
-                st.session_state.private_key_pem = f20221310104_export_private_key(private_key)
-                st.session_state.public_key_pem = f20221310104_export_public_key(public_key)
-            st.success("✅ Kunci RSA berhasil di-generate!")
+        # Label -> algoritma (dibangun di sini agar crypto hanya di-load di halaman ini)
+        key_algorithm_options = {
+            "RSA-2048": crypto.ALGORITHM_RSA,
+            "ECDSA P-256": crypto.ALGORITHM_ECDSA_P256,
+            "Ed25519": crypto.ALGORITHM_ED25519,
+        }
+        algorithm_label = st.selectbox(
+            "Algoritma",
+            list(key_algorithm_options),
+            help="ECDSA P-256 dan Ed25519: keygen instan, signature 64 byte, QRIS jauh lebih kecil",
+            key="key_algorithm"
+        )
+        algorithm = key_algorithm_options[algorithm_label]
+        
+        if st.button("🔑 Generate Pasangan Kunci", key="gen_keys"):
+            with st.spinner(f"Generating {algorithm_label} key pair..."):
+                # RSA diambil dari pool background agar tidak menunggu pencarian prima
+                private_key, public_key = crypto.f20221310104_generate_signing_key_pair(algorithm, 2048)
+                f20221310104_use_key(private_key)
+            st.success(f"✅ Kunci {algorithm_label} berhasil di-generate!")
+            
+            if algorithm == crypto.ALGORITHM_RSA:
+                pool_stats = key_pool.stats().get(2048, {})
+                st.caption(
+                    f"Key pool: hit {pool_stats.get('hits', 0)} / miss {pool_stats.get('misses', 0)}, "
+                    f"rata-rata refill {pool_stats.get('refill_seconds_avg', 0.0) * 1000:.0f} ms"
+                )
         
-        if st.session_state.private_key is not None:
+        if session.private_key is not None:
             with st.expander("📄 Lihat Public Key", expanded=False):
-                st.code(st.session_state.public_key_pem, language="text")
+                st.code(session.public_key_pem, language="text")
+                st.caption(f"Key ID: {session.key_id}")
             
             with st.expander("🔒 Lihat Private Key (Rahasia!)", expanded=False):
-                st.code(st.session_state.private_key_pem, language="text")
+                # Export PEM hanya saat diminta, bukan setiap generate
+                if st.checkbox("Tampilkan private key", key="show_private_key"):
+                    st.code(crypto.f20221310104_export_private_key(session.private_key), language="text")
+        
+        f20221310104_keystore_panel()
         
         st.markdown('<div class="custom-divider"></div>', unsafe_allow_html=True)
         
@@ -495,13 +682,25 @@ def f20221310104_sender_page():
         )
         
         if message:
-            hash_value = f20221310104_get_hash_hex(message)
-            st.markdown(f"""
-            <div class="info-box">
-                <strong>📊 SHA-256 Hash:</strong><br>
-                <code style="font-size: 0.8rem; word-break: break-all;">{hash_value}</code>
-            </div>
-            """, unsafe_allow_html=True)
+            hash_value, hash_ms, from_cache = f20221310104_hash_preview(message)
+            if hash_value is not None:
+                st.markdown(f"""
+                <div class="info-box">
+                    <strong>📊 SHA-256 Hash:</strong><br>
+                    <code style="font-size: 0.8rem; word-break: break-all;">{hash_value}</code>
+                </div>
+                """, unsafe_allow_html=True)
+                if from_cache:
+                    st.caption(f"⏱️ Hash dari cache (menghemat {hash_ms:.2f} ms)")
+                else:
+                    st.caption(f"⏱️ Hash dihitung dalam {hash_ms:.2f} ms")
+            else:
+                st.markdown(f"""
+                <div class="info-box">
+                    <strong>📊 SHA-256 Hash:</strong><br>
+                    Pesan besar ({len(message) / 1024:.0f} KB): hash dihitung saat penandatanganan.
+                </div>
+                """, unsafe_allow_html=True)
     
     with col2:
         # Step 3: Sign Message
@@ -514,30 +713,80 @@ def f20221310104_sender_page():
         </div>
         """, unsafe_allow_html=True)
         
-        can_sign = st.session_state.private_key is not None and message
+        compact_format = st.checkbox(
+            "Gunakan format QRIS ringkas (v2.0)",
+            value=True,
+            help="Payload biner + base45: QR lebih kecil dan lebih cepat dirender",
+            key="compact_format"
+        )
+        key_id_mode = st.checkbox(
+            "Gunakan key ID (tanpa public key di QRIS)",
+            value=False,
+            help="QR hanya membawa key ID; penerima mencari public key di key registry lokal",
+            key="key_id_mode"
+        )
+        multi_qr = st.checkbox(
+            "Pecah menjadi beberapa QR kecil (multi-QR)",
+            value=False,
+            help="Payload dibagi ke beberapa QR versi kecil yang lebih cepat dirender dan mudah dipindai; "
+                 "payload yang melebihi kapasitas satu QR selalu dipecah",
+            key="multi_qr"
+        )
+        qr_policy_label = st.selectbox(
+            "Kebijakan error correction QR",
+            list(QR_POLICY_OPTIONS),
+            help="Level H tahan rusak untuk cetak; QR terkecil cocok untuk layar-ke-layar",
+            key="qr_policy"
+        )
+        qr_policy_kind = QR_POLICY_OPTIONS[qr_policy_label]
+        if qr_policy_kind == "smallest":
+            max_modules = st.number_input(
+                "Sisi QR maksimum (module, 0 = tanpa batas)",
+                min_value=0, max_value=177, value=0, step=1,
+                help="Versi 10 = 57 module, versi 20 = 97 module; payload yang tidak muat dipecah ke multi-QR",
+                key="qr_max_modules"
+            )
+            qr_policy = qris.f20221310104_smallest_version_policy(max_modules or None)
+        elif qr_policy_kind == "max_ecc":
+            qr_version = st.number_input("Versi QR", min_value=1, max_value=40, value=20, key="qr_version")
+            qr_policy = qris.f20221310104_max_ecc_policy(int(qr_version))
+        else:
+            qr_policy = qris.DEFAULT_QR_POLICY
+        
+        can_sign = session.private_key is not None and message
         
         if st.button("✍️ Tanda Tangani Pesan & Buat QRIS", disabled=not can_sign, key="sign_btn"):
             with st.spinner("Signing message and generating QRIS..."):
                 # Sign the message
-                signature = f20221310104_sign_message(message, st.session_state.private_key)
-                st.session_state.signature = signature
+                signature = crypto.f20221310104_sign_message(message, session.private_key)
+                # Sesi menyimpan signature mentah; base64 dibentuk saat ditampilkan
+                session.signature = crypto.f20221310104_decode_base64(signature)
                 
-                # Generate QRIS
-                qris_image = f20221310104_create_signature_qris(
-                    message,
-                    signature,
-                    st.session_state.public_key_pem
-                )
-                st.session_state.qris_image = qris_image
-            
-            st.success("✅ Pesan berhasil ditandatangani!")
+                # Generate QRIS dan enkode PNG sekali saja; dipecah jika melebihi
+                # kapasitas satu QR di bawah kebijakan yang dipilih
+                try:
+                    session.qris_artifacts = tuple(qris.f20221310104_create_signature_qris_artifacts(
+                        message,
+                        signature,
+                        session.public_key_pem,
+                        qris.PAYLOAD_FORMAT_COMPACT if compact_format else qris.PAYLOAD_FORMAT_JSON,
+                        compress_level=QRIS_PNG_COMPRESS_LEVEL,
+                        embed_public_key=not key_id_mode,
+                        max_part_length=qris.DEFAULT_PART_LENGTH if multi_qr else None,
+                        policy=qr_policy
+                    ))
+                except ValueError as e:
+                    session.qris_artifacts = ()
+                    st.error(f"❌ Gagal membuat QRIS: {e}")
+                else:
+                    st.success("✅ Pesan berhasil ditandatangani!")
         
-        if st.session_state.signature:
+        if session.signature is not None:
             with st.expander("🔏 Lihat Digital Signature", expanded=False):
-                st.code(st.session_state.signature, language="text")
+                st.code(session.signature_b64, language="text")
         
         # Display QRIS
-        if st.session_state.qris_image:
+        if session.qris_artifacts:
             st.markdown('<div class="custom-divider"></div>', unsafe_allow_html=True)
             
             st.markdown("""
@@ -548,24 +797,31 @@ def f20221310104_sender_page():
             </div>
             """, unsafe_allow_html=True)
             
-            # Convert image to bytes for display
-            img_buffer = BytesIO()
-            st.session_state.qris_image.save(img_buffer, format='PNG')
-            img_buffer.seek(0)
-            
-            # Display QRIS
-            st.image(img_buffer, caption="QRIS berisi Digital Signature", use_container_width=True)
-            
-            # Download button
-            qris_bytes = f20221310104_qris_to_bytes(st.session_state.qris_image)
-            st.download_button(
-                label="📥 Download QRIS",
-                data=qris_bytes,
-                file_name="digital_signature_qris.png",
-                mime="image/png",
-                key="download_qris_btn",
-                type="primary"
-            )
+            for artifact in session.qris_artifacts:
+                if artifact.part_total > 1:
+                    part_label = f" (bagian {artifact.part_index + 1}/{artifact.part_total})"
+                    download_key = f"download_qris_btn_{artifact.part_index}"
+                    file_name = f"digital_signature_qris_{artifact.part_index + 1}of{artifact.part_total}.png"
+                else:
+                    part_label, download_key, file_name = "", "download_qris_btn", "digital_signature_qris.png"
+                
+                # Display QRIS (PNG yang sama dipakai untuk tampilan dan download)
+                st.image(artifact.png_bytes, caption=f"QRIS berisi Digital Signature{part_label}", use_container_width=True)
+                st.caption(
+                    f"Format {artifact.payload_format} • {artifact.payload_length} karakter • "
+                    f"QR versi {artifact.qr_version} ECC {artifact.error_correction} • "
+                    f"{artifact.width}×{artifact.height}px • {len(artifact.png_bytes) / 1024:.1f} KB"
+                )
+                
+                # Download button
+                st.download_button(
+                    label=f"📥 Download QRIS{part_label}",
+                    data=artifact.png_bytes,
+                    file_name=file_name,
+                    mime="image/png",
+                    key=download_key,
+                    type="primary"
+                )
             
             st.markdown("""
             <div class="info-box">
@@ -575,6 +831,60 @@ def f20221310104_sender_page():
             """, unsafe_allow_html=True)
 
 
+def f20221310104_envelope_panel(qris_data: dict):
+    """
+    Tampilkan dan verifikasi payload envelope multi-signer
+    
+    Args:
+        qris_data: Payload hasil decode dengan field ``signatures``
+    """
+    with st.expander("📋 Data yang Diterima", expanded=True):
+        st.markdown("**Pesan:**")
+        st.info(qris_data["message"])
+        st.markdown(f"**Penandatangan:** {len(qris_data['signatures'])}")
+    
+    if st.button("🔍 Verifikasi Semua Signature", key="verify_envelope_btn"):
+        with st.spinner("Memverifikasi signature..."):
+            try:
+                envelope = crypto.SignatureEnvelope.from_payload(qris_data)
+            except ValueError as e:
+                st.error(f"❌ {str(e)}")
+                return
+            # Signer yang sudah pernah diverifikasi diambil dari cache verifikasi
+            results = envelope.verify(cache=crypto.f20221310104_get_verification_cache())
+        
+        st.dataframe(
+            [
+                {
+                    "key_id": entry.key_id,
+                    "algoritma": entry.algorithm,
+                    "public_key": "payload" if entry.public_key_pem else "registry",
+                    "valid": "✅" if result.valid else "❌",
+                    "keterangan": result.error or "",
+                }
+                for entry, result in zip(envelope.signatures, results)
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        valid_count = sum(result.valid for result in results)
+        if valid_count == len(results):
+            st.markdown(f"""
+            <div class="success-box">
+                ✅ SEMUA SIGNATURE VALID ({valid_count}/{len(results)})<br>
+                <small>Pesan asli dan disetujui seluruh penandatangan</small>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="error-box">
+                ❌ {len(results) - valid_count} DARI {len(results)} SIGNATURE TIDAK VALID<br>
+                <small>Signer dengan key ID yang belum terdaftar perlu didaftarkan di key registry</small>
+            </div>
+            """, unsafe_allow_html=True)
+
+
 def f20221310104_receiver_page():
     """Halaman Penerima - Verifikasi tanda tangan digital"""
     
@@ -635,40 +945,57 @@ def f20221310104_receiver_page():
                 }
         
         else:
-            uploaded_file = st.file_uploader(
-                "Upload QRIS Image",
+            uploaded_files = st.file_uploader(
+                "Upload QRIS Image (semua bagian jika multi-QR)",
                 type=['png', 'jpg', 'jpeg'],
+                accept_multiple_files=True,
                 key="qris_upload"
             )
             
-            if uploaded_file:
+            if uploaded_files:
                 # Display uploaded image
-                st.image(uploaded_file, caption="QRIS yang diupload", use_container_width=True)
+                if len(uploaded_files) == 1:
+                    st.image(uploaded_files[0], caption="QRIS yang diupload", use_container_width=True)
+                else:
+                    st.image(
+                        [uploaded_file.getvalue() for uploaded_file in uploaded_files],
+                        caption=[uploaded_file.name for uploaded_file in uploaded_files],
+                        width=200
+                    )
                 
-                # For QR decoding, we need to use a different approach
-                # Since pyzbar has installation issues on Windows, 
-                # we'll use the base64 data directly
-                st.markdown("""
-                <div class="info-box">
-                    📌 <strong>Note:</strong> Untuk demo, silakan gunakan input manual 
-                    atau copy data dari QRIS yang di-generate.
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Input for encoded QR data
-                encoded_data = st.text_area(
-                    "Atau masukkan data QRIS (base64):",
-                    placeholder="Paste encoded QRIS data here...",
-                    height=100,
-                    key="encoded_qr"
+                # Decode QR langsung dari gambar; bagian multi-QR digabung dengan urutan bebas
+                read_result, from_cache = f20221310104_read_uploaded_qris(
+                    [uploaded_file.getvalue() for uploaded_file in uploaded_files]
+                )
+                timing_text = ", ".join(
+                    f"{stage} {elapsed:.1f} ms" for stage, elapsed in read_result.timings.items()
                 )
+                if timing_text and from_cache:
+                    timing_text += " (dari cache)"
                 
-                if encoded_data:
-                    qris_data = f20221310104_decode_qris_data(encoded_data)
-                    if qris_data:
-                        st.success("✅ Data QRIS berhasil di-decode!")
-                    else:
-                        st.error("❌ Gagal decode data QRIS")
+                if read_result.payload:
+                    qris_data = read_result.payload
+                    st.success("✅ Data QRIS berhasil di-decode dari gambar!")
+                else:
+                    st.error(f"❌ {read_result.error}")
+                    
+                    # Fallback: paste data QRIS secara manual
+                    encoded_data = st.text_area(
+                        "Atau masukkan data QRIS (base64 / DS2:... / DS3:...):",
+                        placeholder="Paste encoded QRIS data here...",
+                        height=100,
+                        key="encoded_qr"
+                    )
+                    
+                    if encoded_data:
+                        qris_data = qris.f20221310104_decode_qris_data(encoded_data)
+                        if qris_data:
+                            st.success("✅ Data QRIS berhasil di-decode!")
+                        else:
+                            st.error("❌ Gagal decode data QRIS")
+                
+                if timing_text:
+                    st.caption(f"⏱️ Decode: {timing_text}")
     
     with col2:
         # Verification
@@ -681,7 +1008,9 @@ def f20221310104_receiver_page():
         </div>
         """, unsafe_allow_html=True)
         
-        if qris_data:
+        if qris_data and "signatures" in qris_data:
+            f20221310104_envelope_panel(qris_data)
+        elif qris_data:
             # Display extracted data
             with st.expander("📋 Data yang Diterima", expanded=True):
                 st.markdown("**Pesan:**")
@@ -690,18 +1019,29 @@ def f20221310104_receiver_page():
                 st.markdown("**Signature:**")
                 sig = qris_data.get("signature", "")
                 st.code(sig[:50] + "..." if len(sig) > 50 else sig)
+                
+                st.markdown(f"**Algoritma:** `{qris_data.get('algorithm', crypto.ALGORITHM_RSA)}`")
+                
+                if not qris_data.get("public_key"):
+                    st.markdown(f"**Key ID:** `{qris_data.get('key_id', '')}`")
             
             if st.button("🔍 Verifikasi Signature", key="verify_btn"):
                 with st.spinner("Memverifikasi signature..."):
                     try:
-                        # Import public key
-                        public_key = f20221310104_import_public_key(qris_data["public_key"])
+                        # Public key dari payload atau key registry (mode key ID)
+                        public_key_pem = crypto.f20221310104_resolve_public_key(qris_data)
                         
-                        # Verify signature
-                        is_valid = f20221310104_verify_signature(
+                        # Verify signature (hasil untuk QR yang sama diambil dari cache)
+                        is_valid = crypto.f20221310104_verify_signature_cached(
                             qris_data["message"],
                             qris_data["signature"],
-                            public_key
+                            public_key_pem,
+                            qris_data.get("algorithm")
+                        )
+                        cache_stats = crypto.f20221310104_get_verification_cache().stats()
+                        st.caption(
+                            f"Cache verifikasi: hit {cache_stats['hits']} / miss {cache_stats['misses']} "
+                            f"({cache_stats['hit_rate']:.0%})"
                         )
                         
                         if is_valid:
@@ -725,7 +1065,7 @@ def f20221310104_receiver_page():
                             """, unsafe_allow_html=True)
                             
                             # Show hash comparison
-                            message_hash = f20221310104_get_hash_hex(qris_data["message"])
+                            message_hash = crypto.f20221310104_get_hash_hex(qris_data["message"])
                             st.markdown("### 🔐 Detail Kriptografi")
                             st.markdown(f"""
                             <div class="info-box">
@@ -742,6 +1082,8 @@ def f20221310104_receiver_page():
                             </div>
                             """, unsafe_allow_html=True)
                             
+                    except crypto.KeyNotFoundError as e:
+                        st.error(f"❌ {str(e)}. Daftarkan public key pengirim di key registry.")
                     except Exception as e:
                         st.error(f"Error saat verifikasi: {str(e)}")
         else:
@@ -752,13 +1094,15 @@ def f20221310104_receiver_page():
             """, unsafe_allow_html=True)
 
 
-def f20221310104_about_page():
-    """Halaman tentang aplikasi dan cara kerja"""
-    
-    st.markdown('<h1 class="main-header">📖 Tentang Aplikasi</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="sub-header">Digital Signature Verification System dengan RSA dan QRIS</p>', unsafe_allow_html=True)
-    
-    st.markdown("""
+@st.cache_resource
+def f20221310104_about_content() -> dict:
+    """
+    Potongan HTML/markdown statis halaman Tentang
+    
+    Dibangun dan diminify sekali per proses, bukan setiap kali halaman dibuka.
+    """
+    return {
+        "intro": f20221310104_minify_html("""
     <div class="custom-card">
         <div class="card-title">🔐 Apa itu Digital Signature?</div>
         <p style="color: rgba(255,255,255,0.8);">
@@ -770,12 +1114,8 @@ def f20221310104_about_page():
             <li><strong>Non-repudiation</strong> - Pengirim tidak bisa menyangkal</li>
         </ul>
     </div>
-    """, unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
+    """),
+        "rsa": f20221310104_minify_html("""
         <div class="custom-card">
             <div class="card-title">🔑 Algoritma RSA</div>
             <p style="color: rgba(255,255,255,0.8);">
@@ -787,10 +1127,8 @@ def f20221310104_about_page():
                 <li><strong>Public Key</strong> - Untuk verifikasi (publik)</li>
             </ul>
         </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
+        """),
+        "sha256": f20221310104_minify_html("""
         <div class="custom-card">
             <div class="card-title">📊 SHA-256 Hashing</div>
             <p style="color: rgba(255,255,255,0.8);">
@@ -802,15 +1140,13 @@ def f20221310104_about_page():
                 <li>Memastikan integritas pesan</li>
             </ul>
         </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown("""
+        """),
+        "flow_title": f20221310104_minify_html("""
     <div class="custom-card">
         <div class="card-title">📱 Alur Kerja</div>
     </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
+    """),
+        "flow_diagram": textwrap.dedent("""
     ```
     ┌─────────────────────────────────────────────────────────────────┐
     │                         PENGIRIM                                │
@@ -834,7 +1170,69 @@ def f20221310104_about_page():
     │  6. Jika sama → VALID ✅ | Jika beda → INVALID ❌               │
     └─────────────────────────────────────────────────────────────────┘
     ```
-    """)
+    """),
+    }
+
+
+def f20221310104_about_page():
+    """Halaman tentang aplikasi dan cara kerja"""
+    
+    content = f20221310104_about_content()
+    
+    st.markdown('<h1 class="main-header">📖 Tentang Aplikasi</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="sub-header">Digital Signature Verification System dengan RSA dan QRIS</p>', unsafe_allow_html=True)
+    
+    st.markdown(content["intro"], unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown(content["rsa"], unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(content["sha256"], unsafe_allow_html=True)
+    
+    st.markdown(content["flow_title"], unsafe_allow_html=True)
+    
+    st.markdown(content["flow_diagram"])
+
+
+def f20221310104_diagnostics_panel():
+    """Panel diagnostics: histogram waktu per stage dari instrumentation"""
+    
+    st.markdown('<div class="custom-divider"></div>', unsafe_allow_html=True)
+    st.markdown("""
+    <div class="custom-card">
+        <div class="card-title">🩺 Diagnostics</div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    rows = f20221310104_stage_rows(st.session_state.stage_histograms)
+    if rows:
+        st.dataframe(
+            [{key: round(value, 3) if isinstance(value, float) else value for key, value in row.items()}
+             for row in rows],
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.caption("Belum ada data. Lakukan signing atau verifikasi untuk mengisi histogram stage.")
+    
+    # Memori state penandatanganan per sesi (key, signature, PNG QRIS)
+    store = f20221310104_get_session_store()
+    store_stats = store.stats()
+    st.caption(
+        f"Sesi aktif: {store_stats['sessions']} ({store_stats['spilled']} di-spill ke disk) • "
+        f"total {store_stats['total_bytes'] / 1024:.1f} KB • spill {store_stats['spills']} / "
+        f"restore {store_stats['restores']} / eviksi {store_stats['evictions']}"
+    )
+    session_rows = store.memory_report()
+    if session_rows:
+        st.dataframe(session_rows, use_container_width=True, hide_index=True)
+    
+    if st.button("🧹 Reset Diagnostics", key="reset_diagnostics"):
+        f20221310104_reset_tracing(st.session_state.stage_histograms)
+        st.rerun()
 
 
 def f20221310104_main():
@@ -866,6 +1264,15 @@ def f20221310104_main():
         
         st.markdown("---")
         
+        diagnostics = st.checkbox(
+            "🩺 Diagnostics",
+            value=False,
+            help="Ukur waktu tiap stage (import key, SHA-256, operasi RSA, fitting versi QR, mask, PNG)",
+            key="diagnostics"
+        )
+        if "stage_histograms" not in st.session_state:
+            st.session_state.stage_histograms = {}
+        
         st.markdown("""
         <div style="padding: 1rem; background: rgba(255,255,255,0.05); border-radius: 12px;">
             <p style="color: rgba(255,255,255,0.6); font-size: 0.8rem; margin: 0;">
@@ -878,13 +1285,21 @@ def f20221310104_main():
         </div>
         """, unsafe_allow_html=True)
     
-    # Route to pages
-    if page == "✍️ Pengirim":
-        f20221310104_sender_page()
-    elif page == "✅ Penerima":
-        f20221310104_receiver_page()
-    else:
-        f20221310104_about_page()
+    # Route to pages; tracing hanya aktif di dalam scope sesi ini sehingga
+    # sesi yang ditutup dengan diagnostics menyala tidak meninggalkan state
+    with f20221310104_tracing_scope(st.session_state.stage_histograms) if diagnostics else nullcontext():
+        if page == "✍️ Pengirim":
+            f20221310104_sender_page()
+        elif page == "✅ Penerima":
+            f20221310104_receiver_page()
+        else:
+            f20221310104_about_page()
+        
+        if diagnostics:
+            f20221310104_record_stage("app.rerun", time.perf_counter() - _RUN_START)
+    
+    if diagnostics:
+        f20221310104_diagnostics_panel()
 
 
 if __name__ == "__main__":
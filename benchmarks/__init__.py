@@ -0,0 +1,3 @@
+"""
+Benchmark untuk jalur kripto dan QRIS
+"""
@@ -0,0 +1,78 @@
+"""
+Command line benchmark suite
+
+Contoh:
+    python -m benchmarks --quick
+    python -m benchmarks --output bench.json
+    python -m benchmarks --output new.json --baseline bench.json --max-regression 0.2
+    python -m benchmarks --filter verify
+"""
+
+import argparse
+import sys
+
+from .cases import f20221310104_build_cases
+from .runner import (
+    f20221310104_compare,
+    f20221310104_load_results,
+    f20221310104_run_case,
+    f20221310104_write_results
+)
+
+
+def f20221310104_main(argv=None) -> int:
+    """
+    Jalankan benchmark dan (opsional) bandingkan dengan baseline
+
+    Returns:
+        Exit code: 0 jika tidak ada regresi, 1 jika ada
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="DigiSign benchmark suite")
+    parser.add_argument("--seed", type=int, default=1310104, help="Seed untuk key dan input")
+    parser.add_argument("--quick", action="store_true", help="Lewati kasus berat dan kurangi iterasi")
+    parser.add_argument("--filter", default=None, help="Hanya jalankan case yang namanya mengandung teks ini")
+    parser.add_argument("--output", default=None, help="Tulis hasil ke file JSON")
+    parser.add_argument("--baseline", default=None, help="File JSON baseline untuk perbandingan")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Kenaikan p50 relatif yang dianggap regresi (default: 0.2 = 20%%)"
+    )
+    args = parser.parse_args(argv)
+
+    cases = f20221310104_build_cases(seed=args.seed, quick=args.quick)
+    if args.filter:
+        cases = [case for case in cases if args.filter in case.name]
+
+    results = {}
+    print(f"{'case':<32} {'ops/s':>10} {'p50':>10} {'p95':>10} {'p99':>10} {'peak mem':>10}")
+    for case in cases:
+        result = f20221310104_run_case(case, iteration_scale=0.2 if args.quick else 1.0)
+        results[case.name] = result
+        print(
+            f"{case.name:<32} {result['ops_per_sec']:>10.1f} {result['p50_ms']:>8.2f}ms "
+            f"{result['p95_ms']:>8.2f}ms {result['p99_ms']:>8.2f}ms {result['peak_memory_bytes'] / 1024:>8.0f}KB"
+        )
+
+    if args.output:
+        f20221310104_write_results(args.output, results, args.seed)
+        print(f"\nHasil ditulis ke {args.output}")
+
+    regressions = 0
+    if args.baseline:
+        rows = f20221310104_compare(results, f20221310104_load_results(args.baseline), args.max_regression)
+        print(f"\n{'case':<32} {'baseline':>10} {'sekarang':>10} {'perubahan':>10}")
+        for row in rows:
+            marker = "  REGRESI" if row["regression"] else ""
+            print(
+                f"{row['name']:<32} {row['baseline_p50_ms']:>8.2f}ms {row['current_p50_ms']:>8.2f}ms "
+                f"{row['change'] * 100:>+9.1f}%{marker}"
+            )
+            regressions += row["regression"]
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(f20221310104_main())
@@ -0,0 +1,198 @@
+"""
+Kasus benchmark untuk jalur panas crypto dan QRIS
+
+Semua input dibuat dari seed tetap: key RSA di-generate dengan randfunc
+deterministik dan pesan dibangun dari teks tetap, sehingga dua run dengan
+seed yang sama mengukur pekerjaan yang sama persis.
+"""
+
+import random
+from typing import Callable, List
+
+import qrcode
+from Crypto.PublicKey import ECC, RSA
+from qrcode.constants import ERROR_CORRECT_H
+
+from crypto.rsa_utils import f20221310104_export_public_key
+from crypto.signature import Signer, f20221310104_sign_message, f20221310104_verify_signature
+from qris.qr_generator import (
+    PAYLOAD_FORMAT_COMPACT,
+    PAYLOAD_FORMAT_JSON,
+    f20221310104_create_signature_qris,
+    f20221310104_encode_qris_payload,
+    f20221310104_decode_qris_data
+)
+
+from .runner import BenchmarkCase
+
+KEY_SIZES = (1024, 2048, 3072, 4096)
+
+# Ukuran pesan untuk sign/verify (byte UTF-8)
+SIGN_MESSAGE_SIZES = (64, 4 * 1024, 256 * 1024)
+
+# Ukuran pesan untuk QRIS (dibatasi kapasitas QR versi 40)
+QRIS_MESSAGE_SIZES = (16, 128, 512)
+
+# Kurva eliptik: nama kasus -> kurva PyCryptodome
+EC_CURVES = {"ecdsa-p256": "P-256", "ed25519": "Ed25519"}
+
+# Iterasi keygen per ukuran kunci (keygen 4096-bit bisa beberapa detik)
+_KEYGEN_ITERATIONS = {1024: 10, 2048: 5, 3072: 3, 4096: 2}
+
+
+def f20221310104_seeded_randfunc(seed: int) -> Callable[[int], bytes]:
+    """
+    Sumber byte acak deterministik untuk RSA.generate
+
+    Hanya untuk benchmark: jangan pernah dipakai untuk kunci sungguhan.
+    """
+    return random.Random(seed).randbytes
+
+
+def f20221310104_seeded_key(key_size: int, seed: int) -> RSA.RsaKey:
+    """Generate key RSA deterministik untuk benchmark"""
+    return RSA.generate(key_size, randfunc=f20221310104_seeded_randfunc(seed))
+
+
+def f20221310104_seeded_ec_key(curve: str, seed: int) -> ECC.EccKey:
+    """Generate key kurva eliptik deterministik untuk benchmark"""
+    return ECC.generate(curve=curve, randfunc=f20221310104_seeded_randfunc(seed))
+
+
+def f20221310104_message(size: int) -> str:
+    """Pesan deterministik sepanjang ``size`` karakter ASCII"""
+    text = "Dokumen persetujuan nomor 42 ditandatangani secara digital. "
+    return (text * (size // len(text) + 1))[:size]
+
+
+def _f20221310104_fits_qr(data: str) -> bool:
+    """Cek apakah data muat di QR versi 40 (tanpa pemilihan mask)"""
+    qr = qrcode.QRCode(error_correction=ERROR_CORRECT_H)
+    qr.add_data(data)
+    try:
+        qr.best_fit()
+    except (qrcode.exceptions.DataOverflowError, ValueError):
+        return False
+    return True
+
+
+def f20221310104_build_cases(seed: int = 1310104, quick: bool = False) -> List[BenchmarkCase]:
+    """
+    Bangun daftar kasus benchmark
+
+    Args:
+        seed: Seed untuk key dan input
+        quick: Lewati keygen 3072/4096-bit dan pesan terbesar
+
+    Returns:
+        List BenchmarkCase
+    """
+    cases = []
+    key_sizes = KEY_SIZES[:2] if quick else KEY_SIZES
+    sign_sizes = SIGN_MESSAGE_SIZES[:2] if quick else SIGN_MESSAGE_SIZES
+
+    for key_size in key_sizes:
+        cases.append(BenchmarkCase(
+            name=f"keygen/rsa-{key_size}",
+            func=lambda state, i, size=key_size: f20221310104_seeded_key(size, seed + i),
+            iterations=_KEYGEN_ITERATIONS[key_size],
+            warmup=0,
+            params={"key_size": key_size},
+        ))
+
+    def signing_state(size: int):
+        private_key = f20221310104_seeded_key(2048, seed)
+        message = f20221310104_message(size)
+        signature = f20221310104_sign_message(message, private_key)
+        return private_key, private_key.publickey(), message, signature
+
+    for size in sign_sizes:
+        cases.append(BenchmarkCase(
+            name=f"sign/rsa-2048/{size}B",
+            setup=lambda size=size: signing_state(size),
+            func=lambda state, i: f20221310104_sign_message(state[2], state[0]),
+            iterations=50,
+            params={"key_size": 2048, "message_bytes": size},
+        ))
+        cases.append(BenchmarkCase(
+            name=f"verify/rsa-2048/{size}B",
+            setup=lambda size=size: signing_state(size),
+            func=lambda state, i: f20221310104_verify_signature(state[2], state[3], state[1]),
+            iterations=200,
+            params={"key_size": 2048, "message_bytes": size},
+        ))
+
+    # Backend kurva eliptik: keygen, sign, dan verify pesan pendek
+    def ec_signing_state(curve: str):
+        private_key = f20221310104_seeded_ec_key(curve, seed)
+        message = f20221310104_message(64)
+        signature = f20221310104_sign_message(message, private_key)
+        return private_key, private_key.public_key(), message, signature
+
+    for name, curve in EC_CURVES.items():
+        cases.append(BenchmarkCase(
+            name=f"keygen/{name}",
+            func=lambda state, i, curve=curve: f20221310104_seeded_ec_key(curve, seed + i),
+            iterations=50,
+            params={"curve": curve},
+        ))
+        cases.append(BenchmarkCase(
+            name=f"sign/{name}/64B",
+            setup=lambda curve=curve: ec_signing_state(curve),
+            func=lambda state, i: f20221310104_sign_message(state[2], state[0]),
+            iterations=200,
+            params={"curve": curve, "message_bytes": 64},
+        ))
+        cases.append(BenchmarkCase(
+            name=f"verify/{name}/64B",
+            setup=lambda curve=curve: ec_signing_state(curve),
+            func=lambda state, i: f20221310104_verify_signature(state[2], state[3], state[1]),
+            iterations=200,
+            params={"curve": curve, "message_bytes": 64},
+        ))
+
+    # Batch 32 pesan: fungsi per pesan vs Signer yang dipakai ulang
+    batch = [f20221310104_message(64) + str(i) for i in range(32)]
+    cases.append(BenchmarkCase(
+        name="sign_batch/function/32x64B",
+        setup=lambda: f20221310104_seeded_key(2048, seed),
+        func=lambda state, i: [f20221310104_sign_message(message, state) for message in batch],
+        iterations=10,
+        params={"key_size": 2048, "batch": len(batch)},
+    ))
+    cases.append(BenchmarkCase(
+        name="sign_batch/signer/32x64B",
+        setup=lambda: Signer(f20221310104_seeded_key(2048, seed)),
+        func=lambda state, i: state.sign_many(batch),
+        iterations=10,
+        params={"key_size": 2048, "batch": len(batch)},
+    ))
+
+    def qris_state(size: int, payload_format: str):
+        private_key, public_key, message, signature = signing_state(size)
+        public_key_pem = f20221310104_export_public_key(public_key)
+        encoded = f20221310104_encode_qris_payload(message, signature, public_key_pem, payload_format)
+        return message, signature, public_key_pem, payload_format, encoded
+
+    for size in QRIS_MESSAGE_SIZES:
+        for payload_format in (PAYLOAD_FORMAT_JSON, PAYLOAD_FORMAT_COMPACT):
+            state = qris_state(size, payload_format)
+            # Format 1.0 dengan pesan panjang melebihi kapasitas QR versi 40
+            if _f20221310104_fits_qr(state[4]):
+                cases.append(BenchmarkCase(
+                    name=f"create_qris/{payload_format}/{size}B",
+                    setup=lambda state=state: state,
+                    func=lambda state, i: f20221310104_create_signature_qris(*state[:4]),
+                    iterations=10,
+                    warmup=1,
+                    params={"format": payload_format, "message_bytes": size, "payload_chars": len(state[4])},
+                ))
+            cases.append(BenchmarkCase(
+                name=f"decode_qris/{payload_format}/{size}B",
+                setup=lambda state=state: state,
+                func=lambda state, i: f20221310104_decode_qris_data(state[4]),
+                iterations=500,
+                params={"format": payload_format, "message_bytes": size, "payload_chars": len(state[4])},
+            ))
+
+    return cases
@@ -0,0 +1,86 @@
+"""
+Perbandingan ukuran dan waktu format payload QRIS 1.0 (JSON) vs 2.0 (compact)
+
+Jalankan dari root project:
+    python -m benchmarks.payload_format
+"""
+
+import time
+
+import qrcode
+from qrcode.constants import ERROR_CORRECT_H
+
+from crypto.rsa_utils import f20221310104_generate_key_pair, f20221310104_export_public_key
+from crypto.signature import f20221310104_sign_message
+from qris.qr_generator import (
+    PAYLOAD_FORMAT_COMPACT,
+    PAYLOAD_FORMAT_JSON,
+    f20221310104_decode_qris_data,
+    f20221310104_encode_qris_payload,
+    f20221310104_generate_qris
+)
+
+MESSAGE_SIZES = (16, 128, 512)
+
+
+def f20221310104_measure_format(message: str, signature: str, public_key_pem: str, payload_format: str) -> dict:
+    """
+    Ukur panjang payload, versi QR, serta waktu encode/render/decode
+
+    Returns:
+        Dictionary hasil pengukuran untuk satu format
+    """
+    start = time.perf_counter()
+    encoded = f20221310104_encode_qris_payload(message, signature, public_key_pem, payload_format)
+    encode_ms = (time.perf_counter() - start) * 1000
+
+    qr = qrcode.QRCode(version=None, error_correction=ERROR_CORRECT_H)
+    qr.add_data(encoded)
+    try:
+        qr.make(fit=True)
+        version = qr.version
+    except (qrcode.exceptions.DataOverflowError, ValueError):
+        # Payload melebihi kapasitas QR versi 40
+        version = None
+
+    render_ms = None
+    if version is not None:
+        start = time.perf_counter()
+        f20221310104_generate_qris(encoded)
+        render_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    f20221310104_decode_qris_data(encoded)
+    decode_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "format": payload_format,
+        "payload_chars": len(encoded),
+        "qr_version": version,
+        "encode_ms": encode_ms,
+        "render_ms": render_ms,
+        "decode_ms": decode_ms,
+    }
+
+
+def f20221310104_main() -> None:
+    """Cetak tabel perbandingan untuk beberapa ukuran pesan"""
+    private_key, public_key = f20221310104_generate_key_pair(2048)
+    public_key_pem = f20221310104_export_public_key(public_key)
+
+    print(f"{'pesan':>6} {'format':>6} {'chars':>6} {'versi':>6} {'encode':>9} {'render':>9} {'decode':>9}")
+    for size in MESSAGE_SIZES:
+        message = ("Dokumen persetujuan nomor 42. " * size)[:size]
+        signature = f20221310104_sign_message(message, private_key)
+        for payload_format in (PAYLOAD_FORMAT_JSON, PAYLOAD_FORMAT_COMPACT):
+            result = f20221310104_measure_format(message, signature, public_key_pem, payload_format)
+            version = result["qr_version"] or "overflow"
+            render = f"{result['render_ms']:.1f}ms" if result["render_ms"] is not None else "-"
+            print(
+                f"{size:>6} {payload_format:>6} {result['payload_chars']:>6} {version:>6} "
+                f"{result['encode_ms']:>7.2f}ms {render:>9} {result['decode_ms']:>7.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    f20221310104_main()
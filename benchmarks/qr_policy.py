@@ -0,0 +1,99 @@
+"""
+Perbandingan kebijakan error correction/versi QR
+
+Untuk beberapa panjang payload compact, cetak versi, level, ukuran, waktu
+render, dan ukuran PNG tiap kebijakan, serta waktu pemilihan versi lewat
+tabel kapasitas dibanding ``QRCode.best_fit``.
+
+Jalankan dari root project:
+    python -m benchmarks.qr_policy
+"""
+
+import time
+
+import qrcode
+from qrcode.constants import ERROR_CORRECT_H, ERROR_CORRECT_M
+
+from qris.qr_generator import f20221310104_build_qr_matrix, f20221310104_render_qr_png
+from qris.qr_policy import (
+    ERROR_CORRECTION_NAMES,
+    f20221310104_fixed_ecc_policy,
+    f20221310104_max_ecc_policy,
+    f20221310104_select_qr_layout,
+    f20221310104_smallest_version_policy
+)
+
+PAYLOAD_SIZES = (200, 600, 1200)
+REPEAT = 5
+
+POLICIES = (
+    ("fixed H", f20221310104_fixed_ecc_policy(ERROR_CORRECT_H)),
+    ("fixed M", f20221310104_fixed_ecc_policy(ERROR_CORRECT_M)),
+    ("smallest", f20221310104_smallest_version_policy()),
+    ("max_ecc v30", f20221310104_max_ecc_policy(30)),
+)
+
+
+def _f20221310104_best_of(func, repeat: int = REPEAT) -> float:
+    """Waktu terbaik (ms) dari beberapa kali eksekusi"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _f20221310104_best_fit(data: str) -> int:
+    qr = qrcode.QRCode(error_correction=ERROR_CORRECT_H)
+    qr.add_data(data)
+    return qr.best_fit()
+
+
+def f20221310104_measure_policy(data: str, policy) -> dict:
+    """
+    Ukur versi, level, waktu render, dan ukuran PNG untuk satu kebijakan
+
+    Returns:
+        Dictionary hasil pengukuran
+    """
+    matrix = f20221310104_build_qr_matrix(data, policy=policy)
+    png_bytes = f20221310104_render_qr_png(matrix)
+    return {
+        "version": matrix.version,
+        "ecc": ERROR_CORRECTION_NAMES[matrix.error_correction],
+        "modules": matrix.size - 2 * matrix.border,
+        "render_ms": _f20221310104_best_of(
+            lambda: f20221310104_render_qr_png(f20221310104_build_qr_matrix(data, policy=policy))
+        ),
+        "png_bytes": len(png_bytes),
+    }
+
+
+def f20221310104_main() -> None:
+    """Cetak tabel perbandingan kebijakan dan waktu pemilihan versi"""
+    print(f"{'payload':>7} {'kebijakan':<12} {'versi':>5} {'ecc':>3} {'module':>6} {'render':>9} {'png':>7}")
+    for size in PAYLOAD_SIZES:
+        data = ("DS2:" + "ABC123 " * size)[:size]
+        for name, policy in POLICIES:
+            try:
+                result = f20221310104_measure_policy(data, policy)
+            except ValueError:
+                print(f"{size:>7} {name:<12} {'tidak muat':>5}")
+                continue
+            print(
+                f"{size:>7} {name:<12} {result['version']:>5} {result['ecc']:>3} {result['modules']:>6} "
+                f"{result['render_ms']:>7.1f}ms {result['png_bytes']:>7}"
+            )
+
+    print()
+    print(f"{'payload':>7} {'tabel':>9} {'best_fit':>9}")
+    for size in PAYLOAD_SIZES:
+        data = ("DS2:" + "ABC123 " * size)[:size]
+        table_ms = _f20221310104_best_of(lambda: f20221310104_select_qr_layout(data), 50)
+        best_fit_ms = _f20221310104_best_of(lambda: _f20221310104_best_fit(data), 50)
+        print(f"{size:>7} {table_ms:>7.3f}ms {best_fit_ms:>7.3f}ms")
+
+
+if __name__ == "__main__":
+    f20221310104_main()
@@ -0,0 +1,85 @@
+"""
+Perbandingan renderer QR: jalur RGB lama vs renderer palette 1-bit
+
+Jalankan dari root project:
+    python -m benchmarks.render
+"""
+
+import time
+
+from qris.qr_generator import (
+    f20221310104_build_qr_matrix,
+    f20221310104_generate_qris,
+    f20221310104_qris_to_bytes,
+    f20221310104_render_qr_image,
+    f20221310104_render_qr_png
+)
+
+# Panjang payload alphanumeric -> kira-kira versi QR kecil, sedang, besar
+PAYLOAD_SIZES = (64, 400, 1200)
+REPEAT = 5
+
+
+def _f20221310104_best_of(func, repeat: int = REPEAT) -> float:
+    """Waktu terbaik (ms) dari beberapa kali eksekusi"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def f20221310104_measure_render(data: str) -> dict:
+    """
+    Ukur waktu, ukuran buffer pixel, dan ukuran PNG untuk kedua renderer
+
+    Buffer pixel dihitung dari mode gambar (RGB 3 byte/pixel, palette
+    1 byte/pixel) karena alokasi Pillow tidak terlihat oleh tracemalloc.
+
+    Returns:
+        Dictionary hasil pengukuran
+    """
+    legacy_image = f20221310104_generate_qris(data)
+    legacy_png = f20221310104_qris_to_bytes(legacy_image)
+    matrix = f20221310104_build_qr_matrix(data)
+    fast_image = f20221310104_render_qr_image(matrix)
+    fast_png = f20221310104_render_qr_png(matrix)
+
+    return {
+        "version": matrix.version,
+        "pixels": f"{fast_image.width}x{fast_image.height}",
+        "legacy_ms": _f20221310104_best_of(
+            lambda: f20221310104_qris_to_bytes(f20221310104_generate_qris(data))
+        ),
+        "fast_ms": _f20221310104_best_of(
+            lambda: f20221310104_render_qr_png(f20221310104_build_qr_matrix(data))
+        ),
+        "fast_render_only_ms": _f20221310104_best_of(
+            lambda: f20221310104_render_qr_png(matrix)
+        ),
+        "legacy_buffer_bytes": legacy_image.width * legacy_image.height * len(legacy_image.getbands()),
+        "fast_buffer_bytes": fast_image.width * fast_image.height,
+        "legacy_png_bytes": len(legacy_png),
+        "fast_png_bytes": len(fast_png),
+    }
+
+
+def f20221310104_main() -> None:
+    """Cetak tabel perbandingan untuk beberapa ukuran payload"""
+    print(
+        f"{'versi':>5} {'pixels':>10} {'lama':>9} {'baru':>9} {'render':>9} "
+        f"{'buf lama':>10} {'buf baru':>10} {'png lama':>9} {'png baru':>9}"
+    )
+    for size in PAYLOAD_SIZES:
+        result = f20221310104_measure_render(("DS2:" + "ABC123 " * size)[:size])
+        print(
+            f"{result['version']:>5} {result['pixels']:>10} "
+            f"{result['legacy_ms']:>7.1f}ms {result['fast_ms']:>7.1f}ms {result['fast_render_only_ms']:>7.1f}ms "
+            f"{result['legacy_buffer_bytes']:>10} {result['fast_buffer_bytes']:>10} "
+            f"{result['legacy_png_bytes']:>9} {result['fast_png_bytes']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    f20221310104_main()
@@ -0,0 +1,156 @@
+"""
+Runner benchmark: pengukuran waktu, percentile, memori, dan perbandingan baseline
+"""
+
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class BenchmarkCase(NamedTuple):
+    """
+    Satu kasus benchmark
+
+    ``setup`` dipanggil sekali sebelum pengukuran dan hasilnya diteruskan ke
+    ``func(state, iteration)`` pada setiap iterasi.
+    """
+    name: str
+    func: Callable[[Any, int], Any]
+    setup: Optional[Callable[[], Any]] = None
+    iterations: int = 20
+    warmup: int = 2
+    params: Dict[str, Any] = {}
+
+
+def _f20221310104_percentile(sorted_samples: List[float], percent: float) -> float:
+    """Percentile (nearest-rank) dari sampel yang sudah terurut"""
+    index = max(0, min(len(sorted_samples) - 1, round(percent / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def f20221310104_run_case(case: BenchmarkCase, iteration_scale: float = 1.0) -> Dict[str, Any]:
+    """
+    Jalankan satu kasus benchmark
+
+    Waktu diukur per iterasi dengan GC dimatikan. Peak memori diukur
+    terpisah dengan tracemalloc pada satu iterasi tambahan agar overhead
+    tracing tidak mempengaruhi angka waktu (catatan: tracemalloc hanya
+    melihat alokasi Python, bukan buffer internal library C).
+
+    Args:
+        case: BenchmarkCase yang akan dijalankan
+        iteration_scale: Pengali jumlah iterasi (misalnya 0.2 untuk mode cepat)
+
+    Returns:
+        Dictionary hasil: iterations, ops_per_sec, mean/min/p50/p95/p99/max (ms),
+        peak_memory_bytes, params
+    """
+    state = case.setup() if case.setup else None
+    iterations = max(1, int(round(case.iterations * iteration_scale)))
+
+    for i in range(case.warmup):
+        case.func(state, i)
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for i in range(iterations):
+            start = time.perf_counter()
+            case.func(state, i)
+            samples.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        case.func(state, iterations)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    total = sum(samples)
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / total if total else float('inf'),
+        "mean_ms": total / iterations * 1000,
+        "min_ms": samples[0] * 1000,
+        "p50_ms": _f20221310104_percentile(samples, 50) * 1000,
+        "p95_ms": _f20221310104_percentile(samples, 95) * 1000,
+        "p99_ms": _f20221310104_percentile(samples, 99) * 1000,
+        "max_ms": samples[-1] * 1000,
+        "peak_memory_bytes": peak,
+        "params": dict(case.params),
+    }
+
+
+def f20221310104_environment() -> Dict[str, str]:
+    """Informasi lingkungan eksekusi untuk dicatat bersama hasil"""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def f20221310104_compare(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    max_regression: float = 0.2
+) -> List[Dict[str, Any]]:
+    """
+    Bandingkan hasil benchmark dengan baseline berdasarkan p50
+
+    Args:
+        current: Hasil run saat ini {nama_case: hasil}
+        baseline: Hasil baseline {nama_case: hasil}
+        max_regression: Batas kenaikan p50 relatif yang dianggap regresi
+
+    Returns:
+        List perbandingan per case: name, baseline_p50_ms, current_p50_ms,
+        change (relatif), regression (bool)
+    """
+    rows = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None or not base.get("p50_ms"):
+            continue
+        change = result["p50_ms"] / base["p50_ms"] - 1
+        rows.append({
+            "name": name,
+            "baseline_p50_ms": base["p50_ms"],
+            "current_p50_ms": result["p50_ms"],
+            "change": change,
+            "regression": change > max_regression,
+        })
+    return rows
+
+
+def f20221310104_load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Baca file JSON hasil benchmark
+
+    Returns:
+        Dictionary {nama_case: hasil}
+    """
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)["results"]
+
+
+def f20221310104_write_results(path: str, results: Dict[str, Dict[str, Any]], seed: int) -> None:
+    """Tulis hasil benchmark beserta metadata ke file JSON"""
+    document = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seed": seed,
+        "environment": f20221310104_environment(),
+        "results": results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
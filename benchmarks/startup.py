@@ -0,0 +1,105 @@
+"""
+Pengukuran waktu import dan rerun aplikasi Streamlit
+
+Bagian 1 mengukur waktu import tiap modul di proses Python baru (cold) dan
+modul berat yang ikut ter-load. Bagian 2 menjalankan app.py lewat
+Streamlit AppTest: run pertama (cold start) lalu rerun per halaman.
+
+Jalankan dari root project:
+    python -m benchmarks.startup
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Modul yang diukur waktu import-nya (masing-masing di proses baru)
+IMPORT_TARGETS = ("crypto", "qris", "crypto.signature", "qris.qr_generator", "qris.qr_reader")
+
+# Dependency berat yang dicek apakah ikut ter-load
+HEAVY_MODULES = ("Crypto.PublicKey.RSA", "qrcode", "PIL.Image", "zxingcpp")
+
+PAGES = ("✍️ Pengirim", "✅ Penerima", "📖 Tentang")
+RERUNS = 5
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed * 1000)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def f20221310104_measure_import(module: str) -> dict:
+    """
+    Ukur waktu import satu modul di proses Python baru
+
+    Returns:
+        Dictionary {module, import_ms, heavy}
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=_ROOT, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    return {"module": module, "import_ms": float(output[0]), "heavy": output[1] if len(output) > 1 else ""}
+
+
+def f20221310104_measure_reruns(reruns: int = RERUNS) -> dict:
+    """
+    Ukur cold start dan rerun per halaman dengan Streamlit AppTest
+
+    Returns:
+        Dictionary {cold_ms, pages: {halaman: median_ms}}
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(_ROOT, "app.py"), default_timeout=120)
+    start = time.perf_counter()
+    app.run()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    pages = {}
+    for page in PAGES:
+        app.sidebar.radio[0].set_value(page).run()
+        samples = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            app.run()
+            samples.append((time.perf_counter() - start) * 1000)
+        pages[page] = statistics.median(samples)
+    return {"cold_ms": cold_ms, "pages": pages}
+
+
+def f20221310104_main() -> None:
+    """Cetak laporan waktu import dan rerun"""
+    print(f"{'modul':<20} {'import':>10}  dependency berat yang ter-load")
+    for module in IMPORT_TARGETS:
+        result = f20221310104_measure_import(module)
+        print(f"{result['module']:<20} {result['import_ms']:>8.1f}ms  {result['heavy'] or '-'}")
+
+    # AppTest harus dijalankan di proses terpisah agar cold start tidak
+    # terpengaruh modul yang sudah di-import di atas
+    output = subprocess.run(
+        [sys.executable, "-c", "from benchmarks.startup import f20221310104_print_reruns; f20221310104_print_reruns()"],
+        cwd=_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    print()
+    print(output, end="")
+
+
+def f20221310104_print_reruns() -> None:
+    """Cetak hasil f20221310104_measure_reruns (dipanggil di proses baru)"""
+    result = f20221310104_measure_reruns()
+    print(f"{'cold start (run pertama)':<26} {result['cold_ms']:>8.1f}ms")
+    for page, median_ms in result["pages"].items():
+        print(f"{'rerun ' + page:<26} {median_ms:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    f20221310104_main()
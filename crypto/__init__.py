@@ -1,23 +1,114 @@
-from .rsa_utils import (
-    f20221310104_generate_key_pair,
-    f20221310104_export_public_key,
-    f20221310104_export_private_key,
-    f20221310104_import_public_key,
-    f20221310104_import_private_key
-)
-from .signature import (
-    f20221310104_hash_message,
-    f20221310104_sign_message,
-    f20221310104_verify_signature
-)
-
-__all__ = [
-    'f20221310104_generate_key_pair',
-    'f20221310104_export_public_key',
-    'f20221310104_export_private_key',
-    'f20221310104_import_public_key',
-    'f20221310104_import_private_key',
-    'f20221310104_hash_message',
-    'f20221310104_sign_message',
-    'f20221310104_verify_signature'
-]
+"""
+Package crypto: key RSA/ECC, signature, keystore, dan registry
+
+Submodul (dan PyCryptodome) baru di-import saat atribut pertama kali
+diakses, sehingga ``import crypto`` tetap ringan.
+"""
+
+import importlib
+from typing import Any, List
+
+
+# Submodul -> nama yang di-export (di-import lazy lewat __getattr__)
+_SUBMODULE_EXPORTS = {
+    "rsa_utils": (
+        'f20221310104_generate_key_pair',
+        'f20221310104_export_public_key',
+        'f20221310104_export_private_key',
+        'f20221310104_import_public_key',
+        'f20221310104_import_private_key',
+        'f20221310104_get_key_pool',
+        'f20221310104_pooled_key_pair',
+        'f20221310104_public_key_der',
+        'f20221310104_public_key_fingerprint',
+        'f20221310104_get_public_key_cache',
+        'f20221310104_import_public_key_cached',
+        'KeyPairPool',
+        'PublicKeyCache',
+    ),
+    "signature": (
+        'f20221310104_hash_message',
+        'f20221310104_get_hash_hex',
+        'f20221310104_sign_message',
+        'f20221310104_verify_signature',
+        'f20221310104_sign_hash',
+        'f20221310104_verify_hash',
+        'f20221310104_check_hash',
+        'f20221310104_check_signature',
+        'f20221310104_hash_chunks',
+        'f20221310104_hash_stream',
+        'f20221310104_hash_file',
+        'f20221310104_sign_chunks',
+        'f20221310104_sign_stream',
+        'f20221310104_sign_file',
+        'f20221310104_verify_chunks',
+        'f20221310104_verify_stream',
+        'f20221310104_verify_file',
+        'f20221310104_verify_many',
+        'Signer',
+        'SignatureEnvelope',
+        'EnvelopeSignature',
+        'InvalidSignatureError',
+        'VerificationResult',
+    ),
+    "verification_cache": (
+        'f20221310104_get_verification_cache',
+        'f20221310104_verify_signature_cached',
+        'VerificationCache',
+    ),
+    "encoding": (
+        'f20221310104_normalize_base64',
+        'f20221310104_decode_base64',
+        'Base64DecodeError',
+    ),
+    "algorithms": (
+        'f20221310104_get_backend',
+        'f20221310104_key_algorithm',
+        'f20221310104_backend_for_key',
+        'f20221310104_public_key_algorithm',
+        'f20221310104_generate_signing_key_pair',
+        'ALGORITHM_RSA',
+        'ALGORITHM_ECDSA_P256',
+        'ALGORITHM_ED25519',
+        'DEFAULT_ALGORITHM',
+        'SUPPORTED_ALGORITHMS',
+        'SignatureBackend',
+        'SigningKey',
+    ),
+    "keystore": (
+        'f20221310104_open_keystore',
+        'KeyStore',
+        'KeyStoreEntry',
+        'IncorrectPassphraseError',
+        'MAX_OPEN_KEYSTORES',
+    ),
+    "key_registry": (
+        'f20221310104_public_key_id',
+        'f20221310104_get_key_registry',
+        'f20221310104_resolve_public_key',
+        'KeyRegistry',
+        'KeyNotFoundError',
+        'KeyIdCollisionError',
+    ),
+}
+
+_LAZY_ATTRIBUTES = {
+    name: module for module, names in _SUBMODULE_EXPORTS.items() for name in names
+}
+
+__all__ = [name for names in _SUBMODULE_EXPORTS.values() for name in names]
+
+
+def __getattr__(name: str) -> Any:
+    """Import submodul saat atribut export pertama kali diakses (PEP 562)"""
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Simpan di namespace package agar akses berikutnya tidak lewat __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
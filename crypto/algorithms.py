@@ -0,0 +1,242 @@
+"""
+Signature Algorithms Module
+Backend algoritma tanda tangan digital: RSA, ECDSA P-256, dan Ed25519
+
+Semua backend menandatangani hash SHA-256 dari pesan sehingga jalur hashing
+(streaming, Signer dengan prefix, verifikasi batch) sama untuk setiap
+algoritma:
+
+    RS256  RSA PKCS#1 v1.5 + SHA-256 (default, kompatibel dengan payload lama)
+    ES256  ECDSA P-256 + SHA-256 (nonce deterministik RFC 6979), signature 64 byte
+    EdDSA  Ed25519 (RFC 8032) atas digest SHA-256 pesan, signature 64 byte
+
+Algoritma ditentukan dari tipe key sehingga fungsi sign/verify tidak perlu
+parameter tambahan.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Tuple, Union
+
+from Crypto.Hash import SHA256
+from Crypto.PublicKey import ECC, RSA
+from Crypto.Signature import DSS, eddsa, pkcs1_15
+
+from instrumentation import f20221310104_traced
+
+from .rsa_utils import f20221310104_import_public_key_cached, f20221310104_pooled_key_pair
+
+
+ALGORITHM_RSA = "RS256"
+ALGORITHM_ECDSA_P256 = "ES256"
+ALGORITHM_ED25519 = "EdDSA"
+DEFAULT_ALGORITHM = ALGORITHM_RSA
+
+# Key yang didukung oleh backend
+SigningKey = Union[RSA.RsaKey, ECC.EccKey]
+
+
+class SignatureBackend(ABC):
+    """
+    Backend satu algoritma tanda tangan
+
+    Subclass wajib mengimplementasikan pembuatan key dan pembuatan objek
+    skema (PyCryptodome) untuk satu key; sign/verify atas hash SHA-256
+    secara default memakai objek skema tersebut.
+    """
+
+    #: Nama algoritma yang dicatat di payload QRIS
+    name = ""
+    #: Prefix nama stage instrumentation (misalnya "rsa" -> "rsa.private_op")
+    stage = ""
+
+    @abstractmethod
+    def generate_key_pair(self, key_size: int = 2048) -> Tuple[SigningKey, SigningKey]:
+        """
+        Generate pasangan kunci
+
+        Args:
+            key_size: Ukuran kunci dalam bit (hanya dipakai RSA)
+
+        Returns:
+            Tuple berisi (private_key, public_key)
+        """
+
+    @abstractmethod
+    def new_scheme(self, key: SigningKey) -> Any:
+        """
+        Buat objek skema signing/verifikasi untuk satu key
+
+        Objek ini bisa dipakai ulang (misalnya oleh Signer) untuk banyak pesan.
+        """
+
+    def sign(self, scheme: Any, message_hash: SHA256.SHA256Hash) -> bytes:
+        """
+        Tanda tangani hash SHA-256
+
+        Returns:
+            Signature dalam bentuk bytes
+        """
+        return scheme.sign(message_hash)
+
+    def verify(self, scheme: Any, message_hash: SHA256.SHA256Hash, signature: bytes) -> None:
+        """
+        Verifikasi signature terhadap hash SHA-256
+
+        Raises:
+            ValueError: Jika signature tidak valid
+        """
+        scheme.verify(message_hash, signature)
+
+
+class RsaBackend(SignatureBackend):
+    """RSA PKCS#1 v1.5 dengan SHA-256"""
+
+    name = ALGORITHM_RSA
+    stage = "rsa"
+
+    def generate_key_pair(self, key_size: int = 2048) -> Tuple[SigningKey, SigningKey]:
+        # Ambil dari key pool agar tidak menunggu pencarian prima
+        return f20221310104_pooled_key_pair(key_size)
+
+    def new_scheme(self, key: SigningKey) -> Any:
+        return pkcs1_15.new(key)
+
+
+class EcdsaP256Backend(SignatureBackend):
+    """ECDSA kurva NIST P-256 dengan SHA-256 dan nonce deterministik (RFC 6979)"""
+
+    name = ALGORITHM_ECDSA_P256
+    stage = "ecdsa"
+
+    def generate_key_pair(self, key_size: int = 2048) -> Tuple[SigningKey, SigningKey]:
+        private_key = ECC.generate(curve='P-256')
+        return private_key, private_key.public_key()
+
+    def new_scheme(self, key: SigningKey) -> Any:
+        # Nonce deterministik: tidak butuh RNG per signature dan aman dipakai bersama
+        if key.has_private():
+            return DSS.new(key, 'deterministic-rfc6979')
+        return DSS.new(key, 'fips-186-3')
+
+
+class Ed25519Backend(SignatureBackend):
+    """Ed25519 (RFC 8032, mode murni) atas digest SHA-256 pesan"""
+
+    name = ALGORITHM_ED25519
+    stage = "eddsa"
+
+    def generate_key_pair(self, key_size: int = 2048) -> Tuple[SigningKey, SigningKey]:
+        private_key = ECC.generate(curve='Ed25519')
+        return private_key, private_key.public_key()
+
+    def new_scheme(self, key: SigningKey) -> Any:
+        return eddsa.new(key, 'rfc8032')
+
+    def sign(self, scheme: Any, message_hash: SHA256.SHA256Hash) -> bytes:
+        return scheme.sign(message_hash.digest())
+
+    def verify(self, scheme: Any, message_hash: SHA256.SHA256Hash, signature: bytes) -> None:
+        scheme.verify(message_hash.digest(), signature)
+
+
+_BACKENDS: Dict[str, SignatureBackend] = {
+    backend.name: backend
+    for backend in (RsaBackend(), EcdsaP256Backend(), Ed25519Backend())
+}
+
+# Nama kurva PyCryptodome -> algoritma
+_CURVE_ALGORITHMS = {
+    "NIST P-256": ALGORITHM_ECDSA_P256,
+    "Ed25519": ALGORITHM_ED25519,
+}
+
+SUPPORTED_ALGORITHMS = tuple(_BACKENDS)
+
+
+def f20221310104_get_backend(algorithm: str) -> SignatureBackend:
+    """
+    Ambil backend berdasarkan nama algoritma
+
+    Args:
+        algorithm: Nama algoritma (RS256, ES256, atau EdDSA)
+
+    Returns:
+        SignatureBackend untuk algoritma tersebut
+
+    Raises:
+        ValueError: Jika algoritma tidak didukung
+    """
+    backend = _BACKENDS.get(algorithm)
+    if backend is None:
+        raise ValueError(f"Algoritma tidak didukung: {algorithm}")
+    return backend
+
+
+def f20221310104_key_algorithm(key: SigningKey) -> str:
+    """
+    Tentukan algoritma dari tipe key
+
+    Args:
+        key: RSA atau ECC key (private maupun public)
+
+    Returns:
+        Nama algoritma
+
+    Raises:
+        ValueError: Jika tipe key atau kurva tidak didukung
+    """
+    if isinstance(key, RSA.RsaKey):
+        return ALGORITHM_RSA
+    if isinstance(key, ECC.EccKey):
+        algorithm = _CURVE_ALGORITHMS.get(key.curve)
+        if algorithm is not None:
+            return algorithm
+        raise ValueError(f"Kurva tidak didukung: {key.curve}")
+    raise ValueError(f"Tipe key tidak didukung: {type(key).__name__}")
+
+
+def f20221310104_backend_for_key(key: SigningKey) -> SignatureBackend:
+    """
+    Ambil backend yang sesuai dengan tipe key
+
+    Args:
+        key: RSA atau ECC key
+
+    Returns:
+        SignatureBackend
+    """
+    return _BACKENDS[f20221310104_key_algorithm(key)]
+
+
+def f20221310104_public_key_algorithm(public_key_pem: str) -> str:
+    """
+    Tentukan algoritma dari public key PEM (import lewat cache)
+
+    Args:
+        public_key_pem: Public key dalam format PEM
+
+    Returns:
+        Nama algoritma
+    """
+    return f20221310104_key_algorithm(f20221310104_import_public_key_cached(public_key_pem))
+
+
+@f20221310104_traced()
+def f20221310104_generate_signing_key_pair(
+    algorithm: str = DEFAULT_ALGORITHM,
+    key_size: int = 2048
+) -> Tuple[SigningKey, SigningKey]:
+    """
+    Generate pasangan kunci untuk algoritma tertentu
+
+    Key RSA diambil dari key pool; key ECDSA/Ed25519 dibuat langsung
+    (hanya beberapa milidetik).
+
+    Args:
+        algorithm: Nama algoritma (RS256, ES256, atau EdDSA)
+        key_size: Ukuran kunci RSA dalam bit
+
+    Returns:
+        Tuple berisi (private_key, public_key)
+    """
+    return f20221310104_get_backend(algorithm).generate_key_pair(key_size)
@@ -0,0 +1,81 @@
+"""
+Encoding Module
+Normalisasi dan decode base64 satu lintasan untuk signature dan payload QRIS
+
+Input hasil copy-paste sering berisi spasi/newline, padding yang hilang,
+atau alfabet urlsafe (``-``/``_``). Normalisasi dilakukan dengan satu
+``bytes.translate`` (mapping urlsafe -> standar sekaligus menghapus
+whitespace) sehingga tidak ada rantai ``replace`` yang masing-masing
+membuat salinan string baru.
+"""
+
+import base64
+import binascii
+from typing import Union
+
+
+BytesLike = Union[str, bytes, bytearray, memoryview]
+
+# Karakter whitespace yang dibuang dari input base64
+_WHITESPACE = b" \t\r\n\v\f"
+
+# Tabel translate: alfabet urlsafe -> alfabet standar
+_URLSAFE_TO_STANDARD = bytes.maketrans(b"-_", b"+/")
+
+
+class Base64DecodeError(ValueError):
+    """Input bukan base64 yang valid"""
+
+
+def f20221310104_normalize_base64(data: BytesLike) -> bytes:
+    """
+    Normalisasi input base64 dalam satu lintasan
+
+    Whitespace dibuang, alfabet urlsafe diubah ke standar, dan padding
+    ``=`` dilengkapi.
+
+    Args:
+        data: Input base64 (str, bytes, bytearray, atau memoryview)
+
+    Returns:
+        Base64 standar ber-padding dalam bentuk bytes ASCII
+
+    Raises:
+        Base64DecodeError: Jika input berisi karakter non-ASCII atau
+            panjangnya tidak mungkin valid
+    """
+    if isinstance(data, str):
+        try:
+            raw = data.encode('ascii')
+        except UnicodeEncodeError:
+            raise Base64DecodeError("Base64 berisi karakter non-ASCII") from None
+    else:
+        raw = bytes(data)
+
+    normalized = raw.translate(_URLSAFE_TO_STANDARD, _WHITESPACE).rstrip(b"=")
+    remainder = len(normalized) % 4
+    if remainder == 1:
+        raise Base64DecodeError("Panjang base64 tidak valid")
+    if remainder:
+        normalized += b"=" * (4 - remainder)
+    return normalized
+
+
+def f20221310104_decode_base64(data: BytesLike) -> bytes:
+    """
+    Normalisasi lalu decode base64 (standar maupun urlsafe)
+
+    Args:
+        data: Input base64 (str, bytes, bytearray, atau memoryview)
+
+    Returns:
+        Hasil decode dalam bentuk bytes
+
+    Raises:
+        Base64DecodeError: Jika input bukan base64 yang valid
+    """
+    normalized = f20221310104_normalize_base64(data)
+    try:
+        return base64.b64decode(normalized, validate=True)
+    except binascii.Error as e:
+        raise Base64DecodeError(f"Base64 tidak valid: {e}") from None
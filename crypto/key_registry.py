@@ -0,0 +1,250 @@
+"""
+Key Registry Module
+Registry lokal public key berdasarkan key ID (fingerprint pendek)
+
+Payload QRIS dalam mode key ID hanya membawa fingerprint pendek dari public
+key. Penerima me-resolve key ID tersebut lewat registry ini sebelum
+verifikasi. Registry disimpan di SQLite (default) atau file JSON (path
+berakhiran ``.json``) dengan index in-memory sehingga lookup tidak
+menyentuh disk.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Any, Dict, Mapping, Optional
+
+from Crypto.PublicKey import RSA
+
+from .rsa_utils import f20221310104_import_public_key_cached, f20221310104_public_key_fingerprint
+
+
+# Panjang key ID dalam karakter hex (8 byte, sama dengan fingerprint payload compact).
+# 64 bit cukup karena registry menolak key berbeda dengan key ID yang sudah
+# terdaftar (KeyIdCollisionError): memalsukan key ID milik key orang lain
+# butuh second preimage (~2^64 operasi SHA-256), sedangkan tabrakan birthday
+# (~2^32) hanya bisa dibuat antar key milik penyerang sendiri dan key kedua
+# ditolak, bukan menggantikan key yang pertama.
+KEY_ID_LENGTH = 16
+
+# Environment variable untuk path registry bersama
+KEY_REGISTRY_ENV = "DIGISIGN_KEY_REGISTRY"
+
+
+class KeyNotFoundError(LookupError):
+    """Key ID tidak terdaftar di registry"""
+
+
+class KeyIdCollisionError(ValueError):
+    """Key ID sudah terdaftar untuk public key yang berbeda"""
+
+
+def f20221310104_public_key_id(pem: str) -> str:
+    """
+    Hitung key ID dari public key PEM
+
+    Args:
+        pem: Public key dalam format PEM string
+
+    Returns:
+        Key ID dalam format hex string (KEY_ID_LENGTH karakter)
+    """
+    return f20221310104_public_key_fingerprint(pem)[:KEY_ID_LENGTH]
+
+
+class KeyRegistry:
+    """
+    Registry public key dengan index in-memory
+
+    Tanpa path, registry hanya tersimpan di memori. Dengan path, setiap
+    key baru juga ditulis ke SQLite atau file JSON dan seluruh isi
+    dimuat ulang ke index saat registry dibuat.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Path file registry (``.json`` untuk JSON, selain itu SQLite);
+                None untuk registry in-memory
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._keys: Dict[str, str] = {}
+        self._labels: Dict[str, Optional[str]] = {}
+        self._connection: Optional[sqlite3.Connection] = None
+
+        if path is None:
+            return
+        if path.lower().endswith('.json'):
+            self._load_json()
+        else:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS public_keys ("
+                "key_id TEXT PRIMARY KEY, public_key_pem TEXT NOT NULL, label TEXT)"
+            )
+            self._connection.commit()
+            for key_id, pem, label in self._connection.execute(
+                "SELECT key_id, public_key_pem, label FROM public_keys"
+            ):
+                self._keys[key_id] = pem
+                self._labels[key_id] = label
+
+    def _load_json(self) -> None:
+        """Muat index dari file JSON (jika ada)"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            entries = json.load(f)
+        for key_id, entry in entries.items():
+            self._keys[key_id] = entry["public_key"]
+            self._labels[key_id] = entry.get("label")
+
+    def _save_json(self) -> None:
+        """Tulis seluruh registry ke file JSON secara atomik"""
+        entries = {
+            key_id: {"public_key": pem, "label": self._labels.get(key_id)}
+            for key_id, pem in self._keys.items()
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def register(self, public_key_pem: str, label: Optional[str] = None) -> str:
+        """
+        Daftarkan public key
+
+        Args:
+            public_key_pem: Public key dalam format PEM
+            label: Nama/keterangan key (opsional)
+
+        Returns:
+            Key ID dari public key
+
+        Raises:
+            KeyIdCollisionError: Jika key ID sudah dipakai public key lain
+        """
+        fingerprint = f20221310104_public_key_fingerprint(public_key_pem)
+        key_id = fingerprint[:KEY_ID_LENGTH]
+        with self._lock:
+            existing = self._keys.get(key_id)
+            if existing == public_key_pem and self._labels.get(key_id) == label:
+                return key_id
+            if existing is not None and f20221310104_public_key_fingerprint(existing) != fingerprint:
+                raise KeyIdCollisionError(f"Key ID {key_id} sudah terdaftar untuk public key lain")
+            self._keys[key_id] = public_key_pem
+            self._labels[key_id] = label
+            if self._connection is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO public_keys (key_id, public_key_pem, label) VALUES (?, ?, ?)",
+                    (key_id, public_key_pem, label)
+                )
+                self._connection.commit()
+            elif self.path is not None:
+                self._save_json()
+        return key_id
+
+    def resolve(self, key_id: str) -> str:
+        """
+        Cari public key PEM berdasarkan key ID
+
+        Args:
+            key_id: Key ID dalam format hex
+
+        Returns:
+            Public key dalam format PEM
+
+        Raises:
+            KeyNotFoundError: Jika key ID tidak terdaftar
+        """
+        pem = self._keys.get(key_id.lower())
+        if pem is None:
+            raise KeyNotFoundError(f"Key ID tidak terdaftar: {key_id}")
+        return pem
+
+    def resolve_key(self, key_id: str) -> RSA.RsaKey:
+        """
+        Cari public key berdasarkan key ID dan import (lewat cache)
+
+        Args:
+            key_id: Key ID dalam format hex
+
+        Returns:
+            RSA public key object
+        """
+        return f20221310104_import_public_key_cached(self.resolve(key_id))
+
+    def label(self, key_id: str) -> Optional[str]:
+        """
+        Returns:
+            Label key atau None
+        """
+        return self._labels.get(key_id.lower())
+
+    def __contains__(self, key_id: object) -> bool:
+        return isinstance(key_id, str) and key_id.lower() in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def close(self) -> None:
+        """Tutup koneksi SQLite (jika ada)"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+_f20221310104_key_registry: Optional[KeyRegistry] = None
+_f20221310104_key_registry_lock = threading.Lock()
+
+
+def f20221310104_get_key_registry() -> KeyRegistry:
+    """
+    Ambil key registry bersama (dibuat saat pertama kali dipanggil)
+
+    Path diambil dari environment variable DIGISIGN_KEY_REGISTRY; tanpa
+    variable tersebut registry hanya tersimpan di memori.
+
+    Returns:
+        Instance KeyRegistry bersama
+    """
+    global _f20221310104_key_registry
+    with _f20221310104_key_registry_lock:
+        if _f20221310104_key_registry is None:
+            _f20221310104_key_registry = KeyRegistry(os.environ.get(KEY_REGISTRY_ENV) or None)
+        return _f20221310104_key_registry
+
+
+def f20221310104_resolve_public_key(
+    payload: Mapping[str, Any],
+    registry: Optional[KeyRegistry] = None
+) -> str:
+    """
+    Tentukan public key PEM untuk verifikasi payload QRIS
+
+    Public key yang disertakan di payload dipakai apa adanya; jika payload
+    hanya membawa key ID, key dicari di registry.
+
+    Args:
+        payload: Payload hasil f20221310104_decode_qris_data
+        registry: Key registry (default: registry bersama)
+
+    Returns:
+        Public key dalam format PEM
+
+    Raises:
+        KeyNotFoundError: Jika key ID tidak terdaftar atau payload tidak
+            membawa public key maupun key ID
+    """
+    public_key_pem = payload.get("public_key")
+    if public_key_pem:
+        return public_key_pem
+    key_id = payload.get("key_id")
+    if not key_id:
+        raise KeyNotFoundError("Payload tidak berisi public key maupun key ID")
+    return (registry or f20221310104_get_key_registry()).resolve(key_id)
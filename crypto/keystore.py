@@ -0,0 +1,291 @@
+"""
+Keystore Module
+Penyimpanan private key terenkripsi di disk
+
+Setiap private key disimpan sebagai PKCS#8 terenkripsi passphrase
+(PBKDF2-HMAC-SHA256 + AES-256-CBC) di file ``<key_id>.pem``. File
+``index.json`` menyimpan metadata (algoritma, label, public key PEM) sehingga
+daftar kunci bisa ditampilkan tanpa mendekripsi apapun. Private key baru
+didekripsi saat pertama kali dipakai lalu disimpan di cache in-process;
+pemakaian berikutnya cukup lookup dictionary.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from Crypto.PublicKey import ECC, RSA
+
+from instrumentation import f20221310104_traced
+
+from .algorithms import ALGORITHM_RSA, SigningKey, f20221310104_key_algorithm
+from .key_registry import KeyNotFoundError, f20221310104_public_key_id
+from .rsa_utils import f20221310104_export_public_key
+
+
+INDEX_NAME = "index.json"
+
+# Environment variable untuk direktori keystore bersama
+KEYSTORE_DIR_ENV = "DIGISIGN_KEYSTORE_DIR"
+DEFAULT_KEYSTORE_DIR = os.path.join("~", ".digisign", "keystore")
+
+# Proteksi PKCS#8: PBKDF2-HMAC-SHA256 + AES-256-CBC
+KEY_PROTECTION = "PBKDF2WithHMAC-SHA256AndAES256-CBC"
+KEY_PROTECTION_ITERATIONS = 100_000
+
+# Jumlah instance KeyStore (pasangan direktori + passphrase) yang dipakai
+# ulang oleh f20221310104_open_keystore; yang paling lama tidak dipakai dibuang
+MAX_OPEN_KEYSTORES = 8
+
+
+class IncorrectPassphraseError(ValueError):
+    """Passphrase tidak bisa mendekripsi private key di keystore"""
+
+
+class KeyStoreEntry(NamedTuple):
+    """Metadata satu private key di keystore"""
+    key_id: str
+    algorithm: str
+    label: Optional[str]
+    created: float
+    public_key_pem: str
+
+
+class KeyStore:
+    """
+    Keystore private key terenkripsi dengan index dan cache lazy
+
+    Satu instance memakai satu passphrase. Tanpa passphrase, keystore
+    hanya bisa membaca index (misalnya untuk menampilkan daftar kunci).
+    """
+
+    def __init__(self, directory: str, passphrase: Optional[str] = None):
+        """
+        Args:
+            directory: Direktori keystore (baru dibuat saat kunci pertama disimpan)
+            passphrase: Passphrase untuk enkripsi/dekripsi private key
+        """
+        self.directory = os.path.expanduser(directory)
+        self._passphrase = passphrase
+        self._lock = threading.Lock()
+        self._index: Dict[str, KeyStoreEntry] = {}
+        self._keys: Dict[str, SigningKey] = {}
+        self._index_mtime = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Muat ulang index dari disk jika file berubah (misalnya ditulis instance lain)"""
+        path = os.path.join(self.directory, INDEX_NAME)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._index_mtime:
+            return
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+        self._index_mtime = mtime
+        self._index.clear()
+        for key_id, entry in entries.items():
+            self._index[key_id] = KeyStoreEntry(
+                key_id,
+                entry["algorithm"],
+                entry.get("label"),
+                entry.get("created", 0.0),
+                entry["public_key"]
+            )
+
+    def _save_index(self) -> None:
+        """Tulis index ke disk secara atomik"""
+        entries = {
+            entry.key_id: {
+                "algorithm": entry.algorithm,
+                "label": entry.label,
+                "created": entry.created,
+                "public_key": entry.public_key_pem,
+            }
+            for entry in self._index.values()
+        }
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2)
+        os.replace(temp_path, os.path.join(self.directory, INDEX_NAME))
+        self._index_mtime = os.stat(os.path.join(self.directory, INDEX_NAME)).st_mtime_ns
+
+    def _key_path(self, key_id: str) -> str:
+        return os.path.join(self.directory, f"{key_id}.pem")
+
+    def _require_passphrase(self) -> str:
+        if not self._passphrase:
+            raise ValueError("Keystore dibuka tanpa passphrase")
+        return self._passphrase
+
+    def entries(self) -> List[KeyStoreEntry]:
+        """
+        Daftar kunci di keystore (tanpa dekripsi), terbaru lebih dulu
+
+        Returns:
+            List KeyStoreEntry
+        """
+        with self._lock:
+            self._load_index()
+        return sorted(self._index.values(), key=lambda entry: entry.created, reverse=True)
+
+    def entry(self, key_id: str) -> KeyStoreEntry:
+        """
+        Metadata satu kunci
+
+        Raises:
+            KeyNotFoundError: Jika key ID tidak ada di keystore
+        """
+        entry = self._index.get(key_id)
+        if entry is None:
+            with self._lock:
+                self._load_index()
+            entry = self._index.get(key_id)
+        if entry is None:
+            raise KeyNotFoundError(f"Key ID tidak ada di keystore: {key_id}")
+        return entry
+
+    @f20221310104_traced("keystore.save")
+    def save(self, private_key: SigningKey, label: Optional[str] = None) -> str:
+        """
+        Enkripsi dan simpan private key
+
+        Args:
+            private_key: Private key (RSA atau ECC)
+            label: Nama/keterangan kunci (opsional)
+
+        Returns:
+            Key ID dari kunci yang disimpan
+        """
+        passphrase = self._require_passphrase()
+        algorithm = f20221310104_key_algorithm(private_key)
+        public_key_pem = f20221310104_export_public_key(private_key.public_key())
+        key_id = f20221310104_public_key_id(public_key_pem)
+
+        encrypted = private_key.export_key(
+            format='PEM',
+            passphrase=passphrase,
+            protection=KEY_PROTECTION,
+            prot_params={'iteration_count': KEY_PROTECTION_ITERATIONS},
+            **({'pkcs': 8} if algorithm == ALGORITHM_RSA else {})
+        )
+        if isinstance(encrypted, bytes):
+            encrypted = encrypted.decode('ascii')
+
+        with self._lock:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            self._load_index()
+            fd = os.open(self._key_path(key_id), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='ascii') as f:
+                f.write(encrypted)
+            self._index[key_id] = KeyStoreEntry(key_id, algorithm, label, time.time(), public_key_pem)
+            self._keys[key_id] = private_key
+            self._save_index()
+        return key_id
+
+    @f20221310104_traced("keystore.load")
+    def load(self, key_id: str) -> SigningKey:
+        """
+        Ambil private key, dekripsi hanya saat pertama kali dipakai
+
+        Args:
+            key_id: Key ID
+
+        Returns:
+            Private key object
+
+        Raises:
+            KeyNotFoundError: Jika key ID tidak ada di keystore
+            IncorrectPassphraseError: Jika passphrase salah atau file kunci rusak
+        """
+        key = self._keys.get(key_id)
+        if key is not None:
+            return key
+
+        entry = self.entry(key_id)
+        passphrase = self._require_passphrase()
+        with self._lock:
+            key = self._keys.get(key_id)
+            if key is None:
+                with open(self._key_path(key_id), encoding='ascii') as f:
+                    encrypted = f.read()
+                try:
+                    if entry.algorithm == ALGORITHM_RSA:
+                        key = RSA.import_key(encrypted, passphrase)
+                    else:
+                        key = ECC.import_key(encrypted, passphrase)
+                except ValueError as e:
+                    raise IncorrectPassphraseError(
+                        f"Gagal mendekripsi kunci {key_id}: passphrase salah atau file rusak"
+                    ) from e
+                self._keys[key_id] = key
+        return key
+
+    def delete(self, key_id: str) -> None:
+        """
+        Hapus kunci dari keystore
+
+        Raises:
+            KeyNotFoundError: Jika key ID tidak ada di keystore
+        """
+        self.entry(key_id)
+        with self._lock:
+            self._load_index()
+            self._index.pop(key_id, None)
+            self._keys.pop(key_id, None)
+            self._save_index()
+            try:
+                os.remove(self._key_path(key_id))
+            except FileNotFoundError:
+                pass
+
+    def __contains__(self, key_id: object) -> bool:
+        return key_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+_f20221310104_keystores: "OrderedDict[Tuple[str, str], KeyStore]" = OrderedDict()
+_f20221310104_keystores_lock = threading.Lock()
+
+
+def f20221310104_open_keystore(passphrase: Optional[str] = None, directory: Optional[str] = None) -> KeyStore:
+    """
+    Buka keystore bersama untuk satu direktori dan passphrase
+
+    Instance dipakai ulang oleh semua sesi dalam proses yang sama sehingga
+    private key yang sudah didekripsi tidak didekripsi ulang. Paling banyak
+    MAX_OPEN_KEYSTORES instance disimpan (LRU), sehingga passphrase yang
+    salah ketik tidak menumpuk di memori. Direktori tidak dibuat di sini.
+
+    Args:
+        passphrase: Passphrase keystore (None untuk akses index saja)
+        directory: Direktori keystore (default: DIGISIGN_KEYSTORE_DIR atau
+            ~/.digisign/keystore)
+
+    Returns:
+        Instance KeyStore
+    """
+    directory = os.path.abspath(os.path.expanduser(
+        directory or os.environ.get(KEYSTORE_DIR_ENV) or DEFAULT_KEYSTORE_DIR
+    ))
+    # Passphrase tidak disimpan sebagai key dictionary, hanya digest-nya
+    passphrase_digest = hashlib.sha256((passphrase or "").encode('utf-8')).hexdigest()
+    cache_key = (directory, passphrase_digest)
+    with _f20221310104_keystores_lock:
+        keystore = _f20221310104_keystores.get(cache_key)
+        if keystore is None:
+            keystore = _f20221310104_keystores[cache_key] = KeyStore(directory, passphrase)
+            while len(_f20221310104_keystores) > MAX_OPEN_KEYSTORES:
+                _f20221310104_keystores.popitem(last=False)
+        else:
+            _f20221310104_keystores.move_to_end(cache_key)
+        return keystore
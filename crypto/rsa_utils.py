@@ -3,10 +3,20 @@ RSA Key Generation and Management Utilities
 Modul untuk menghasilkan dan mengelola kunci RSA
 """
 
-from Crypto.PublicKey import RSA
-from typing import Tuple
+from Crypto.PublicKey import ECC, RSA
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, Optional, Tuple
+import base64
+import binascii
+import hashlib
+import threading
+import time
 
+from instrumentation import f20221310104_traced
 
+
+@f20221310104_traced()
 def f20221310104_generate_key_pair(key_size: int = 2048) -> Tuple[RSA.RsaKey, RSA.RsaKey]:
     """
     Generate RSA key pair (public key dan private key)
@@ -22,53 +32,435 @@ def f20221310104_generate_key_pair(key_size: int = 2048) -> Tuple[RSA.RsaKey, RS
     return private_key, public_key
 
 
+@f20221310104_traced()
 def f20221310104_export_public_key(key: RSA.RsaKey) -> str:
     """
     Export public key ke format PEM
     
     Args:
-        key: RSA public key object
+        key: RSA public key object (atau ECC.EccKey)
     
     Returns:
         Public key dalam format PEM string
     """
-    return key.export_key(format='PEM').decode('utf-8')
+    pem = key.export_key(format='PEM')
+    # ECC.EccKey mengembalikan str, RsaKey mengembalikan bytes
+    return pem if isinstance(pem, str) else pem.decode('utf-8')
 
 
+@f20221310104_traced()
 def f20221310104_export_private_key(key: RSA.RsaKey) -> str:
     """
     Export private key ke format PEM
     
     Args:
-        key: RSA private key object
+        key: RSA private key object (atau ECC.EccKey)
     
     Returns:
         Private key dalam format PEM string
     """
-    return key.export_key(format='PEM').decode('utf-8')
+    pem = key.export_key(format='PEM')
+    # ECC.EccKey mengembalikan str, RsaKey mengembalikan bytes
+    return pem if isinstance(pem, str) else pem.decode('utf-8')
 
 
+@f20221310104_traced()
 def f20221310104_import_public_key(pem: str) -> RSA.RsaKey:
     """
     Import public key dari format PEM
     
+    Public key kurva eliptik (ECDSA P-256 / Ed25519) juga diterima.
+    
     Args:
         pem: Public key dalam format PEM string
     
     Returns:
-        RSA public key object
+        RSA public key object (atau ECC.EccKey untuk key kurva eliptik)
     """
-    return RSA.import_key(pem.encode('utf-8'))
+    try:
+        return RSA.import_key(pem.encode('utf-8'))
+    except ValueError:
+        return ECC.import_key(pem)
 
 
+@f20221310104_traced()
 def f20221310104_import_private_key(pem: str) -> RSA.RsaKey:
     """
     Import private key dari format PEM
     
+    Private key kurva eliptik (ECDSA P-256 / Ed25519) juga diterima.
+    
     Args:
         pem: Private key dalam format PEM string
     
     Returns:
-        RSA private key object
+        RSA private key object (atau ECC.EccKey untuk key kurva eliptik)
+    """
+    try:
+        return RSA.import_key(pem.encode('utf-8'))
+    except ValueError:
+        return ECC.import_key(pem)
+
+
+def _f20221310104_generate_private_der(key_size: int) -> bytes:
+    """
+    Generate private key dan kembalikan dalam format DER
+
+    Dipakai oleh worker process pada KeyPairPool karena objek RsaKey
+    tidak bisa di-pickle.
+
+    Args:
+        key_size: Ukuran kunci dalam bit
+
+    Returns:
+        Private key dalam format DER bytes
+    """
+    return RSA.generate(key_size).export_key(format='DER')
+
+
+class KeyPairPool:
+    """
+    Pool pasangan kunci RSA yang di-generate terlebih dahulu di background
+
+    Setiap ukuran kunci memiliki antrian terbatas (``capacity``). Setiap kali
+    kunci diambil, pool menjadwalkan refill di background sehingga pemanggil
+    berikutnya langsung mendapatkan kunci tanpa menunggu pencarian bilangan prima.
+    Jika antrian kosong (miss), kunci di-generate secara sinkron.
+    """
+
+    def __init__(
+        self,
+        key_sizes: Iterable[int] = (2048,),
+        capacity: int = 2,
+        max_workers: int = 1,
+        use_processes: bool = False
+    ):
+        """
+        Args:
+            key_sizes: Ukuran kunci yang langsung diisi saat pool dibuat
+            capacity: Jumlah maksimum pasangan kunci yang disimpan per ukuran
+            max_workers: Jumlah worker background untuk refill
+            use_processes: Gunakan process pool (tidak berebut GIL dengan
+                thread Streamlit) alih-alih thread pool
+        """
+        if capacity < 1:
+            raise ValueError("capacity harus >= 1")
+
+        self._capacity = capacity
+        self._use_processes = use_processes
+        if use_processes:
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="rsa-keypool"
+            )
+        # RLock: callback refill bisa dipanggil langsung di thread yang sama
+        # jika future sudah selesai sebelum add_done_callback
+        self._lock = threading.RLock()
+        self._ready: Dict[int, Deque[Tuple[RSA.RsaKey, RSA.RsaKey]]] = {}
+        self._pending: Dict[int, int] = {}
+        self._stats: Dict[int, Dict[str, float]] = {}
+        self._closed = False
+
+        for key_size in key_sizes:
+            with self._lock:
+                self._ensure_size(key_size)
+                self._schedule_refill(key_size)
+
+    def _ensure_size(self, key_size: int) -> None:
+        # Dipanggil dengan self._lock sudah dipegang
+        if key_size not in self._ready:
+            self._ready[key_size] = deque()
+            self._pending[key_size] = 0
+            self._stats[key_size] = {
+                "hits": 0,
+                "misses": 0,
+                "refills": 0,
+                "refill_errors": 0,
+                "refill_seconds_total": 0.0,
+                "refill_seconds_max": 0.0,
+            }
+
+    def _schedule_refill(self, key_size: int) -> None:
+        # Dipanggil dengan self._lock sudah dipegang
+        if self._closed:
+            return
+        missing = self._capacity - len(self._ready[key_size]) - self._pending[key_size]
+        for _ in range(missing):
+            self._pending[key_size] += 1
+            started = time.perf_counter()
+            if self._use_processes:
+                future = self._executor.submit(_f20221310104_generate_private_der, key_size)
+            else:
+                future = self._executor.submit(f20221310104_generate_key_pair, key_size)
+            future.add_done_callback(
+                lambda f, size=key_size, t0=started: self._on_refilled(size, t0, f)
+            )
+
+    def _on_refilled(self, key_size: int, started: float, future: Future) -> None:
+        elapsed = time.perf_counter() - started
+        try:
+            result = future.result()
+            if self._use_processes:
+                private_key = RSA.import_key(result)
+                result = (private_key, private_key.publickey())
+        except Exception:
+            with self._lock:
+                self._pending[key_size] -= 1
+                self._stats[key_size]["refill_errors"] += 1
+            return
+
+        with self._lock:
+            self._pending[key_size] -= 1
+            stats = self._stats[key_size]
+            stats["refills"] += 1
+            stats["refill_seconds_total"] += elapsed
+            stats["refill_seconds_max"] = max(stats["refill_seconds_max"], elapsed)
+            if len(self._ready[key_size]) < self._capacity:
+                self._ready[key_size].append(result)
+
+    def get(self, key_size: int = 2048) -> Tuple[RSA.RsaKey, RSA.RsaKey]:
+        """
+        Ambil pasangan kunci dari pool
+
+        Args:
+            key_size: Ukuran kunci dalam bit
+
+        Returns:
+            Tuple berisi (private_key, public_key)
+        """
+        with self._lock:
+            self._ensure_size(key_size)
+            ready = self._ready[key_size]
+            key_pair = ready.popleft() if ready else None
+            if key_pair is not None:
+                self._stats[key_size]["hits"] += 1
+            else:
+                self._stats[key_size]["misses"] += 1
+            self._schedule_refill(key_size)
+
+        if key_pair is None:
+            # Pool kosong: generate langsung agar pemanggil tidak menunggu antrian
+            key_pair = f20221310104_generate_key_pair(key_size)
+        return key_pair
+
+    def stats(self) -> Dict[int, Dict[str, float]]:
+        """
+        Statistik pool per ukuran kunci
+
+        Returns:
+            Dictionary {key_size: {hits, misses, hit_rate, ready, pending,
+            refills, refill_errors, refill_seconds_avg, refill_seconds_max}}
+        """
+        with self._lock:
+            report = {}
+            for key_size, stats in self._stats.items():
+                lookups = stats["hits"] + stats["misses"]
+                refills = stats["refills"]
+                report[key_size] = {
+                    "hits": stats["hits"],
+                    "misses": stats["misses"],
+                    "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+                    "ready": len(self._ready[key_size]),
+                    "pending": self._pending[key_size],
+                    "refills": refills,
+                    "refill_errors": stats["refill_errors"],
+                    "refill_seconds_avg": stats["refill_seconds_total"] / refills if refills else 0.0,
+                    "refill_seconds_max": stats["refill_seconds_max"],
+                }
+            return report
+
+    def close(self, wait: bool = False) -> None:
+        """
+        Hentikan refill background
+
+        Args:
+            wait: Tunggu sampai refill yang sedang berjalan selesai
+        """
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_f20221310104_key_pool: Optional[KeyPairPool] = None
+_f20221310104_key_pool_lock = threading.Lock()
+
+
+def f20221310104_get_key_pool() -> KeyPairPool:
+    """
+    Dapatkan instance KeyPairPool bersama (satu per proses)
+
+    Returns:
+        KeyPairPool yang sudah mulai mengisi kunci 2048-bit
+    """
+    global _f20221310104_key_pool
+    with _f20221310104_key_pool_lock:
+        if _f20221310104_key_pool is None:
+            _f20221310104_key_pool = KeyPairPool(key_sizes=(2048,))
+        return _f20221310104_key_pool
+
+
+@f20221310104_traced()
+def f20221310104_pooled_key_pair(key_size: int = 2048) -> Tuple[RSA.RsaKey, RSA.RsaKey]:
+    """
+    Ambil pasangan kunci RSA dari pool bersama
+
+    Args:
+        key_size: Ukuran kunci dalam bit (default: 2048)
+
+    Returns:
+        Tuple berisi (private_key, public_key)
+    """
+    return f20221310104_get_key_pool().get(key_size)
+
+
+def f20221310104_public_key_der(pem: str) -> bytes:
+    """
+    Ambil bytes DER dari public key PEM
+
+    Header, footer, dan whitespace dibuang terlebih dahulu sehingga PEM hasil
+    copy-paste dengan line ending berbeda menghasilkan DER yang sama.
+
+    Args:
+        pem: Public key dalam format PEM string
+
+    Returns:
+        Bytes DER public key
+
+    Raises:
+        ValueError: Jika isi PEM bukan base64 yang valid
+    """
+    body = ''.join(
+        line.strip() for line in pem.strip().splitlines()
+        if line.strip() and not line.startswith('-----')
+    )
+    return base64.b64decode(body, validate=True)
+
+
+@f20221310104_traced()
+def f20221310104_public_key_fingerprint(pem: str) -> str:
+    """
+    Hitung fingerprint SHA-256 dari public key PEM
+
+    PEM dinormalisasi terlebih dahulu (header, footer, dan whitespace
+    dibuang) sehingga perbedaan line ending atau spasi hasil copy-paste
+    tetap menghasilkan fingerprint yang sama.
+
+    Args:
+        pem: Public key dalam format PEM string
+
+    Returns:
+        Fingerprint dalam format hex string (64 karakter)
+    """
+    try:
+        der = f20221310104_public_key_der(pem)
+    except (binascii.Error, ValueError):
+        # Bukan PEM base64 yang valid: fingerprint dari teks apa adanya
+        der = pem.strip().encode('utf-8')
+    return hashlib.sha256(der).hexdigest()
+
+
+class PublicKeyCache:
+    """
+    LRU cache untuk public key RSA yang sudah di-parse
+
+    Key cache adalah fingerprint SHA-256 dari PEM yang dinormalisasi,
+    sehingga PEM yang sama tidak di-parse ulang setiap kali verifikasi.
+    """
+
+    def __init__(self, max_size: int = 64):
+        """
+        Args:
+            max_size: Jumlah maksimum public key yang disimpan
+        """
+        if max_size < 1:
+            raise ValueError("max_size harus >= 1")
+
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, RSA.RsaKey]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, pem: str) -> RSA.RsaKey:
+        """
+        Ambil public key dari cache, import jika belum ada
+
+        Args:
+            pem: Public key dalam format PEM string
+
+        Returns:
+            RSA public key object
+        """
+        fingerprint = f20221310104_public_key_fingerprint(pem)
+        with self._lock:
+            key = self._entries.get(fingerprint)
+            if key is not None:
+                self._entries.move_to_end(fingerprint)
+                self._hits += 1
+                return key
+            self._misses += 1
+
+        # Parse di luar lock agar lookup lain tidak ikut menunggu
+        key = f20221310104_import_public_key(pem)
+
+        with self._lock:
+            self._entries[fingerprint] = key
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return key
+
+    def clear(self) -> None:
+        """Kosongkan cache dan reset counter"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Statistik cache
+
+        Returns:
+            Dictionary {size, max_size, hits, misses, evictions, hit_rate}
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+_f20221310104_public_key_cache = PublicKeyCache()
+
+
+def f20221310104_get_public_key_cache() -> PublicKeyCache:
+    """
+    Dapatkan instance PublicKeyCache bersama (satu per proses)
+
+    Returns:
+        PublicKeyCache bersama
+    """
+    return _f20221310104_public_key_cache
+
+
+@f20221310104_traced()
+def f20221310104_import_public_key_cached(pem: str) -> RSA.RsaKey:
+    """
+    Import public key dari format PEM melalui LRU cache bersama
+
+    Args:
+        pem: Public key dalam format PEM string
+
+    Returns:
+        RSA public key object
     """
-    return RSA.import_key(pem.encode('utf-8'))
+    return _f20221310104_public_key_cache.get(pem)
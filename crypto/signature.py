@@ -1,14 +1,59 @@
 """
 Digital Signature Module
 Modul untuk membuat dan memverifikasi tanda tangan digital menggunakan RSA dan SHA-256
+
+Algoritma (RSA, ECDSA P-256, Ed25519) dipilih otomatis dari tipe key; lihat
+crypto.algorithms. SignatureEnvelope menggabungkan beberapa signer atas
+digest pesan yang sama.
 """
 
-from Crypto.PublicKey import RSA
-from Crypto.Signature import pkcs1_15
 from Crypto.Hash import SHA256
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    IO, TYPE_CHECKING, Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional,
+    Tuple, Union
+)
 import base64
+import hashlib
+import io
+import mmap
+import os
+import threading
+
+from instrumentation import f20221310104_stage, f20221310104_traced
+
+from .algorithms import (
+    DEFAULT_ALGORITHM,
+    SigningKey,
+    f20221310104_backend_for_key,
+    f20221310104_key_algorithm,
+    f20221310104_public_key_algorithm
+)
+from .encoding import BytesLike, f20221310104_decode_base64
+from .key_registry import (
+    KeyNotFoundError,
+    KeyRegistry,
+    f20221310104_get_key_registry,
+    f20221310104_public_key_id,
+    f20221310104_resolve_public_key,
+)
+from .rsa_utils import (
+    f20221310104_export_public_key,
+    f20221310104_import_public_key_cached,
+    f20221310104_public_key_fingerprint
+)
+
+if TYPE_CHECKING:
+    from .verification_cache import VerificationCache
 
 
+# Ukuran chunk default untuk hashing streaming (1 MiB)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+@f20221310104_traced()
 def f20221310104_hash_message(message: str) -> SHA256.SHA256Hash:
     """
     Hash pesan menggunakan algoritma SHA-256
@@ -22,18 +67,19 @@ def f20221310104_hash_message(message: str) -> SHA256.SHA256Hash:
     return SHA256.new(message.encode('utf-8'))
 
 
-def f20221310104_sign_message(message: str, private_key: RSA.RsaKey) -> str:
+@f20221310104_traced()
+def f20221310104_sign_message(message: str, private_key: SigningKey) -> str:
     """
     Buat digital signature dari pesan menggunakan private key
     
     Proses:
     1. Hash pesan dengan SHA-256
-    2. Enkripsi hash dengan private key RSA
+    2. Tanda tangani hash dengan private key (RSA, ECDSA, atau EdDSA)
     3. Encode hasil ke base64
     
     Args:
         message: Pesan yang akan ditandatangani
-        private_key: RSA private key untuk signing
+        private_key: Private key untuk signing (RSA atau ECC)
     
     Returns:
         Digital signature dalam format base64 string
@@ -41,14 +87,42 @@ def f20221310104_sign_message(message: str, private_key: RSA.RsaKey) -> str:
     # Hash pesan dengan SHA-256
     message_hash = f20221310104_hash_message(message)
     
-    # Tanda tangani hash dengan private key
-    signature = pkcs1_15.new(private_key).sign(message_hash)
+    return f20221310104_sign_hash(message_hash, private_key)
+
+
+@f20221310104_traced()
+def f20221310104_sign_hash(message_hash: SHA256.SHA256Hash, private_key: SigningKey) -> str:
+    """
+    Buat digital signature dari hash SHA-256 yang sudah dihitung
+    
+    Args:
+        message_hash: SHA256 hash object dari pesan
+        private_key: Private key untuk signing (RSA atau ECC)
+    
+    Returns:
+        Digital signature dalam format base64 string
+    """
+    # Tanda tangani hash dengan private key (backend sesuai tipe key)
+    backend = f20221310104_backend_for_key(private_key)
+    with f20221310104_stage(f"{backend.stage}.private_op"):
+        signature = backend.sign(backend.new_scheme(private_key), message_hash)
     
     # Encode ke base64 untuk kemudahan penyimpanan/transfer
-    return base64.b64encode(signature).decode('utf-8')
+    with f20221310104_stage("base64.encode"):
+        return base64.b64encode(signature).decode('utf-8')
 
 
-def f20221310104_verify_signature(message: str, signature: str, public_key: RSA.RsaKey) -> bool:
+class InvalidSignatureError(ValueError):
+    """Signature tidak cocok dengan pesan dan public key, atau algoritma tidak sesuai"""
+
+
+@f20221310104_traced()
+def f20221310104_verify_signature(
+    message: str,
+    signature: str,
+    public_key: SigningKey,
+    algorithm: Optional[str] = None
+) -> bool:
     """
     Verifikasi digital signature menggunakan public key
     
@@ -61,35 +135,113 @@ def f20221310104_verify_signature(message: str, signature: str, public_key: RSA.
     Args:
         message: Pesan asli yang perlu diverifikasi
         signature: Digital signature dalam format base64
-        public_key: RSA public key untuk verifikasi
+        public_key: Public key untuk verifikasi (RSA atau ECC)
+        algorithm: Algoritma yang tercatat di payload (opsional); jika
+            diisi harus sama dengan algoritma public key
+    
+    Returns:
+        True jika signature valid, False jika tidak
+    """
+    # Hash pesan yang diterima
+    return f20221310104_verify_hash(
+        f20221310104_hash_message(message), signature, public_key, algorithm
+    )
+
+
+@f20221310104_traced()
+def f20221310104_verify_hash(
+    message_hash: SHA256.SHA256Hash,
+    signature: str,
+    public_key: SigningKey,
+    algorithm: Optional[str] = None
+) -> bool:
+    """
+    Verifikasi digital signature terhadap hash SHA-256 yang sudah dihitung
+    
+    Args:
+        message_hash: SHA256 hash object dari pesan
+        signature: Digital signature dalam format base64
+        public_key: Public key untuk verifikasi (RSA atau ECC)
+        algorithm: Algoritma yang tercatat di payload (opsional); jika
+            diisi harus sama dengan algoritma public key
     
     Returns:
         True jika signature valid, False jika tidak
     """
     try:
-        # Clean signature string - remove whitespace and newlines
-        signature_clean = signature.strip().replace('\n', '').replace('\r', '').replace(' ', '')
-        
-        # Fix base64 padding if needed
-        padding_needed = len(signature_clean) % 4
-        if padding_needed:
-            signature_clean += '=' * (4 - padding_needed)
-        
-        # Decode signature dari base64
-        signature_bytes = base64.b64decode(signature_clean)
-        
-        # Hash pesan yang diterima
-        message_hash = f20221310104_hash_message(message)
-        
-        # Verifikasi signature
-        pkcs1_15.new(public_key).verify(message_hash, signature_bytes)
-        
+        f20221310104_check_hash(message_hash, signature, public_key, algorithm)
         return True
-    except (ValueError, TypeError) as e:
-        print(f"Verification error: {e}")
+    except (ValueError, TypeError):
         return False
 
 
+@f20221310104_traced()
+def f20221310104_check_hash(
+    message_hash: SHA256.SHA256Hash,
+    signature: BytesLike,
+    public_key: SigningKey,
+    algorithm: Optional[str] = None
+) -> None:
+    """
+    Verifikasi signature terhadap hash dan lempar error bertipe jika gagal
+    
+    Versi f20221310104_verify_hash yang melaporkan penyebab kegagalan.
+    
+    Args:
+        message_hash: SHA256 hash object dari pesan
+        signature: Digital signature base64 (standar/urlsafe; str, bytes,
+            atau memoryview)
+        public_key: Public key untuk verifikasi (RSA atau ECC)
+        algorithm: Algoritma yang tercatat di payload (opsional)
+    
+    Raises:
+        Base64DecodeError: Jika signature bukan base64 yang valid
+        InvalidSignatureError: Jika signature tidak valid atau algoritma
+            tidak cocok dengan public key
+        ValueError: Jika tipe public key tidak didukung
+    """
+    backend = f20221310104_backend_for_key(public_key)
+    if algorithm is not None and algorithm != backend.name:
+        raise InvalidSignatureError(
+            f"Algoritma payload {algorithm} tidak cocok dengan key {backend.name}"
+        )
+    
+    # Decode signature dari base64
+    with f20221310104_stage("base64.decode"):
+        signature_bytes = f20221310104_decode_base64(signature)
+    
+    # Verifikasi signature
+    with f20221310104_stage(f"{backend.stage}.public_op"):
+        try:
+            backend.verify(backend.new_scheme(public_key), message_hash, signature_bytes)
+        except (ValueError, TypeError) as e:
+            raise InvalidSignatureError(str(e) or "Signature tidak valid") from None
+
+
+@f20221310104_traced()
+def f20221310104_check_signature(
+    message: str,
+    signature: BytesLike,
+    public_key: SigningKey,
+    algorithm: Optional[str] = None
+) -> None:
+    """
+    Verifikasi signature pesan dan lempar error bertipe jika gagal
+    
+    Args:
+        message: Pesan asli
+        signature: Digital signature base64
+        public_key: Public key untuk verifikasi (RSA atau ECC)
+        algorithm: Algoritma yang tercatat di payload (opsional)
+    
+    Raises:
+        Base64DecodeError: Jika signature bukan base64 yang valid
+        InvalidSignatureError: Jika signature tidak valid
+    """
+    f20221310104_check_hash(f20221310104_hash_message(message), signature, public_key, algorithm)
+
+
+@f20221310104_traced()
 def f20221310104_get_hash_hex(message: str) -> str:
     """
     Dapatkan hash pesan dalam format hexadecimal
@@ -101,3 +253,803 @@ def f20221310104_get_hash_hex(message: str) -> str:
         Hash dalam format hex string
     """
     return f20221310104_hash_message(message).hexdigest()
+
+
+class Signer:
+    """
+    Objek signing yang dapat dipakai ulang untuk satu private key
+
+    Skema signing (PKCS#1 v1.5, ECDSA, atau EdDSA sesuai tipe key)
+    disiapkan sekali saat konstruksi. Hash SHA-256 dimulai dari template
+    yang sudah di-seed dengan ``prefix`` (misalnya header envelope tetap)
+    lalu di-``copy()`` per pesan, sehingga prefix tidak di-hash ulang.
+
+    Aman dipakai bersama oleh banyak thread.
+
+    Catatan: dengan prefix, signature dibuat atas ``prefix + message``;
+    verifikasi harus memakai pesan lengkap tersebut.
+    """
+
+    def __init__(self, private_key: SigningKey, prefix: Union[str, bytes] = b""):
+        """
+        Args:
+            private_key: Private key untuk signing (RSA atau ECC)
+            prefix: Prefix tetap yang selalu mendahului pesan
+
+        Raises:
+            TypeError: Jika key tidak memiliki komponen private
+            ValueError: Jika tipe key tidak didukung
+        """
+        if not private_key.has_private():
+            raise TypeError("Signer membutuhkan private key")
+
+        if isinstance(prefix, str):
+            prefix = prefix.encode('utf-8')
+        self._private_key = private_key
+        self._public_key = private_key.public_key()
+        self._backend = f20221310104_backend_for_key(private_key)
+        self._scheme = self._backend.new_scheme(private_key)
+        self._prefix = bytes(prefix)
+        self._template = SHA256.new(self._prefix)
+        self._lock = threading.Lock()
+
+    @property
+    def public_key(self) -> SigningKey:
+        """Public key pasangan dari private key signer"""
+        return self._public_key
+
+    @property
+    def algorithm(self) -> str:
+        """Nama algoritma signer (RS256, ES256, atau EdDSA)"""
+        return self._backend.name
+
+    @property
+    def prefix(self) -> bytes:
+        """Prefix tetap yang di-hash sebelum setiap pesan"""
+        return self._prefix
+
+    def hash(self, message: Union[str, bytes]) -> SHA256.SHA256Hash:
+        """
+        Hash ``prefix + message`` dari salinan template
+
+        Args:
+            message: Pesan (str dienkode ke UTF-8)
+
+        Returns:
+            SHA256 hash object
+        """
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        with self._lock:
+            message_hash = self._template.copy()
+        message_hash.update(message)
+        return message_hash
+
+    def sign_hash(self, message_hash: SHA256.SHA256Hash) -> str:
+        """
+        Tanda tangani hash yang sudah dihitung
+
+        Args:
+            message_hash: SHA256 hash object
+
+        Returns:
+            Digital signature dalam format base64 string
+        """
+        with f20221310104_stage(f"{self._backend.stage}.private_op"):
+            signature = self._backend.sign(self._scheme, message_hash)
+        with f20221310104_stage("base64.encode"):
+            return base64.b64encode(signature).decode('utf-8')
+
+    def sign(self, message: Union[str, bytes]) -> str:
+        """
+        Tanda tangani satu pesan
+
+        Args:
+            message: Pesan yang akan ditandatangani
+
+        Returns:
+            Digital signature dalam format base64 string
+        """
+        return self.sign_hash(self.hash(message))
+
+    def sign_many(
+        self,
+        messages: Iterable[Union[str, bytes]],
+        executor: Optional[Executor] = None
+    ) -> List[str]:
+        """
+        Tanda tangani banyak pesan dengan setup yang sama
+
+        Args:
+            messages: Iterable berisi pesan
+            executor: Executor opsional (misalnya ThreadPoolExecutor) untuk
+                menjalankan signing secara paralel
+
+        Returns:
+            List signature base64 dengan urutan yang sama seperti input
+        """
+        if executor is None:
+            return [self.sign(message) for message in messages]
+        return list(executor.map(self.sign, messages))
+
+
+@f20221310104_traced()
+def f20221310104_hash_chunks(
+    chunks: Iterable[Union[str, bytes, bytearray, memoryview]]
+) -> SHA256.SHA256Hash:
+    """
+    Hash pesan yang diberikan per potongan (iterator) dengan SHA-256
+
+    Potongan ``str`` dienkode ke UTF-8 sehingga hasilnya identik dengan
+    f20221310104_hash_message untuk isi yang sama.
+
+    Args:
+        chunks: Iterable berisi potongan pesan (str atau bytes-like)
+
+    Returns:
+        SHA256 hash object
+    """
+    message_hash = SHA256.new()
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        message_hash.update(chunk)
+    return message_hash
+
+
+@f20221310104_traced()
+def f20221310104_hash_stream(stream: IO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> SHA256.SHA256Hash:
+    """
+    Hash isi file-like object per chunk tanpa memuat seluruh isi ke memori
+
+    Stream biner dibaca dengan ``readinto`` ke satu buffer yang dipakai
+    ulang (lewat memoryview); stream teks dibaca per ``chunk_size``
+    karakter dan dienkode ke UTF-8.
+
+    Args:
+        stream: File-like object (mode biner atau teks)
+        chunk_size: Ukuran chunk dalam byte/karakter
+
+    Returns:
+        SHA256 hash object
+    """
+    message_hash = SHA256.new()
+    readinto = getattr(stream, 'readinto', None)
+    if readinto is not None and not isinstance(stream, io.TextIOBase):
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while True:
+            count = readinto(view)
+            if not count:
+                break
+            message_hash.update(view[:count])
+        return message_hash
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        message_hash.update(chunk)
+    return message_hash
+
+
+@f20221310104_traced()
+def f20221310104_hash_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> SHA256.SHA256Hash:
+    """
+    Hash isi file dengan SHA-256 menggunakan mmap
+
+    File di-mmap lalu di-hash per slice memoryview sehingga tidak ada
+    salinan data di heap Python; pemakaian memori tetap datar berapapun
+    ukuran file.
+
+    Args:
+        path: Path file yang akan di-hash
+        chunk_size: Ukuran slice per update hash dalam byte
+
+    Returns:
+        SHA256 hash object
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return SHA256.new()
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Filesystem tanpa dukungan mmap: fallback ke pembacaan per chunk
+            return f20221310104_hash_stream(f, chunk_size)
+
+        message_hash = SHA256.new()
+        with mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, size, chunk_size):
+                    message_hash.update(view[offset:offset + chunk_size])
+            finally:
+                view.release()
+        return message_hash
+
+
+@f20221310104_traced()
+def f20221310104_sign_stream(
+    stream: IO, private_key: SigningKey, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> str:
+    """
+    Buat digital signature dari isi file-like object
+
+    Args:
+        stream: File-like object (mode biner atau teks)
+        private_key: Private key untuk signing (RSA atau ECC)
+        chunk_size: Ukuran chunk dalam byte/karakter
+
+    Returns:
+        Digital signature dalam format base64 string
+    """
+    return f20221310104_sign_hash(f20221310104_hash_stream(stream, chunk_size), private_key)
+
+
+@f20221310104_traced()
+def f20221310104_sign_file(
+    path: str, private_key: SigningKey, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> str:
+    """
+    Buat digital signature dari isi file
+
+    Args:
+        path: Path file yang akan ditandatangani
+        private_key: Private key untuk signing (RSA atau ECC)
+        chunk_size: Ukuran slice per update hash dalam byte
+
+    Returns:
+        Digital signature dalam format base64 string
+    """
+    return f20221310104_sign_hash(f20221310104_hash_file(path, chunk_size), private_key)
+
+
+@f20221310104_traced()
+def f20221310104_sign_chunks(
+    chunks: Iterable[Union[str, bytes, bytearray, memoryview]],
+    private_key: SigningKey
+) -> str:
+    """
+    Buat digital signature dari pesan yang diberikan per potongan
+
+    Args:
+        chunks: Iterable berisi potongan pesan (str atau bytes-like)
+        private_key: Private key untuk signing (RSA atau ECC)
+
+    Returns:
+        Digital signature dalam format base64 string
+    """
+    return f20221310104_sign_hash(f20221310104_hash_chunks(chunks), private_key)
+
+
+@f20221310104_traced()
+def f20221310104_verify_stream(
+    stream: IO,
+    signature: str,
+    public_key: SigningKey,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> bool:
+    """
+    Verifikasi digital signature terhadap isi file-like object
+
+    Args:
+        stream: File-like object (mode biner atau teks)
+        signature: Digital signature dalam format base64
+        public_key: Public key untuk verifikasi (RSA atau ECC)
+        chunk_size: Ukuran chunk dalam byte/karakter
+
+    Returns:
+        True jika signature valid, False jika tidak
+    """
+    return f20221310104_verify_hash(
+        f20221310104_hash_stream(stream, chunk_size), signature, public_key
+    )
+
+
+@f20221310104_traced()
+def f20221310104_verify_file(
+    path: str,
+    signature: str,
+    public_key: SigningKey,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> bool:
+    """
+    Verifikasi digital signature terhadap isi file
+
+    Args:
+        path: Path file yang akan diverifikasi
+        signature: Digital signature dalam format base64
+        public_key: Public key untuk verifikasi (RSA atau ECC)
+        chunk_size: Ukuran slice per update hash dalam byte
+
+    Returns:
+        True jika signature valid, False jika tidak
+    """
+    return f20221310104_verify_hash(f20221310104_hash_file(path, chunk_size), signature, public_key)
+
+
+@f20221310104_traced()
+def f20221310104_verify_chunks(
+    chunks: Iterable[Union[str, bytes, bytearray, memoryview]],
+    signature: str,
+    public_key: SigningKey
+) -> bool:
+    """
+    Verifikasi digital signature terhadap pesan yang diberikan per potongan
+
+    Args:
+        chunks: Iterable berisi potongan pesan (str atau bytes-like)
+        signature: Digital signature dalam format base64
+        public_key: Public key untuk verifikasi (RSA atau ECC)
+
+    Returns:
+        True jika signature valid, False jika tidak
+    """
+    return f20221310104_verify_hash(f20221310104_hash_chunks(chunks), signature, public_key)
+
+
+class VerificationResult(NamedTuple):
+    """Hasil verifikasi satu payload pada verifikasi batch"""
+    index: int
+    valid: bool
+    error: Optional[str] = None
+
+
+def _f20221310104_payload_fields(
+    payload: Any,
+    registry: Optional[KeyRegistry] = None
+) -> Tuple[str, str, str, Optional[str]]:
+    """
+    Ambil (message, signature, public_key_pem, algorithm) dari payload
+
+    Payload bisa berupa dictionary hasil f20221310104_decode_qris_data
+    atau tuple (message, signature, public_key_pem[, algorithm]). Payload
+    yang hanya membawa key ID di-resolve lewat key registry, sama seperti
+    verifikasi satu payload.
+
+    Raises:
+        KeyNotFoundError: Jika key ID tidak terdaftar
+        TypeError, ValueError: Jika struktur atau tipe field tidak valid
+    """
+    if isinstance(payload, dict):
+        message, signature = payload["message"], payload["signature"]
+        public_key_pem = f20221310104_resolve_public_key(payload, registry)
+        algorithm = payload.get("algorithm")
+    else:
+        message, signature, public_key_pem, *rest = payload
+        if len(rest) > 1:
+            raise ValueError("Tuple payload berisi terlalu banyak field")
+        algorithm = rest[0] if rest else None
+    if not all(isinstance(field, str) for field in (message, signature, public_key_pem)):
+        raise TypeError("message, signature, dan public key harus berupa string")
+    if algorithm is not None and not isinstance(algorithm, str):
+        raise TypeError("algorithm harus berupa string")
+    return message, signature, public_key_pem, algorithm
+
+
+def _f20221310104_verify_chunk(
+    public_key_pem: str,
+    items: List[Tuple[int, str, str, Optional[str]]]
+) -> List[VerificationResult]:
+    """
+    Verifikasi sekumpulan (index, message, signature, algorithm) dengan satu public key
+
+    Dijalankan di worker process; public key di-parse sekali lewat cache
+    per proses sehingga chunk berikutnya dengan key yang sama tidak
+    mem-parse ulang.
+    """
+    try:
+        public_key = f20221310104_import_public_key_cached(public_key_pem)
+        backend = f20221310104_backend_for_key(public_key)
+    except (ValueError, IndexError, TypeError) as e:
+        error = f"Public key tidak valid: {e}"
+        return [VerificationResult(index, False, error) for index, _, _, _ in items]
+
+    verifier = backend.new_scheme(public_key)
+    results = []
+    for index, message, signature, algorithm in items:
+        if algorithm is not None and algorithm != backend.name:
+            error = f"Algoritma payload {algorithm} tidak cocok dengan key {backend.name}"
+            results.append(VerificationResult(index, False, error))
+            continue
+        try:
+            signature_bytes = f20221310104_decode_base64(signature)
+            backend.verify(verifier, f20221310104_hash_message(message), signature_bytes)
+            results.append(VerificationResult(index, True))
+        except (ValueError, TypeError) as e:
+            results.append(VerificationResult(index, False, str(e) or "Signature tidak valid"))
+    return results
+
+
+def _f20221310104_group_chunks(
+    items: List[Tuple[int, Any]],
+    chunk_size: int
+) -> Tuple[List[Tuple[str, List[Tuple[int, str, str, Optional[str]]]]], List[VerificationResult]]:
+    """
+    Kelompokkan payload per public key lalu potong per chunk_size
+
+    Key ID di-resolve di sini (proses utama) karena worker process tidak
+    berbagi key registry.
+
+    Returns:
+        Tuple berisi (chunks, malformed) dimana chunks adalah list
+        (public_key_pem, [(index, message, signature, algorithm), ...]) dan
+        malformed adalah hasil gagal untuk payload yang strukturnya tidak
+        lengkap atau key ID-nya tidak terdaftar
+    """
+    registry = f20221310104_get_key_registry()
+    groups: Dict[str, Tuple[str, List[Tuple[int, str, str, Optional[str]]]]] = {}
+    malformed: List[VerificationResult] = []
+    for index, payload in items:
+        try:
+            message, signature, public_key_pem, algorithm = _f20221310104_payload_fields(
+                payload, registry
+            )
+            fingerprint = f20221310104_public_key_fingerprint(public_key_pem)
+        except KeyNotFoundError as e:
+            malformed.append(VerificationResult(index, False, str(e)))
+            continue
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            malformed.append(VerificationResult(index, False, f"Payload tidak lengkap: {e}"))
+            continue
+        if fingerprint not in groups:
+            groups[fingerprint] = (public_key_pem, [])
+        groups[fingerprint][1].append((index, message, signature, algorithm))
+
+    chunks = []
+    for public_key_pem, group in groups.values():
+        for start in range(0, len(group), chunk_size):
+            chunks.append((public_key_pem, group[start:start + chunk_size]))
+    return chunks, malformed
+
+
+def f20221310104_verify_many(
+    payloads: Iterable[Any],
+    chunk_size: int = 64,
+    max_workers: Optional[int] = None,
+    serial_threshold: int = 32,
+    executor: Optional[Executor] = None
+) -> Iterator[VerificationResult]:
+    """
+    Verifikasi banyak payload sekaligus menggunakan beberapa core CPU
+
+    Payload dikelompokkan per public key sehingga setiap key cukup di-parse
+    sekali per worker, lalu chunk dikirim ke ``executor``. Input dibaca
+    per window sehingga iterable besar (misalnya arsip QRIS) tidak perlu
+    dimuat seluruhnya ke memori. Batch kecil diverifikasi secara serial
+    karena overhead pool lebih besar dari pekerjaannya.
+
+    Pemanggil yang memverifikasi berulang kali sebaiknya memberikan
+    executor sendiri (misalnya ProcessPoolExecutor yang dipakai ulang);
+    tanpa executor, process pool sementara dibuat per panggilan.
+
+    Args:
+        payloads: Iterable berisi dictionary payload QRIS
+            (``message``, ``signature``, ``public_key`` atau ``key_id``,
+            ``algorithm`` opsional) atau tuple
+            (message, signature, public_key_pem[, algorithm])
+        chunk_size: Jumlah payload per tugas yang dikirim ke worker
+        max_workers: Jumlah worker (default: jumlah CPU); menentukan ukuran
+            window dan pool sementara
+        serial_threshold: Batch dengan jumlah payload di bawah nilai ini
+            diverifikasi secara serial tanpa pool
+        executor: Executor opsional milik pemanggil (tidak di-shutdown)
+
+    Returns:
+        Iterator VerificationResult dengan urutan yang sama seperti input
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size harus >= 1")
+
+    workers = max_workers or os.cpu_count() or 1
+    window_size = max(chunk_size * workers * 4, serial_threshold)
+    iterator = iter(enumerate(payloads))
+
+    first_window = list(islice(iterator, window_size))
+    if len(first_window) < serial_threshold or (executor is None and workers == 1):
+        # Serial fallback: batch kecil atau hanya satu worker
+        window = first_window
+        while window:
+            chunks, malformed = _f20221310104_group_chunks(window, chunk_size)
+            results = {result.index: result for result in malformed}
+            for public_key_pem, items in chunks:
+                for result in _f20221310104_verify_chunk(public_key_pem, items):
+                    results[result.index] = result
+            for index, _ in window:
+                yield results[index]
+            window = list(islice(iterator, window_size))
+        return
+
+    owned_executor = None
+    if executor is None:
+        executor = owned_executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # Maksimal dua window di-submit bersamaan: satu sedang dikumpulkan,
+        # satu lagi sudah berjalan di worker
+        in_flight: Deque[
+            Tuple[List[Tuple[int, Any]], List[VerificationResult], List[Future]]
+        ] = deque()
+        window = first_window
+        while window or in_flight:
+            while window and len(in_flight) < 2:
+                chunks, malformed = _f20221310104_group_chunks(window, chunk_size)
+                futures = [
+                    executor.submit(_f20221310104_verify_chunk, public_key_pem, items)
+                    for public_key_pem, items in chunks
+                ]
+                in_flight.append((window, malformed, futures))
+                window = list(islice(iterator, window_size))
+
+            current, malformed, futures = in_flight.popleft()
+            results = {result.index: result for result in malformed}
+            for future in futures:
+                for result in future.result():
+                    results[result.index] = result
+            for index, _ in current:
+                yield results[index]
+    finally:
+        if owned_executor is not None:
+            owned_executor.shutdown(wait=False, cancel_futures=True)
+
+
+class EnvelopeSignature(NamedTuple):
+    """Satu signer pada SignatureEnvelope"""
+    signature: str
+    algorithm: str
+    key_id: str
+    public_key_pem: Optional[str] = None
+
+
+class SignatureEnvelope:
+    """
+    Envelope multi-signer: satu pesan ditandatangani beberapa key
+
+    Pesan di-hash sekali; semua signer menandatangani (dan diverifikasi
+    terhadap) digest SHA-256 yang sama. Hasil verifikasi disimpan per signer
+    sehingga ``verify`` setelah signer baru ditambahkan hanya memeriksa
+    signer yang belum diverifikasi. Signer bersifat paralel (co-sign):
+    urutan penambahan tidak memengaruhi validitas.
+
+    Signer bisa membawa public key PEM atau hanya key ID; key ID di-resolve
+    lewat key registry saat verifikasi.
+    """
+
+    def __init__(self, message: str, message_hash: Optional[SHA256.SHA256Hash] = None):
+        """
+        Args:
+            message: Pesan yang ditandatangani
+            message_hash: Hash SHA-256 pesan jika sudah dihitung
+        """
+        self.message = message
+        self._hash = message_hash or f20221310104_hash_message(message)
+        self._signatures: List[EnvelopeSignature] = []
+        self._results: Dict[int, VerificationResult] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def digest(self) -> bytes:
+        """Digest SHA-256 pesan yang dipakai bersama semua signer"""
+        return self._hash.digest()
+
+    @property
+    def signatures(self) -> Tuple[EnvelopeSignature, ...]:
+        """Signer dalam urutan penambahan"""
+        return tuple(self._signatures)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(
+        self,
+        signature: str,
+        public_key_pem: Optional[str] = None,
+        key_id: Optional[str] = None,
+        algorithm: Optional[str] = None
+    ) -> EnvelopeSignature:
+        """
+        Tambahkan signature yang sudah dibuat (misalnya dari payload QRIS)
+
+        Args:
+            signature: Digital signature base64 atas digest pesan
+            public_key_pem: Public key PEM signer (opsional jika key_id diisi)
+            key_id: Key ID signer (dihitung dari public key jika kosong)
+            algorithm: Algoritma signature (default: dari public key, atau RS256)
+
+        Returns:
+            EnvelopeSignature yang ditambahkan
+
+        Raises:
+            ValueError: Jika public key dan key ID kosong, atau signer
+                dengan key ID yang sama sudah ada
+        """
+        if public_key_pem is None and not key_id:
+            raise ValueError("Signer membutuhkan public key atau key ID")
+        if public_key_pem is not None:
+            key_id = key_id or f20221310104_public_key_id(public_key_pem)
+            algorithm = algorithm or f20221310104_public_key_algorithm(public_key_pem)
+        entry = EnvelopeSignature(
+            signature, algorithm or DEFAULT_ALGORITHM, key_id.lower(), public_key_pem
+        )
+
+        with self._lock:
+            if any(existing.key_id == entry.key_id for existing in self._signatures):
+                raise ValueError(f"Signer dengan key ID {entry.key_id} sudah ada di envelope")
+            self._signatures.append(entry)
+        return entry
+
+    def sign(
+        self, private_key: SigningKey, public_key_pem: Optional[str] = None
+    ) -> EnvelopeSignature:
+        """
+        Tanda tangani digest bersama dengan satu private key
+
+        Public key signer didaftarkan ke key registry bersama sehingga
+        payload yang hanya membawa key ID tetap bisa diverifikasi.
+
+        Args:
+            private_key: Private key signer (RSA atau ECC)
+            public_key_pem: Public key PEM signer jika sudah diketahui
+
+        Returns:
+            EnvelopeSignature yang ditambahkan
+        """
+        signature = f20221310104_sign_hash(self._hash, private_key)
+        public_key_pem = public_key_pem or f20221310104_export_public_key(private_key.public_key())
+        f20221310104_get_key_registry().register(public_key_pem)
+        algorithm = f20221310104_key_algorithm(private_key)
+        return self.add(signature, public_key_pem, algorithm=algorithm)
+
+    def _check(
+        self,
+        index: int,
+        entry: EnvelopeSignature,
+        registry: Optional[KeyRegistry],
+        cache: Optional["VerificationCache"]
+    ) -> Tuple[VerificationResult, bool]:
+        """
+        Verifikasi satu signer
+
+        Returns:
+            Tuple (hasil, final) dimana final False berarti hasil tidak
+            disimpan (key ID belum terdaftar, bisa berubah nanti)
+        """
+        try:
+            public_key_pem = entry.public_key_pem or (
+                registry or f20221310104_get_key_registry()
+            ).resolve(entry.key_id)
+        except KeyNotFoundError as e:
+            return VerificationResult(index, False, str(e)), False
+
+        cache_key = None
+        if cache is not None:
+            try:
+                signature_bytes = f20221310104_decode_base64(entry.signature)
+                signature_digest = hashlib.sha256(signature_bytes).digest()
+            except ValueError as e:
+                return VerificationResult(index, False, str(e)), True
+            cache_key = (
+                f20221310104_public_key_fingerprint(public_key_pem),
+                self.digest,
+                signature_digest,
+                entry.algorithm
+            )
+            valid = cache.get(cache_key)
+            if valid is not None:
+                error = None if valid else "Signature tidak valid"
+                return VerificationResult(index, valid, error), True
+
+        try:
+            public_key = f20221310104_import_public_key_cached(public_key_pem)
+            f20221310104_check_hash(self._hash.copy(), entry.signature, public_key, entry.algorithm)
+            result = VerificationResult(index, True)
+        except (ValueError, IndexError, TypeError) as e:
+            result = VerificationResult(index, False, str(e) or "Signature tidak valid")
+        if cache_key is not None:
+            cache.put(cache_key, result.valid)
+        return result, True
+
+    @f20221310104_traced("envelope.verify")
+    def verify(
+        self,
+        registry: Optional[KeyRegistry] = None,
+        executor: Optional[Executor] = None,
+        cache: Optional["VerificationCache"] = None
+    ) -> List[VerificationResult]:
+        """
+        Verifikasi semua signer secara incremental
+
+        Signer yang sudah pernah diverifikasi tidak diperiksa ulang. Hasil
+        gagal karena key ID belum terdaftar tidak disimpan sehingga
+        diperiksa lagi setelah key didaftarkan.
+
+        Args:
+            registry: Key registry untuk signer tanpa public key (default:
+                registry bersama)
+            executor: Executor opsional (misalnya ThreadPoolExecutor) untuk
+                memeriksa signer secara paralel
+            cache: VerificationCache opsional agar signer yang sama pada
+                envelope lain (misalnya setelah countersign) tidak
+                diverifikasi ulang
+
+        Returns:
+            List VerificationResult, satu per signer sesuai urutan
+        """
+        with self._lock:
+            entries = list(enumerate(self._signatures))
+            pending = [(index, entry) for index, entry in entries if index not in self._results]
+
+        def check(item: Tuple[int, EnvelopeSignature]) -> Tuple[VerificationResult, bool]:
+            return self._check(item[0], item[1], registry, cache)
+
+        if executor is None or len(pending) < 2:
+            checked = [check(item) for item in pending]
+        else:
+            checked = list(executor.map(check, pending))
+
+        results = {}
+        with self._lock:
+            for result, final in checked:
+                results[result.index] = result
+                if final:
+                    self._results[result.index] = result
+            results.update(self._results)
+        return [results[index] for index, _ in entries]
+
+    def is_valid(self, **kwargs: Any) -> bool:
+        """
+        True jika envelope punya minimal satu signer dan semua signature valid
+
+        Args:
+            **kwargs: Diteruskan ke ``verify``
+        """
+        results = self.verify(**kwargs)
+        return bool(results) and all(result.valid for result in results)
+
+    def to_payload(self) -> Dict[str, Any]:
+        """
+        Representasi dictionary envelope
+
+        Returns:
+            Dictionary {message, signatures: [{signature, algorithm, key_id,
+            public_key?}]}
+        """
+        signatures = []
+        for entry in self._signatures:
+            item = {
+                "signature": entry.signature, "algorithm": entry.algorithm, "key_id": entry.key_id
+            }
+            if entry.public_key_pem is not None:
+                item["public_key"] = entry.public_key_pem
+            signatures.append(item)
+        return {"message": self.message, "signatures": signatures}
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "SignatureEnvelope":
+        """
+        Bangun envelope dari dictionary (hasil decode payload QRIS envelope)
+
+        Args:
+            payload: Dictionary dengan field ``message`` dan ``signatures``
+
+        Returns:
+            SignatureEnvelope
+
+        Raises:
+            ValueError: Jika struktur payload tidak valid
+        """
+        try:
+            envelope = cls(payload["message"])
+            for item in payload["signatures"]:
+                envelope.add(
+                    item["signature"],
+                    item.get("public_key"),
+                    item.get("key_id"),
+                    item.get("algorithm")
+                )
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Payload envelope tidak valid: {e}") from None
+        return envelope
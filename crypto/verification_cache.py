@@ -0,0 +1,189 @@
+"""
+Verification Cache Module
+Cache hasil verifikasi signature dengan TTL dan eviction LRU
+
+QR yang sama sering dipindai berulang kali (gerbang masuk, klik ulang
+tombol verifikasi). Hasil verifikasi disimpan dengan key
+(fingerprint public key, digest pesan, digest signature, algoritma) sehingga
+verifikasi ulang cukup lookup dictionary tanpa import key maupun operasi
+public key.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+from instrumentation import f20221310104_traced
+
+from .algorithms import SigningKey
+from .encoding import Base64DecodeError, BytesLike, f20221310104_decode_base64
+from .rsa_utils import f20221310104_import_public_key_cached, f20221310104_public_key_fingerprint
+from .signature import f20221310104_hash_message, f20221310104_verify_hash
+
+
+# Key cache: (fingerprint key, digest pesan, digest signature, algoritma)
+CacheKey = Tuple[str, bytes, bytes, Optional[str]]
+
+
+class VerificationCache:
+    """
+    Cache hasil verifikasi (valid/tidak valid) dengan TTL dan LRU
+
+    Hasil tidak valid juga disimpan sehingga pemindaian ulang QR palsu
+    tidak mengulang operasi public key.
+    """
+
+    def __init__(self, max_size: int = 4096, ttl: float = 300.0):
+        """
+        Args:
+            max_size: Jumlah maksimum hasil yang disimpan
+            ttl: Umur maksimum satu hasil dalam detik
+        """
+        if max_size < 1:
+            raise ValueError("max_size harus >= 1")
+        if ttl <= 0:
+            raise ValueError("ttl harus > 0")
+
+        self._max_size = max_size
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Tuple[bool, float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: CacheKey) -> Optional[bool]:
+        """
+        Ambil hasil verifikasi yang masih berlaku
+
+        Args:
+            key: Key cache
+
+        Returns:
+            Hasil verifikasi atau None jika tidak ada/kedaluwarsa
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                valid, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return valid
+                del self._entries[key]
+                self._expirations += 1
+            self._misses += 1
+            return None
+
+    def put(self, key: CacheKey, valid: bool) -> None:
+        """
+        Simpan hasil verifikasi
+
+        Args:
+            key: Key cache
+            valid: Hasil verifikasi
+        """
+        with self._lock:
+            self._entries[key] = (valid, time.monotonic() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Kosongkan cache dan reset counter"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Statistik cache
+
+        Returns:
+            Dictionary {size, max_size, ttl, hits, misses, evictions,
+            expirations, hit_rate}
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "ttl": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+_f20221310104_verification_cache = VerificationCache()
+
+
+def f20221310104_get_verification_cache() -> VerificationCache:
+    """
+    Dapatkan instance VerificationCache bersama (satu per proses)
+
+    Returns:
+        VerificationCache bersama
+    """
+    return _f20221310104_verification_cache
+
+
+@f20221310104_traced()
+def f20221310104_verify_signature_cached(
+    message: str,
+    signature: BytesLike,
+    public_key: Union[str, SigningKey],
+    algorithm: Optional[str] = None,
+    cache: Optional[VerificationCache] = None
+) -> bool:
+    """
+    Verifikasi signature melalui cache hasil verifikasi
+
+    Signature dinormalisasi sebelum di-digest sehingga variasi whitespace,
+    padding, atau alfabet urlsafe dari signature yang sama berbagi satu
+    entri cache. Pada cache miss, hash pesan yang sudah dihitung dipakai
+    ulang untuk verifikasi.
+
+    Args:
+        message: Pesan asli
+        signature: Digital signature base64
+        public_key: Public key PEM (disarankan: import dilewati saat cache
+            hit) atau key object
+        algorithm: Algoritma yang tercatat di payload (opsional)
+        cache: VerificationCache (default: cache bersama)
+
+    Returns:
+        True jika signature valid, False jika tidak
+    """
+    cache = cache or _f20221310104_verification_cache
+    try:
+        signature_bytes = f20221310104_decode_base64(signature)
+    except Base64DecodeError:
+        return False
+
+    if isinstance(public_key, str):
+        fingerprint = f20221310104_public_key_fingerprint(public_key)
+    else:
+        fingerprint = hashlib.sha256(public_key.public_key().export_key(format='DER')).hexdigest()
+
+    message_hash = f20221310104_hash_message(message)
+    key = (fingerprint, message_hash.digest(), hashlib.sha256(signature_bytes).digest(), algorithm)
+    valid = cache.get(key)
+    if valid is not None:
+        return valid
+
+    if isinstance(public_key, str):
+        try:
+            public_key = f20221310104_import_public_key_cached(public_key)
+        except (ValueError, IndexError, TypeError):
+            return False
+    valid = f20221310104_verify_hash(message_hash, signature, public_key, algorithm)
+    cache.put(key, valid)
+    return valid
@@ -0,0 +1,275 @@
+"""
+Instrumentation Module
+Timing/tracing ringan untuk jalur panas modul crypto dan qris
+
+Tracing nonaktif secara default. Saat nonaktif, decorator hanya menambah
+satu pengecekan flag per pemanggilan dan f20221310104_stage mengembalikan
+context manager kosong bersama (tanpa alokasi, tanpa membaca clock).
+
+Contoh:
+    from instrumentation import f20221310104_enable_tracing, f20221310104_get_stage_stats
+
+    f20221310104_enable_tracing()
+    ...  # sign / verify / render QRIS
+    print(f20221310104_get_stage_stats())
+
+Beberapa pemakai dalam satu proses (misalnya sesi Streamlit) memakai
+f20221310104_tracing_scope: tracing hanya aktif di dalam blok scope dan
+durasi dicatat ke histogram milik scope, sehingga statistik tiap pemakai
+tidak tercampur dan tidak ada state global yang bisa tertinggal aktif.
+"""
+
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+# Prefix nama fungsi publik yang dibuang dari nama stage
+_FUNCTION_PREFIX = "f20221310104_"
+
+# Bucket histogram: batas atas 2^k mikrodetik (1 us sampai ~1 jam)
+_BUCKET_COUNT = 32
+
+_enabled = False
+_lock = threading.Lock()
+_histograms: Dict[str, "StageHistogram"] = {}
+_scope: ContextVar[Optional[Dict[str, "StageHistogram"]]] = ContextVar("tracing_scope", default=None)
+_NULL_STAGE = nullcontext()
+
+
+class StageHistogram:
+    """
+    Histogram durasi satu stage dengan bucket logaritmik (basis 2, mikrodetik)
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+        self.buckets = [0] * _BUCKET_COUNT
+
+    def record(self, seconds: float) -> None:
+        """Catat satu durasi dalam detik"""
+        self.count += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+        micros = int(seconds * 1_000_000)
+        self.buckets[min(micros.bit_length(), _BUCKET_COUNT - 1)] += 1
+
+    def percentile(self, percent: float) -> float:
+        """
+        Perkiraan percentile dari bucket (batas atas bucket, dalam detik)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min((1 << index) / 1_000_000, self.maximum)
+        return self.maximum
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Ringkasan histogram
+
+        Returns:
+            Dictionary {count, total_ms, mean_ms, min_ms, p50_ms, p95_ms, p99_ms, max_ms}
+        """
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "min_ms": self.minimum * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.maximum * 1000,
+        }
+
+
+class _Stage:
+    """Context manager yang mengukur satu eksekusi stage"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_Stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        f20221310104_record_stage(self.name, time.perf_counter() - self.start)
+
+
+def f20221310104_enable_tracing(enabled: bool = True) -> None:
+    """
+    Aktifkan atau nonaktifkan tracing global (histogram bersama)
+
+    Scope dari f20221310104_tracing_scope tidak terpengaruh.
+
+    Args:
+        enabled: True untuk mengaktifkan
+    """
+    global _enabled
+    _enabled = enabled
+
+
+@contextmanager
+def f20221310104_tracing_scope(histograms: Dict[str, "StageHistogram"]) -> Iterator[Dict[str, "StageHistogram"]]:
+    """
+    Aktifkan tracing di dalam blok dan catat stage ke ``histograms``
+
+    Scope berlaku per thread/context, sehingga sesi lain yang berjalan
+    bersamaan tidak ikut tercatat; setelah blok selesai (termasuk karena
+    exception) tracing kembali nonaktif untuk context ini.
+
+    Args:
+        histograms: Dictionary histogram milik pemanggil (diisi di tempat)
+
+    Returns:
+        Context manager yang mengembalikan ``histograms``
+    """
+    token = _scope.set(histograms)
+    try:
+        yield histograms
+    finally:
+        _scope.reset(token)
+
+
+def f20221310104_tracing_enabled() -> bool:
+    """
+    Returns:
+        True jika tracing aktif (global atau di dalam scope)
+    """
+    return _enabled or _scope.get() is not None
+
+
+def f20221310104_record_stage(name: str, seconds: float) -> None:
+    """
+    Catat durasi stage secara manual
+
+    Di dalam f20221310104_tracing_scope durasi masuk ke histogram scope;
+    di luar scope hanya dicatat jika tracing global aktif.
+
+    Args:
+        name: Nama stage
+        seconds: Durasi dalam detik
+    """
+    histograms = _scope.get()
+    if histograms is None:
+        if not _enabled:
+            return
+        histograms = _histograms
+    with _lock:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = StageHistogram()
+        histogram.record(seconds)
+
+
+def f20221310104_stage(name: str):
+    """
+    Context manager untuk mengukur satu stage
+
+    Args:
+        name: Nama stage (misalnya "rsa.private_op")
+
+    Returns:
+        Context manager; context kosong bersama jika tracing nonaktif
+    """
+    if not _enabled and _scope.get() is None:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def f20221310104_traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorator untuk mengukur durasi pemanggilan fungsi
+
+    Nama default diambil dari modul dan nama fungsi tanpa prefix, misalnya
+    ``signature.sign_message``.
+
+    Args:
+        name: Nama stage (opsional)
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: F) -> F:
+        stage_name = name
+        if stage_name is None:
+            function_name = func.__name__
+            if function_name.startswith(_FUNCTION_PREFIX):
+                function_name = function_name[len(_FUNCTION_PREFIX):]
+            stage_name = f"{func.__module__.rsplit('.', 1)[-1]}.{function_name}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled and _scope.get() is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                f20221310104_record_stage(stage_name, time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def f20221310104_get_stage_stats(
+    histograms: Optional[Dict[str, StageHistogram]] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    Ringkasan histogram semua stage
+
+    Args:
+        histograms: Histogram scope (default: histogram global)
+
+    Returns:
+        Dictionary {stage: ringkasan StageHistogram}
+    """
+    histograms = _histograms if histograms is None else histograms
+    with _lock:
+        return {name: histogram.summary() for name, histogram in sorted(histograms.items())}
+
+
+def f20221310104_stage_rows(histograms: Optional[Dict[str, StageHistogram]] = None) -> List[Dict[str, Any]]:
+    """
+    Ringkasan stage dalam bentuk baris tabel (diurutkan dari total terbesar)
+
+    Args:
+        histograms: Histogram scope (default: histogram global)
+
+    Returns:
+        List dictionary dengan kolom stage, count, total_ms, mean_ms, p50_ms,
+        p95_ms, p99_ms, max_ms
+    """
+    rows = [
+        {"stage": name, **{key: value for key, value in summary.items() if key != "min_ms"}}
+        for name, summary in f20221310104_get_stage_stats(histograms).items()
+    ]
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
+
+
+def f20221310104_reset_tracing(histograms: Optional[Dict[str, StageHistogram]] = None) -> None:
+    """Hapus semua histogram yang sudah terkumpul (default: histogram global)"""
+    with _lock:
+        (_histograms if histograms is None else histograms).clear()
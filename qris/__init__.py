@@ -1,11 +1,97 @@
-from .qr_generator import (
-    f20221310104_generate_qris,
-    f20221310104_create_signature_qris,
-    f20221310104_decode_qris_data
-)
-
-__all__ = [
-    'f20221310104_generate_qris',
-    'f20221310104_create_signature_qris',
-    'f20221310104_decode_qris_data'
-]
+"""
+Package qris: generate, render, kebijakan versi/ECC, baca, dan batch QRIS
+
+Submodul (qrcode, Pillow, zxing-cpp) baru di-import saat atribut pertama
+kali diakses, sehingga ``import qris`` tetap ringan.
+"""
+
+import importlib
+from typing import Any, List
+
+
+# Submodul -> nama yang di-export (di-import lazy lewat __getattr__)
+_SUBMODULE_EXPORTS = {
+    "qr_generator": (
+        'f20221310104_generate_qris',
+        'f20221310104_create_signature_qris',
+        'f20221310104_decode_qris_data',
+        'f20221310104_encode_qris_payload',
+        'f20221310104_encode_compact_payload',
+        'f20221310104_decode_compact_payload',
+        'f20221310104_create_signature_qris_artifact',
+        'f20221310104_create_signature_qris_artifacts',
+        'f20221310104_split_payload',
+        'f20221310104_join_payload_parts',
+        'f20221310104_render_qris_parts',
+        'f20221310104_encode_envelope_payload',
+        'f20221310104_decode_envelope_payload',
+        'f20221310104_create_envelope_qris_artifact',
+        'f20221310104_qris_to_bytes',
+        'f20221310104_build_qr_matrix',
+        'f20221310104_render_qr_image',
+        'f20221310104_render_qr_png',
+        'f20221310104_render_qr_svg',
+        'f20221310104_render_qris_cached',
+        'f20221310104_get_render_cache',
+        'f20221310104_max_payload_length',
+        'PAYLOAD_FORMAT_JSON',
+        'PAYLOAD_FORMAT_JSON_KEY_ID',
+        'PAYLOAD_FORMAT_COMPACT',
+        'PAYLOAD_FORMAT_ENVELOPE',
+        'MULTIPART_PREFIX',
+        'MAX_PAYLOAD_PARTS',
+        'DEFAULT_PART_LENGTH',
+        'QR_MAX_ALPHANUMERIC_H',
+        'QR_MAX_BYTES_H',
+        'MAX_DECOMPRESSED_BYTES',
+        'QrisArtifact',
+        'QrMatrix',
+        'QrRenderCache',
+    ),
+    "qr_policy": (
+        'f20221310104_fixed_ecc_policy',
+        'f20221310104_smallest_version_policy',
+        'f20221310104_max_ecc_policy',
+        'f20221310104_select_qr_layout',
+        'f20221310104_qr_capacity',
+        'f20221310104_policy_capacity',
+        'f20221310104_error_correction_level',
+        'DEFAULT_QR_POLICY',
+        'ERROR_CORRECTION_NAMES',
+        'QrPolicy',
+        'QrLayout',
+        'QrCapacityError',
+    ),
+    "qr_reader": (
+        'f20221310104_read_qris_image',
+        'f20221310104_read_qris_images',
+        'f20221310104_preprocess_image',
+        'f20221310104_binarize_image',
+        'QrisReadResult',
+    ),
+    "batch": (
+        'f20221310104_generate_qris_batch',
+        'f20221310104_read_batch_rows',
+    ),
+}
+
+_LAZY_ATTRIBUTES = {
+    name: module for module, names in _SUBMODULE_EXPORTS.items() for name in names
+}
+
+__all__ = [name for names in _SUBMODULE_EXPORTS.values() for name in names]
+
+
+def __getattr__(name: str) -> Any:
+    """Import submodul saat atribut export pertama kali diakses (PEP 562)"""
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Simpan di namespace package agar akses berikutnya tidak lewat __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,273 @@
+"""
+QRIS Batch Module
+Pipeline batch untuk menandatangani dan membuat QRIS dalam jumlah besar
+
+Baris input (CSV/JSONL) dibaca secara streaming, signing dan render QR
+dijalankan di process pool, dan PNG ditulis ke ZIP atau direktori beserta
+manifest JSONL. Jumlah tugas yang sedang berjalan dibatasi (backpressure)
+sehingga memori tetap terbatas berapapun jumlah baris input.
+
+Jalankan:
+    python -m qris.batch --input pesan.csv --key private.pem --output hasil.zip
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+from crypto.rsa_utils import f20221310104_export_public_key, f20221310104_import_private_key
+from crypto.signature import Signer
+
+from .qr_generator import PAYLOAD_FORMAT_COMPACT, f20221310104_create_signature_qris_artifact
+
+
+MANIFEST_NAME = "manifest.jsonl"
+
+# State per worker process (diisi oleh initializer)
+_f20221310104_worker_signer: Optional[Signer] = None
+_f20221310104_worker_public_key_pem: Optional[str] = None
+_f20221310104_worker_payload_format: str = PAYLOAD_FORMAT_COMPACT
+
+
+def f20221310104_read_batch_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Baca baris input secara streaming dari file CSV atau JSONL
+
+    CSV harus memiliki kolom ``message`` (kolom ``id`` opsional); JSONL
+    berisi satu object per baris dengan field yang sama.
+
+    Args:
+        path: Path file input (.csv atau .jsonl/.ndjson)
+
+    Returns:
+        Iterator dictionary {"id", "message"}
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline='', encoding='utf-8') as f:
+        if extension == '.csv':
+            reader = csv.DictReader(f)
+            if reader.fieldnames is None or 'message' not in reader.fieldnames:
+                raise ValueError("File CSV harus memiliki kolom 'message'")
+            for row in reader:
+                yield {"id": row.get("id"), "message": row["message"]}
+        elif extension in ('.jsonl', '.ndjson'):
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if not isinstance(row, dict) or not isinstance(row.get("message"), str):
+                    raise ValueError(f"Baris {line_number}: field 'message' tidak ada")
+                yield {"id": row.get("id"), "message": row["message"]}
+        else:
+            raise ValueError(f"Format input tidak didukung: {extension}")
+
+
+class DirectorySink:
+    """Tujuan output berupa direktori: PNG + manifest.jsonl"""
+
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._manifest = open(os.path.join(path, MANIFEST_NAME), 'w', encoding='utf-8')
+
+    def write(self, name: str, data: bytes, manifest_entry: Dict[str, Any]) -> None:
+        """Tulis satu PNG dan satu baris manifest"""
+        with open(os.path.join(self.path, name), 'wb') as f:
+            f.write(data)
+        self._manifest.write(json.dumps(manifest_entry, ensure_ascii=False) + "\n")
+
+    def write_error(self, manifest_entry: Dict[str, Any]) -> None:
+        """Catat baris yang gagal di manifest"""
+        self._manifest.write(json.dumps(manifest_entry, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        """Tutup manifest"""
+        self._manifest.close()
+
+
+class ZipSink:
+    """
+    Tujuan output berupa file ZIP yang ditulis secara streaming
+
+    PNG sudah terkompresi sehingga disimpan tanpa kompresi ulang
+    (ZIP_STORED). Manifest ditulis ke file sementara lalu dimasukkan ke
+    ZIP saat ditutup agar tidak perlu disimpan di memori.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED)
+        self._manifest = tempfile.TemporaryFile('w+', encoding='utf-8')
+
+    def write(self, name: str, data: bytes, manifest_entry: Dict[str, Any]) -> None:
+        """Tulis satu PNG ke ZIP dan satu baris manifest"""
+        self._zip.writestr(name, data)
+        self._manifest.write(json.dumps(manifest_entry, ensure_ascii=False) + "\n")
+
+    def write_error(self, manifest_entry: Dict[str, Any]) -> None:
+        """Catat baris yang gagal di manifest"""
+        self._manifest.write(json.dumps(manifest_entry, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        """Masukkan manifest ke ZIP lalu tutup"""
+        self._manifest.seek(0)
+        with self._zip.open(MANIFEST_NAME, 'w') as entry:
+            for line in self._manifest:
+                entry.write(line.encode('utf-8'))
+        self._manifest.close()
+        self._zip.close()
+
+
+def _f20221310104_init_worker(private_key_pem: str, payload_format: str) -> None:
+    """Initializer worker: import private key dan siapkan Signer sekali per proses"""
+    global _f20221310104_worker_signer, _f20221310104_worker_public_key_pem, _f20221310104_worker_payload_format
+    private_key = f20221310104_import_private_key(private_key_pem)
+    _f20221310104_worker_signer = Signer(private_key)
+    _f20221310104_worker_public_key_pem = f20221310104_export_public_key(_f20221310104_worker_signer.public_key)
+    _f20221310104_worker_payload_format = payload_format
+
+
+def _f20221310104_process_row(index: int, row_id: Optional[str], message: str) -> Dict[str, Any]:
+    """Sign dan render satu baris di worker process"""
+    signature = _f20221310104_worker_signer.sign(message)
+    artifact = f20221310104_create_signature_qris_artifact(
+        message,
+        signature,
+        _f20221310104_worker_public_key_pem,
+        _f20221310104_worker_payload_format
+    )
+    return {
+        "index": index,
+        "id": row_id,
+        "signature": signature,
+        "message_sha256": hashlib.sha256(message.encode('utf-8')).hexdigest(),
+        "payload_length": artifact.payload_length,
+        "png_bytes": artifact.png_bytes,
+    }
+
+
+def _f20221310104_file_name(index: int, row_id: Optional[str]) -> str:
+    """Nama file PNG yang aman untuk filesystem dan ZIP"""
+    if row_id:
+        safe_id = re.sub(r'[^A-Za-z0-9_.-]+', '_', str(row_id))[:64]
+        return f"{index:06d}_{safe_id}.png"
+    return f"{index:06d}.png"
+
+
+def f20221310104_generate_qris_batch(
+    rows: Iterable[Dict[str, Any]],
+    private_key_pem: str,
+    output: str,
+    payload_format: str = PAYLOAD_FORMAT_COMPACT,
+    max_workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Sign dan render banyak QRIS ke ZIP atau direktori
+
+    Args:
+        rows: Iterable dictionary {"id", "message"} (misalnya dari
+            f20221310104_read_batch_rows)
+        private_key_pem: Private key signer dalam format PEM
+        output: Path output; berakhiran ``.zip`` untuk ZIP, selain itu direktori
+        payload_format: Format payload QRIS
+        max_workers: Jumlah worker process (default: jumlah CPU)
+        max_in_flight: Batas tugas yang belum ditulis (default: 4 x worker)
+
+    Returns:
+        Ringkasan: total, failed, elapsed_seconds, per_second, output
+    """
+    workers = max_workers or os.cpu_count() or 1
+    limit = max_in_flight or workers * 4
+    sink = ZipSink(output) if output.lower().endswith('.zip') else DirectorySink(output)
+
+    total = 0
+    failed = 0
+    start = time.perf_counter()
+    pending: Set[Future] = set()
+    future_rows: Dict[Future, Any] = {}
+
+    def drain(return_when: str) -> None:
+        nonlocal total, failed
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            pending.discard(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                index, row_id = future_rows.pop(future)
+                sink.write_error({"index": index, "id": row_id, "error": str(e)})
+                continue
+            future_rows.pop(future, None)
+            png_bytes = result.pop("png_bytes")
+            result["file"] = _f20221310104_file_name(result["index"], result["id"])
+            sink.write(result["file"], png_bytes, result)
+            total += 1
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_f20221310104_init_worker,
+            initargs=(private_key_pem, payload_format)
+        ) as executor:
+            for index, row in enumerate(rows):
+                # Backpressure: tunggu sampai ada slot sebelum membaca baris berikutnya
+                while len(pending) >= limit:
+                    drain(FIRST_COMPLETED)
+                future = executor.submit(_f20221310104_process_row, index, row.get("id"), row["message"])
+                future_rows[future] = (index, row.get("id"))
+                pending.add(future)
+            while pending:
+                drain(FIRST_COMPLETED)
+    finally:
+        sink.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "total": total,
+        "failed": failed,
+        "elapsed_seconds": elapsed,
+        "per_second": total / elapsed if elapsed else 0.0,
+        "output": output,
+    }
+
+
+def f20221310104_main(argv=None) -> None:
+    """Entry point command line"""
+    parser = argparse.ArgumentParser(prog="python -m qris.batch", description="Batch QRIS digital signature")
+    parser.add_argument("--input", required=True, help="File CSV (kolom message[, id]) atau JSONL")
+    parser.add_argument("--key", required=True, help="File private key PEM")
+    parser.add_argument("--output", required=True, help="File .zip atau direktori output")
+    parser.add_argument("--format", default=PAYLOAD_FORMAT_COMPACT, help="Format payload QRIS (1.0 / 2.0)")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah worker process")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Batas tugas yang sedang berjalan")
+    args = parser.parse_args(argv)
+
+    with open(args.key, encoding='utf-8') as f:
+        private_key_pem = f.read()
+
+    summary = f20221310104_generate_qris_batch(
+        f20221310104_read_batch_rows(args.input),
+        private_key_pem,
+        args.output,
+        payload_format=args.format,
+        max_workers=args.workers,
+        max_in_flight=args.max_in_flight
+    )
+    print(
+        f"{summary['total']} QRIS dibuat ({summary['failed']} gagal) dalam "
+        f"{summary['elapsed_seconds']:.1f} detik ({summary['per_second']:.1f}/detik) -> {summary['output']}"
+    )
+
+
+if __name__ == "__main__":
+    f20221310104_main()
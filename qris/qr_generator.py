@@ -5,14 +5,147 @@ Modul untuk menghasilkan dan membaca QRIS yang berisi digital signature
 
 import qrcode
 from qrcode.constants import ERROR_CORRECT_H
-from PIL import Image
+from qrcode.util import MODE_8BIT_BYTE, MODE_ALPHA_NUM
+from PIL import Image, ImageColor
 import json
 import base64
+import binascii
+import hashlib
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Executor
+from functools import reduce
 from io import BytesIO
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple, Union
 
+from crypto.algorithms import ALGORITHM_RSA, f20221310104_public_key_algorithm
+from crypto.encoding import f20221310104_decode_base64
+from crypto.key_registry import KEY_ID_LENGTH, f20221310104_public_key_id
+from crypto.rsa_utils import f20221310104_public_key_der
+from crypto.signature import SignatureEnvelope
+from instrumentation import f20221310104_stage, f20221310104_traced
 
-def f20221310104_generate_qris(data: str, box_size: int = 10, border: int = 4) -> Image.Image:
+from .qr_policy import (
+    ERROR_CORRECTION_NAMES,
+    POLICY_FIXED,
+    QrPolicy,
+    f20221310104_fixed_ecc_policy,
+    f20221310104_policy_capacity,
+    f20221310104_segment_qr_data,
+    f20221310104_select_qr_layout,
+)
+
+
+# Versi format payload QRIS
+PAYLOAD_FORMAT_JSON = "1.0"      # JSON + base64 (format awal)
+PAYLOAD_FORMAT_JSON_KEY_ID = "1.1"  # Format 1.0 dengan key_id pengganti public_key
+PAYLOAD_FORMAT_COMPACT = "2.0"   # Binary TLV + base45 (QR alphanumeric mode)
+PAYLOAD_FORMAT_ENVELOPE = "3.0"  # Compact multi-signer (satu pesan, banyak signature)
+
+# Prefix payload compact; semua karakter termasuk alfabet QR alphanumeric
+COMPACT_PREFIX = "DS2:"
+ENVELOPE_PREFIX = "DS3:"
+
+# Header bagian multi-QR: "DSM:" + index (1 hex) + total - 1 (1 hex) + parity (2 hex) + ":"
+MULTIPART_PREFIX = "DSM:"
+_MULTIPART_HEADER_LENGTH = len(MULTIPART_PREFIX) + 5
+
+# Jumlah bagian maksimum (4 bit, sama dengan Structured Append)
+MAX_PAYLOAD_PARTS = 16
+
+# Tag TLV pada payload compact
+_TAG_MESSAGE = 0x01
+_TAG_SIGNATURE = 0x02
+_TAG_PUBLIC_KEY_DER = 0x03
+_TAG_KEY_FINGERPRINT = 0x04
+_TAG_ALGORITHM = 0x05  # Nama algoritma ASCII; tidak ditulis untuk RS256
+_TAG_SIGNER = 0x06     # Envelope: TLV bersarang (signature, key DER/fingerprint, algoritma)
+
+_COMPACT_VERSION = 0x02
+_ENVELOPE_VERSION = 0x03
+_FLAG_ZLIB = 0x01
+
+# Batas ukuran body compact setelah dekompresi zlib (melindungi decoder dari
+# zip bomb; jauh di atas kapasitas 16 QR untuk pesan yang wajar)
+MAX_DECOMPRESSED_BYTES = 1024 * 1024
+
+# Panjang fingerprint key (bytes) pada mode tanpa public key: key ID registry
+KEY_FINGERPRINT_BYTES = KEY_ID_LENGTH // 2
+
+# Kapasitas QR versi 40 dengan ERROR_CORRECT_H: mode alphanumeric (karakter)
+# untuk payload compact dan mode byte untuk payload JSON base64; kebijakan
+# lain memakai f20221310104_max_payload_length
+QR_MAX_ALPHANUMERIC_H = 1852
+QR_MAX_BYTES_H = 1273
+
+# Panjang maksimum satu bagian multi-QR: kapasitas versi 20 dengan
+# ERROR_CORRECT_H (alphanumeric), cepat dirender dan mudah dipindai
+DEFAULT_PART_LENGTH = 557
+
+# Level kompresi PNG default (0 = tanpa kompresi, 9 = paling kecil)
+DEFAULT_PNG_COMPRESS_LEVEL = 6
+
+# Warna QR (brand) untuk renderer palette dan SVG
+QR_FILL_COLOR = "#1a1a2e"
+QR_BACK_COLOR = "white"
+
+# Header file tier disk QrRenderCache: size, version, ecc, border, panjang PNG
+# (size/border 32-bit agar border besar tetap bisa disimpan)
+_DISK_HEADER = struct.Struct('>IBBII')
+
+# Parameter render di key cache: ecc, box size, border, level kompresi
+# (signed 64-bit sehingga compress_level=-1 dan border > 255 tetap valid)
+_KEY_PARAMS = struct.Struct('>qqqq')
+
+# Alfabet base45 (RFC 9285) = alfabet QR alphanumeric mode
+_BASE45_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+_BASE45_INDEX = {char: index for index, char in enumerate(_BASE45_ALPHABET)}
+
+
+class QrisArtifact(NamedTuple):
+    """
+    QRIS yang sudah dienkode menjadi PNG beserta metadata
+
+    Disimpan sekali setelah signing lalu dipakai ulang untuk tampilan dan
+    download tanpa encode PNG ulang di setiap rerun.
+    """
+    png_bytes: bytes
+    width: int
+    height: int
+    payload_format: str
+    payload_length: int
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL
+    part_index: int = 0
+    part_total: int = 1
+    qr_version: int = 0
+    error_correction: str = "H"
+
+
+class QrMatrix(NamedTuple):
+    """
+    Matriks module QR yang sudah final (setelah pemilihan versi dan mask)
+
+    ``modules`` berisi ``size * size`` byte (baris demi baris, termasuk
+    border) dengan nilai 1 untuk module gelap dan 0 untuk terang, sehingga
+    bisa langsung dipakai sebagai data gambar palette.
+    """
+    size: int
+    modules: bytes
+    version: int
+    error_correction: int
+    border: int
+
+
+@f20221310104_traced()
+def f20221310104_generate_qris(
+    data: str,
+    box_size: int = 10,
+    border: int = 4,
+    policy: Optional[QrPolicy] = None
+) -> Image.Image:
     """
     Generate QRIS image dari data string
     
@@ -20,78 +153,888 @@ def f20221310104_generate_qris(data: str, box_size: int = 10, border: int = 4) -
         data: Data yang akan dienkode ke dalam QR code
         box_size: Ukuran setiap box dalam QR code
         border: Ukuran border QR code
+        policy: Kebijakan versi/error correction (default: level H tetap)
     
     Returns:
         PIL Image object dari QR code
     """
+    qr = _f20221310104_policy_qr(data, policy, border, box_size)
+    with f20221310104_stage("qr.mask_select"):
+        qr.make(fit=False)
+    
+    # Buat QR code dengan warna custom
+    with f20221310104_stage("qr.rasterize_rgb"):
+        img = qr.make_image(fill_color=QR_FILL_COLOR, back_color=QR_BACK_COLOR)
+        return img.convert('RGB')
+
+
+def _f20221310104_policy_qr(
+    data: str,
+    policy: Optional[QrPolicy],
+    border: int,
+    box_size: int = 10
+) -> qrcode.QRCode:
+    """QRCode berisi data dengan versi dan level dari tabel kapasitas (tanpa best_fit)"""
+    with f20221310104_stage("qr.version_fit"):
+        segments = f20221310104_segment_qr_data(data)
+        layout = f20221310104_select_qr_layout(segments, policy)
     qr = qrcode.QRCode(
-        version=None,  # Auto-size
-        error_correction=ERROR_CORRECT_H,  # High error correction
+        version=layout.version,
+        error_correction=layout.error_correction,
         box_size=box_size,
         border=border,
     )
-    qr.add_data(data)
-    qr.make(fit=True)
-    
-    # Buat QR code dengan warna custom
-    img = qr.make_image(fill_color="#1a1a2e", back_color="white")
-    return img.convert('RGB')
+    for segment in segments:
+        qr.add_data(segment)
+    return qr
 
 
-def f20221310104_create_signature_qris(
-    message: str, 
-    signature: str, 
-    public_key_pem: str
+@f20221310104_traced()
+def f20221310104_build_qr_matrix(
+    data: str,
+    error_correction: int = ERROR_CORRECT_H,
+    border: int = 4,
+    policy: Optional[QrPolicy] = None
+) -> QrMatrix:
+    """
+    Bangun matriks module QR dari data string
+
+    Versi dan level dipilih dari tabel kapasitas (lihat qris.qr_policy)
+    sehingga QRCode hanya dibangun sekali.
+
+    Args:
+        data: Data yang akan dienkode ke dalam QR code
+        error_correction: Level error correction (konstanta qrcode) untuk
+            kebijakan level tetap jika ``policy`` tidak diberikan
+        border: Ukuran border QR code (dalam module)
+        policy: Kebijakan versi/error correction (opsional)
+
+    Returns:
+        QrMatrix berisi module QR termasuk border
+
+    Raises:
+        QrCapacityError: Jika data tidak muat dengan batasan kebijakan
+    """
+    qr = _f20221310104_policy_qr(data, policy or f20221310104_fixed_ecc_policy(error_correction), border)
+    with f20221310104_stage("qr.mask_select"):
+        qr.make(fit=False)
+
+    rows = qr.get_matrix()
+    modules = b''.join(bytes(row) for row in rows)
+    return QrMatrix(len(rows), modules, qr.version, qr.error_correction, border)
+
+
+@f20221310104_traced()
+def f20221310104_render_qr_image(
+    matrix: QrMatrix,
+    box_size: int = 10,
+    fill_color: str = QR_FILL_COLOR,
+    back_color: str = QR_BACK_COLOR
 ) -> Image.Image:
     """
-    Buat QRIS yang berisi pesan, signature, dan public key
-    
+    Render QrMatrix menjadi gambar palette 2 warna
+
+    Matriks dibuat sebagai gambar 1 pixel per module lalu diperbesar dengan
+    NEAREST sehingga setiap module menjadi blok ``box_size`` pixel. Gambar
+    palette memakai 1 byte per pixel (RGB: 3 byte) dan disimpan sebagai PNG
+    1-bit, warna brand tetap terjaga lewat palette.
+
+    Args:
+        matrix: QrMatrix dari f20221310104_build_qr_matrix
+        box_size: Ukuran setiap box dalam pixel
+        fill_color: Warna module gelap
+        back_color: Warna background
+
+    Returns:
+        PIL Image mode "P" dengan palette [back_color, fill_color]
+    """
+    image = Image.frombytes('P', (matrix.size, matrix.size), matrix.modules)
+    image.putpalette(ImageColor.getrgb(back_color) + ImageColor.getrgb(fill_color))
+    if box_size != 1:
+        pixels = matrix.size * box_size
+        image = image.resize((pixels, pixels), Image.Resampling.NEAREST)
+    return image
+
+
+@f20221310104_traced()
+def f20221310104_render_qr_png(
+    matrix: QrMatrix,
+    box_size: int = 10,
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+    fill_color: str = QR_FILL_COLOR,
+    back_color: str = QR_BACK_COLOR
+) -> bytes:
+    """
+    Render QrMatrix langsung menjadi PNG palette 1-bit
+
+    Args:
+        matrix: QrMatrix dari f20221310104_build_qr_matrix
+        box_size: Ukuran setiap box dalam pixel
+        compress_level: Level kompresi zlib untuk PNG (0-9)
+        fill_color: Warna module gelap
+        back_color: Warna background
+
+    Returns:
+        PNG bytes
+    """
+    image = f20221310104_render_qr_image(matrix, box_size, fill_color, back_color)
+    buffer = BytesIO()
+    with f20221310104_stage("png.encode"):
+        image.save(buffer, format='PNG', bits=1, compress_level=compress_level)
+    return buffer.getvalue()
+
+
+@f20221310104_traced()
+def f20221310104_render_qr_svg(
+    matrix: QrMatrix,
+    box_size: int = 10,
+    fill_color: str = QR_FILL_COLOR,
+    back_color: str = QR_BACK_COLOR
+) -> str:
+    """
+    Render QrMatrix menjadi SVG (satu path, module gelap digabung per baris)
+
+    Args:
+        matrix: QrMatrix dari f20221310104_build_qr_matrix
+        box_size: Ukuran setiap box dalam pixel
+        fill_color: Warna module gelap
+        back_color: Warna background
+
+    Returns:
+        Dokumen SVG dalam bentuk string
+    """
+    size = matrix.size
+    segments = []
+    for y in range(size):
+        row = matrix.modules[y * size:(y + 1) * size]
+        x = 0
+        while x < size:
+            if row[x]:
+                start = x
+                while x < size and row[x]:
+                    x += 1
+                segments.append(f"M{start} {y}h{x - start}v1h-{x - start}z")
+            else:
+                x += 1
+
+    pixels = size * box_size
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+        f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+        f'<rect width="{size}" height="{size}" fill="{back_color}"/>'
+        f'<path fill="{fill_color}" d="{"".join(segments)}"/>'
+        '</svg>'
+    )
+
+
+class QrRenderCache:
+    """
+    Cache QR berbasis konten: matriks module + PNG hasil render
+
+    Key cache adalah SHA-256 dari payload digabung dengan level error
+    correction, box size, border, dan level kompresi PNG, sehingga payload
+    yang sama tidak pernah menjalankan ulang pemilihan versi dan mask.
+    Cache memori dibatasi total byte (LRU); tier disk opsional menyimpan
+    entri yang sama sebagai file di ``disk_dir``.
+    """
+
+    # Overhead perkiraan per entri (objek Python, key, NamedTuple)
+    _ENTRY_OVERHEAD = 256
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, disk_dir: Optional[str] = None):
+        """
+        Args:
+            max_bytes: Batas total ukuran entri di memori (byte)
+            disk_dir: Direktori tier disk; None untuk menonaktifkan
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes harus >= 1")
+
+        self._max_bytes = max_bytes
+        self._disk_dir = disk_dir
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[QrMatrix, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(
+        data: str,
+        error_correction: int,
+        box_size: int,
+        border: int,
+        compress_level: int,
+        policy: Optional[QrPolicy] = None
+    ) -> str:
+        """
+        Buat key cache dari payload dan parameter render
+
+        Kebijakan selain level tetap ``error_correction`` ikut masuk key;
+        versi dan level hasil kebijakan tersimpan di QrMatrix sehingga cache
+        hit tidak perlu menghitung ulang pilihan versi.
+
+        Returns:
+            Key dalam format hex string
+        """
+        digest = hashlib.sha256(data.encode('utf-8'))
+        digest.update(_KEY_PARAMS.pack(error_correction, box_size, border, compress_level))
+        if policy is not None and policy != (POLICY_FIXED, error_correction, None, None):
+            digest.update(repr(tuple(policy)).encode('ascii'))
+        return digest.hexdigest()
+
+    @classmethod
+    def _entry_size(cls, matrix: QrMatrix, png_bytes: bytes) -> int:
+        return len(matrix.modules) + len(png_bytes) + cls._ENTRY_OVERHEAD
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self._disk_dir, key + '.qrc')
+
+    def _read_disk(self, key: str) -> Optional[Tuple[QrMatrix, bytes]]:
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                blob = f.read()
+            size, version, error_correction, border, png_length = _DISK_HEADER.unpack_from(blob)
+            offset = _DISK_HEADER.size
+            modules = blob[offset:offset + size * size]
+            png_bytes = blob[offset + size * size:]
+            if len(modules) != size * size or len(png_bytes) != png_length:
+                return None
+        except (OSError, struct.error):
+            return None
+        return QrMatrix(size, modules, version, error_correction, border), png_bytes
+
+    def _write_disk(self, key: str, matrix: QrMatrix, png_bytes: bytes) -> None:
+        path = self._disk_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            header = _DISK_HEADER.pack(
+                matrix.size, matrix.version, matrix.error_correction, matrix.border, len(png_bytes)
+            )
+            with open(temp_path, 'wb') as f:
+                f.write(header + matrix.modules + png_bytes)
+            # Rename atomik agar pembaca lain tidak melihat file setengah jadi
+            os.replace(temp_path, path)
+        except (OSError, struct.error):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def _store(self, key: str, entry: Tuple[QrMatrix, bytes]) -> None:
+        # Dipanggil dengan self._lock sudah dipegang
+        size = self._entry_size(*entry)
+        if size > self._max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entry_size(*self._entries.pop(key))
+        self._entries[key] = entry
+        self._bytes += size
+        while self._bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= self._entry_size(*evicted)
+            self._evictions += 1
+
+    def get(self, key: str) -> Optional[Tuple[QrMatrix, bytes]]:
+        """
+        Ambil (matrix, png_bytes) dari memori, lalu dari disk
+
+        Args:
+            key: Key dari make_key
+
+        Returns:
+            Tuple (QrMatrix, PNG bytes) atau None jika tidak ada
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry
+
+        entry = self._read_disk(key) if self._disk_dir else None
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._store(key, entry)
+        return entry
+
+    def put(self, key: str, matrix: QrMatrix, png_bytes: bytes) -> None:
+        """
+        Simpan hasil render ke memori (dan disk jika aktif)
+
+        Args:
+            key: Key dari make_key
+            matrix: QrMatrix hasil build
+            png_bytes: PNG hasil render
+        """
+        with self._lock:
+            self._store(key, (matrix, png_bytes))
+        if self._disk_dir:
+            self._write_disk(key, matrix, png_bytes)
+
+    def clear(self) -> None:
+        """Kosongkan cache memori dan reset counter (file disk tidak dihapus)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._disk_hits = self._misses = self._evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Statistik cache
+
+        Returns:
+            Dictionary {entries, bytes, max_bytes, hits, disk_hits, misses,
+            evictions, hit_rate}
+        """
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": (self._hits + self._disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+_f20221310104_render_cache = QrRenderCache(disk_dir=os.environ.get("QRIS_CACHE_DIR") or None)
+
+
+def f20221310104_get_render_cache() -> QrRenderCache:
+    """
+    Dapatkan instance QrRenderCache bersama (satu per proses)
+
+    Tier disk aktif jika environment variable ``QRIS_CACHE_DIR`` diisi.
+
+    Returns:
+        QrRenderCache bersama
+    """
+    return _f20221310104_render_cache
+
+
+@f20221310104_traced()
+def f20221310104_render_qris_cached(
+    data: str,
+    error_correction: int = ERROR_CORRECT_H,
+    box_size: int = 10,
+    border: int = 4,
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+    cache: Optional[QrRenderCache] = None,
+    policy: Optional[QrPolicy] = None
+) -> Tuple[QrMatrix, bytes]:
+    """
+    Bangun matriks dan render PNG melalui cache berbasis konten
+
+    Args:
+        data: Data yang akan dienkode ke dalam QR code
+        error_correction: Level error correction (konstanta qrcode)
+        box_size: Ukuran setiap box dalam pixel
+        border: Ukuran border QR code (dalam module)
+        compress_level: Level kompresi zlib untuk PNG (0-9)
+        cache: QrRenderCache yang dipakai (default: cache bersama)
+        policy: Kebijakan versi/error correction; menggantikan
+            ``error_correction`` jika diberikan
+
+    Returns:
+        Tuple (QrMatrix, PNG bytes)
+    """
+    cache = cache or _f20221310104_render_cache
+    key = cache.make_key(data, error_correction, box_size, border, compress_level, policy)
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+
+    matrix = f20221310104_build_qr_matrix(data, error_correction, border, policy)
+    png_bytes = f20221310104_render_qr_png(matrix, box_size, compress_level)
+    cache.put(key, matrix, png_bytes)
+    return matrix, png_bytes
+
+
+def _f20221310104_base45_encode(data: bytes) -> str:
+    """Encode bytes ke base45 (RFC 9285)"""
+    chars = []
+    for i in range(0, len(data) - 1, 2):
+        value = data[i] * 256 + data[i + 1]
+        value, c = divmod(value, 45)
+        e, d = divmod(value, 45)
+        chars.append(_BASE45_ALPHABET[c] + _BASE45_ALPHABET[d] + _BASE45_ALPHABET[e])
+    if len(data) % 2:
+        d, c = divmod(data[-1], 45)
+        chars.append(_BASE45_ALPHABET[c] + _BASE45_ALPHABET[d])
+    return ''.join(chars)
+
+
+def _f20221310104_base45_decode(text: str) -> bytes:
+    """Decode string base45 (RFC 9285) ke bytes"""
+    try:
+        values = [_BASE45_INDEX[char] for char in text]
+    except KeyError as e:
+        raise ValueError(f"Karakter base45 tidak valid: {e}")
+    if len(values) % 3 == 1:
+        raise ValueError("Panjang base45 tidak valid")
+
+    output = bytearray()
+    for i in range(0, len(values), 3):
+        group = values[i:i + 3]
+        if len(group) == 3:
+            value = group[0] + group[1] * 45 + group[2] * 45 * 45
+            if value > 0xFFFF:
+                raise ValueError("Nilai base45 di luar jangkauan")
+            output += value.to_bytes(2, 'big')
+        else:
+            value = group[0] + group[1] * 45
+            if value > 0xFF:
+                raise ValueError("Nilai base45 di luar jangkauan")
+            output.append(value)
+    return bytes(output)
+
+
+def _f20221310104_der_to_pem(der: bytes, label: str = "PUBLIC KEY") -> str:
+    """Bungkus bytes DER menjadi PEM"""
+    body = base64.b64encode(der).decode('ascii')
+    lines = [body[i:i + 64] for i in range(0, len(body), 64)]
+    return f"-----BEGIN {label}-----\n" + "\n".join(lines) + f"\n-----END {label}-----"
+
+
+def _f20221310104_write_tlv(buffer: bytearray, tag: int, value: bytes) -> None:
+    """Tulis satu record TLV (panjang dalam varint LEB128)"""
+    buffer.append(tag)
+    length = len(value)
+    while True:
+        byte = length & 0x7F
+        length >>= 7
+        if length:
+            buffer.append(byte | 0x80)
+        else:
+            buffer.append(byte)
+            break
+    buffer += value
+
+
+def _f20221310104_read_tlv(data: bytes) -> List[Tuple[int, bytes]]:
+    """Baca seluruh record TLV dari body payload compact"""
+    records = []
+    pos = 0
+    while pos < len(data):
+        tag = data[pos]
+        pos += 1
+        length = 0
+        shift = 0
+        while True:
+            if pos >= len(data) or shift > 28:
+                raise ValueError("Record TLV terpotong")
+            byte = data[pos]
+            pos += 1
+            length |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        if pos + length > len(data):
+            raise ValueError("Record TLV terpotong")
+        records.append((tag, data[pos:pos + length]))
+        pos += length
+    return records
+
+
+def _f20221310104_pack_compact(prefix: str, version: int, body: bytes, compress: bool = True) -> str:
+    """Bungkus body TLV: prefix + base45(versi, flags, body opsional zlib)"""
+    flags = 0
+    # Body di atas batas decoder tidak dikompresi agar tetap bisa di-decode
+    if compress and len(body) <= MAX_DECOMPRESSED_BYTES:
+        compressed = zlib.compress(body, 9)
+        if len(compressed) < len(body):
+            body = compressed
+            flags |= _FLAG_ZLIB
+    return prefix + _f20221310104_base45_encode(bytes([version, flags]) + body)
+
+
+def _f20221310104_unpack_compact(encoded_data: str, prefix: str, version: int) -> bytes:
+    """Kebalikan _f20221310104_pack_compact: kembalikan body TLV"""
+    raw = _f20221310104_base45_decode(encoded_data.strip()[len(prefix):])
+    if len(raw) < 2 or raw[0] != version:
+        raise ValueError("Versi payload compact tidak dikenal")
+
+    body = raw[2:]
+    if raw[1] & _FLAG_ZLIB:
+        decompressor = zlib.decompressobj()
+        try:
+            body = decompressor.decompress(body, MAX_DECOMPRESSED_BYTES + 1)
+        except zlib.error as e:
+            raise ValueError(f"Body payload rusak: {e}")
+        if decompressor.unconsumed_tail or len(body) > MAX_DECOMPRESSED_BYTES:
+            raise ValueError(f"Body payload melebihi {MAX_DECOMPRESSED_BYTES} byte setelah dekompresi")
+        if not decompressor.eof:
+            raise ValueError("Body payload rusak: stream zlib terpotong")
+    return body
+
+
+@f20221310104_traced()
+def f20221310104_encode_compact_payload(
+    message: str,
+    signature: str,
+    public_key_pem: str,
+    embed_public_key: bool = True,
+    compress: bool = True
+) -> str:
+    """
+    Encode payload QRIS ke format compact (versi 2.0)
+
+    Struktur: prefix ``DS2:`` + base45(versi, flags, body) dimana body adalah
+    record TLV berisi pesan UTF-8, signature mentah, public key DER (atau
+    fingerprint key), dan nama algoritma untuk key non-RSA.
+
+    Base45 hanya memakai alfabet QR alphanumeric, sehingga QR dienkode
+    dalam mode alphanumeric (5.5 bit/karakter).
+
     Args:
         message: Pesan asli
         signature: Digital signature dalam format base64
         public_key_pem: Public key dalam format PEM
-    
+        embed_public_key: Sertakan public key DER; jika False hanya
+            fingerprint key yang disimpan
+        compress: Kompres body dengan zlib jika hasilnya lebih kecil
+
     Returns:
-        PIL Image object dari QRIS
+        Payload compact dalam bentuk string
+    """
+    signature_bytes = f20221310104_decode_base64(signature)
+
+    body = bytearray()
+    _f20221310104_write_tlv(body, _TAG_MESSAGE, message.encode('utf-8'))
+    _f20221310104_write_tlv(body, _TAG_SIGNATURE, signature_bytes)
+    if embed_public_key:
+        _f20221310104_write_tlv(body, _TAG_PUBLIC_KEY_DER, f20221310104_public_key_der(public_key_pem))
+    else:
+        key_id = f20221310104_public_key_id(public_key_pem)
+        _f20221310104_write_tlv(body, _TAG_KEY_FINGERPRINT, bytes.fromhex(key_id))
+    algorithm = f20221310104_public_key_algorithm(public_key_pem)
+    if algorithm != ALGORITHM_RSA:
+        _f20221310104_write_tlv(body, _TAG_ALGORITHM, algorithm.encode('ascii'))
+
+    return _f20221310104_pack_compact(COMPACT_PREFIX, _COMPACT_VERSION, bytes(body), compress)
+
+
+@f20221310104_traced()
+def f20221310104_decode_compact_payload(encoded_data: str) -> Dict[str, Any]:
+    """
+    Decode payload QRIS format compact (versi 2.0)
+
+    Args:
+        encoded_data: Payload compact (diawali ``DS2:``)
+
+    Returns:
+        Dictionary payload dengan field yang sama seperti format 1.0.
+        Jika payload hanya membawa fingerprint, field ``public_key`` diganti
+        ``key_id`` (hex). Field ``algorithm`` berisi algoritma signature
+        (default RS256).
+
+    Raises:
+        ValueError: Jika payload tidak valid
+    """
+    body = _f20221310104_unpack_compact(encoded_data, COMPACT_PREFIX, _COMPACT_VERSION)
+
+    payload: Dict[str, Any] = {
+        "type": "digital_signature",
+        "version": PAYLOAD_FORMAT_COMPACT,
+        "algorithm": ALGORITHM_RSA,
+    }
+    for tag, value in _f20221310104_read_tlv(body):
+        if tag == _TAG_MESSAGE:
+            payload["message"] = value.decode('utf-8')
+        elif tag == _TAG_SIGNATURE:
+            payload["signature"] = base64.b64encode(value).decode('ascii')
+        elif tag == _TAG_PUBLIC_KEY_DER:
+            payload["public_key"] = _f20221310104_der_to_pem(value)
+        elif tag == _TAG_KEY_FINGERPRINT:
+            payload["key_id"] = value.hex()
+        elif tag == _TAG_ALGORITHM:
+            payload["algorithm"] = value.decode('ascii')
+        # Tag tidak dikenal diabaikan agar versi baru tetap terbaca
+    return payload
+
+
+def _f20221310104_envelope_signer_record(entry: Any, embed_public_key: bool) -> bytes:
+    """TLV bersarang untuk satu signer envelope"""
+    record = bytearray()
+    _f20221310104_write_tlv(record, _TAG_SIGNATURE, f20221310104_decode_base64(entry.signature))
+    if embed_public_key and entry.public_key_pem is not None:
+        public_key_der = f20221310104_public_key_der(entry.public_key_pem)
+        _f20221310104_write_tlv(record, _TAG_PUBLIC_KEY_DER, public_key_der)
+    else:
+        _f20221310104_write_tlv(record, _TAG_KEY_FINGERPRINT, bytes.fromhex(entry.key_id))
+    if entry.algorithm != ALGORITHM_RSA:
+        _f20221310104_write_tlv(record, _TAG_ALGORITHM, entry.algorithm.encode('ascii'))
+    return bytes(record)
+
+
+@f20221310104_traced()
+def f20221310104_encode_envelope_payload(
+    envelope: SignatureEnvelope,
+    embed_public_keys: Optional[bool] = None,
+    max_length: int = QR_MAX_ALPHANUMERIC_H
+) -> str:
+    """
+    Encode SignatureEnvelope ke payload compact multi-signer (versi 3.0)
+
+    Struktur: prefix ``DS3:`` + base45(versi, flags, body) dimana body berisi
+    record pesan lalu satu record signer per penandatangan (TLV bersarang:
+    signature mentah, public key DER atau key ID 8 byte, algoritma untuk
+    key non-RSA).
+
+    Layout menyesuaikan kapasitas QR: pada mode otomatis public key
+    disertakan selama payload muat di ``max_length``; jika tidak, public key
+    terbesar (RSA) diganti key ID lebih dulu sampai payload muat.
+
+    Args:
+        envelope: Envelope dengan minimal satu signer
+        embed_public_keys: True (selalu sertakan public key), False (hanya
+            key ID), atau None (otomatis sesuai kapasitas QR)
+        max_length: Panjang payload maksimum dalam karakter
+
+    Returns:
+        Payload envelope dalam bentuk string
+
+    Raises:
+        ValueError: Jika envelope kosong atau payload tidak muat dalam satu
+            QR bahkan dengan key ID saja
+    """
+    entries = envelope.signatures
+    if not entries:
+        raise ValueError("Envelope belum memiliki signer")
+
+    message_record = bytearray()
+    _f20221310104_write_tlv(message_record, _TAG_MESSAGE, envelope.message.encode('utf-8'))
+
+    def encode(embedded: set) -> str:
+        body = bytearray(message_record)
+        for index, entry in enumerate(entries):
+            _f20221310104_write_tlv(
+                body, _TAG_SIGNER, _f20221310104_envelope_signer_record(entry, index in embedded)
+            )
+        return _f20221310104_pack_compact(ENVELOPE_PREFIX, _ENVELOPE_VERSION, bytes(body))
+
+    with_keys = {index for index, entry in enumerate(entries) if entry.public_key_pem is not None}
+    if embed_public_keys is False:
+        return encode(set())
+    encoded = encode(with_keys)
+    if embed_public_keys or len(encoded) <= max_length:
+        return encoded
+
+    # Ganti public key terbesar dengan key ID sampai payload muat
+    embedded = set(with_keys)
+    for index in sorted(with_keys, key=lambda index: len(entries[index].public_key_pem), reverse=True):
+        embedded.discard(index)
+        encoded = encode(embedded)
+        if len(encoded) <= max_length:
+            return encoded
+    raise ValueError(
+        f"Payload envelope {len(encoded)} karakter melebihi kapasitas QR ({max_length}); "
+        "kurangi panjang pesan atau jumlah signer"
+    )
+
+
+@f20221310104_traced()
+def f20221310104_decode_envelope_payload(encoded_data: str) -> Dict[str, Any]:
+    """
+    Decode payload compact multi-signer (versi 3.0)
+
+    Args:
+        encoded_data: Payload envelope (diawali ``DS3:``)
+
+    Returns:
+        Dictionary {type, version, message, signatures} dimana setiap
+        signer berisi ``signature``, ``algorithm``, ``key_id``, dan
+        ``public_key`` jika disertakan
+
+    Raises:
+        ValueError: Jika payload tidak valid
+    """
+    body = _f20221310104_unpack_compact(encoded_data, ENVELOPE_PREFIX, _ENVELOPE_VERSION)
+
+    payload: Dict[str, Any] = {
+        "type": "digital_signature_envelope",
+        "version": PAYLOAD_FORMAT_ENVELOPE,
+        "signatures": [],
+    }
+    for tag, value in _f20221310104_read_tlv(body):
+        if tag == _TAG_MESSAGE:
+            payload["message"] = value.decode('utf-8')
+        elif tag == _TAG_SIGNER:
+            signer: Dict[str, Any] = {"algorithm": ALGORITHM_RSA}
+            for signer_tag, signer_value in _f20221310104_read_tlv(value):
+                if signer_tag == _TAG_SIGNATURE:
+                    signer["signature"] = base64.b64encode(signer_value).decode('ascii')
+                elif signer_tag == _TAG_PUBLIC_KEY_DER:
+                    signer["public_key"] = _f20221310104_der_to_pem(signer_value)
+                    signer["key_id"] = f20221310104_public_key_id(signer["public_key"])
+                elif signer_tag == _TAG_KEY_FINGERPRINT:
+                    signer["key_id"] = signer_value.hex()
+                elif signer_tag == _TAG_ALGORITHM:
+                    signer["algorithm"] = signer_value.decode('ascii')
+            payload["signatures"].append(signer)
+    return payload
+
+
+@f20221310104_traced()
+def f20221310104_encode_qris_payload(
+    message: str,
+    signature: str,
+    public_key_pem: str,
+    payload_format: str = PAYLOAD_FORMAT_JSON,
+    embed_public_key: bool = True
+) -> str:
+    """
+    Encode pesan, signature, dan public key menjadi string payload QRIS
+
+    Args:
+        message: Pesan asli
+        signature: Digital signature dalam format base64
+        public_key_pem: Public key dalam format PEM
+        payload_format: PAYLOAD_FORMAT_JSON ("1.0") atau
+            PAYLOAD_FORMAT_COMPACT ("2.0")
+        embed_public_key: Sertakan public key; jika False payload hanya
+            membawa key ID yang di-resolve penerima lewat key registry
+            (format JSON menjadi versi "1.1")
+
+    Returns:
+        Payload dalam bentuk string yang siap dienkode ke QR
     """
+    if payload_format == PAYLOAD_FORMAT_COMPACT:
+        return f20221310104_encode_compact_payload(
+            message, signature, public_key_pem, embed_public_key=embed_public_key
+        )
+    if payload_format != PAYLOAD_FORMAT_JSON:
+        raise ValueError(f"Format payload tidak dikenal: {payload_format}")
+
     # Buat payload JSON
     payload = {
         "type": "digital_signature",
-        "version": "1.0",
+        "version": PAYLOAD_FORMAT_JSON,
         "message": message,
         "signature": signature,
         "public_key": public_key_pem
     }
+    if not embed_public_key:
+        del payload["public_key"]
+        payload["version"] = PAYLOAD_FORMAT_JSON_KEY_ID
+        payload["key_id"] = f20221310104_public_key_id(public_key_pem)
+    algorithm = f20221310104_public_key_algorithm(public_key_pem)
+    if algorithm != ALGORITHM_RSA:
+        # Payload tanpa field algorithm dianggap RS256 (kompatibel dengan versi lama)
+        payload["algorithm"] = algorithm
     
     # Convert ke JSON string
     json_data = json.dumps(payload, ensure_ascii=False)
     
     # Encode ke base64 untuk mengurangi ukuran
-    encoded_data = base64.b64encode(json_data.encode('utf-8')).decode('utf-8')
+    return base64.b64encode(json_data.encode('utf-8')).decode('utf-8')
+
+
+@f20221310104_traced()
+def f20221310104_create_signature_qris(
+    message: str, 
+    signature: str, 
+    public_key_pem: str,
+    payload_format: str = PAYLOAD_FORMAT_JSON,
+    embed_public_key: bool = True
+) -> Image.Image:
+    """
+    Buat QRIS yang berisi pesan, signature, dan public key
+    
+    Args:
+        message: Pesan asli
+        signature: Digital signature dalam format base64
+        public_key_pem: Public key dalam format PEM
+        payload_format: PAYLOAD_FORMAT_JSON ("1.0") atau
+            PAYLOAD_FORMAT_COMPACT ("2.0")
+        embed_public_key: Sertakan public key; jika False hanya key ID
     
+    Returns:
+        PIL Image object dari QRIS
+    """
+    encoded_data = f20221310104_encode_qris_payload(
+        message, signature, public_key_pem, payload_format, embed_public_key
+    )
     return f20221310104_generate_qris(encoded_data)
 
 
-def f20221310104_decode_qris_data(encoded_data: str) -> Optional[Dict[str, Any]]:
+@f20221310104_traced()
+def f20221310104_decode_qris_data(encoded_data: Union[str, Iterable[str]]) -> Optional[Dict[str, Any]]:
     """
     Decode data QRIS dan extract payload
     
+    Format 1.0 (JSON + base64), 2.0 (compact, prefix ``DS2:``), dan 3.0
+    (envelope multi-signer, prefix ``DS3:``) dideteksi otomatis. Field
+    ``algorithm`` selalu diisi (default RS256) sehingga verifikasi bisa
+    memilih backend yang sesuai; payload envelope membawa list
+    ``signatures`` (lihat f20221310104_decode_envelope_payload).
+    
+    Payload multi-QR (bagian ``DSM:``) digabung dulu dengan
+    f20221310104_join_payload_parts; bagian boleh diberikan dalam urutan
+    apa saja.
+    
     Args:
-        encoded_data: Data yang di-encode dari QRIS
+        encoded_data: Data yang di-encode dari QRIS, atau iterable berisi
+            bagian-bagian payload multi-QR
     
     Returns:
-        Dictionary berisi payload atau None jika gagal
+        Dictionary berisi payload atau None jika gagal (termasuk bagian
+        multi-QR yang belum lengkap)
     """
+    if not isinstance(encoded_data, str) or encoded_data.strip().startswith(MULTIPART_PREFIX):
+        try:
+            encoded_data = f20221310104_join_payload_parts(
+                [encoded_data] if isinstance(encoded_data, str) else encoded_data
+            )
+        except (ValueError, TypeError, AttributeError):
+            return None
+    
+    if encoded_data.strip().startswith(ENVELOPE_PREFIX):
+        try:
+            payload = f20221310104_decode_envelope_payload(encoded_data)
+        except (ValueError, UnicodeDecodeError, binascii.Error):
+            return None
+        if 'message' in payload and payload['signatures'] and all(
+            'signature' in signer and 'key_id' in signer for signer in payload['signatures']
+        ):
+            return payload
+        return None
+    
+    if encoded_data.strip().startswith(COMPACT_PREFIX):
+        try:
+            payload = f20221310104_decode_compact_payload(encoded_data)
+        except (ValueError, UnicodeDecodeError, binascii.Error):
+            return None
+        if 'message' in payload and 'signature' in payload and (
+            'public_key' in payload or 'key_id' in payload
+        ):
+            return payload
+        return None
+    
     try:
-        # Decode dari base64
-        json_data = base64.b64decode(encoded_data.encode('utf-8')).decode('utf-8')
+        # Decode dari base64 (whitespace hasil paste, padding hilang, dan urlsafe ditoleransi)
+        json_data = f20221310104_decode_base64(encoded_data).decode('utf-8')
         
         # Parse JSON
         payload = json.loads(json_data)
         
-        # Validasi struktur
-        required_fields = ['type', 'message', 'signature', 'public_key']
-        if all(field in payload for field in required_fields):
+        # Validasi struktur (public_key atau key_id untuk versi 1.1)
+        required_fields = ['type', 'message', 'signature']
+        if isinstance(payload, dict) and all(field in payload for field in required_fields) and (
+            'public_key' in payload or 'key_id' in payload
+        ):
+            payload.setdefault('algorithm', ALGORITHM_RSA)
             return payload
         
         return None
@@ -99,18 +1042,376 @@ def f20221310104_decode_qris_data(encoded_data: str) -> Optional[Dict[str, Any]]
         return None
 
 
-def f20221310104_qris_to_bytes(qr_image: Image.Image, format: str = 'PNG') -> bytes:
+@f20221310104_traced()
+def f20221310104_qris_to_bytes(
+    qr_image: Image.Image,
+    format: str = 'PNG',
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL
+) -> bytes:
     """
     Convert QRIS image ke bytes
     
     Args:
         qr_image: PIL Image object
         format: Format gambar (PNG, JPEG, etc.)
+        compress_level: Level kompresi zlib untuk PNG (0-9)
     
     Returns:
         Image bytes
     """
     buffer = BytesIO()
-    qr_image.save(buffer, format=format)
-    buffer.seek(0)
+    with f20221310104_stage(f"{format.lower()}.encode"):
+        if format.upper() == 'PNG':
+            qr_image.save(buffer, format=format, compress_level=compress_level)
+        else:
+            qr_image.save(buffer, format=format)
     return buffer.getvalue()
+
+
+def f20221310104_max_payload_length(payload_format: str, policy: Optional[QrPolicy] = None) -> int:
+    """
+    Panjang payload maksimum untuk satu QR dengan format dan kebijakan tertentu
+
+    Format compact dan envelope dienkode dalam mode alphanumeric, format
+    JSON (base64) dalam mode byte.
+
+    Args:
+        payload_format: Versi format payload
+        policy: Kebijakan versi/error correction (default: level H tetap)
+
+    Returns:
+        Jumlah karakter maksimum (untuk level H: QR_MAX_ALPHANUMERIC_H
+        atau QR_MAX_BYTES_H)
+    """
+    mode = MODE_ALPHA_NUM if payload_format in (PAYLOAD_FORMAT_COMPACT, PAYLOAD_FORMAT_ENVELOPE) else MODE_8BIT_BYTE
+    return f20221310104_policy_capacity(policy, mode)
+
+
+def _f20221310104_artifact(
+    matrix: QrMatrix,
+    png_bytes: bytes,
+    box_size: int,
+    payload_format: str,
+    payload_length: int,
+    compress_level: int,
+    part_index: int = 0,
+    part_total: int = 1
+) -> QrisArtifact:
+    """QrisArtifact dengan versi dan level error correction dari matriks"""
+    pixels = matrix.size * box_size
+    return QrisArtifact(
+        png_bytes=png_bytes,
+        width=pixels,
+        height=pixels,
+        payload_format=payload_format,
+        payload_length=payload_length,
+        compress_level=compress_level,
+        part_index=part_index,
+        part_total=part_total,
+        qr_version=matrix.version,
+        error_correction=ERROR_CORRECTION_NAMES[matrix.error_correction],
+    )
+
+
+@f20221310104_traced()
+def f20221310104_create_signature_qris_artifact(
+    message: str,
+    signature: str,
+    public_key_pem: str,
+    payload_format: str = PAYLOAD_FORMAT_JSON,
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+    box_size: int = 10,
+    embed_public_key: bool = True,
+    policy: Optional[QrPolicy] = None
+) -> QrisArtifact:
+    """
+    Buat QRIS signature dan langsung enkode sekali menjadi PNG
+
+    Memakai renderer palette (f20221310104_render_qr_png) sehingga tidak
+    ada gambar RGB penuh yang dibangun, melalui QrRenderCache sehingga
+    payload yang sama tidak dirender ulang.
+
+    Args:
+        message: Pesan asli
+        signature: Digital signature dalam format base64
+        public_key_pem: Public key dalam format PEM
+        payload_format: PAYLOAD_FORMAT_JSON ("1.0") atau
+            PAYLOAD_FORMAT_COMPACT ("2.0")
+        compress_level: Level kompresi zlib untuk PNG (0-9)
+        box_size: Ukuran setiap box dalam pixel
+        embed_public_key: Sertakan public key; jika False hanya key ID
+        policy: Kebijakan versi/error correction (default: level H tetap)
+
+    Returns:
+        QrisArtifact berisi PNG bytes (palette 1-bit) dan metadata,
+        termasuk versi QR dan level error correction terpilih
+    """
+    encoded_data = f20221310104_encode_qris_payload(
+        message, signature, public_key_pem, payload_format, embed_public_key
+    )
+    matrix, png_bytes = f20221310104_render_qris_cached(
+        encoded_data,
+        box_size=box_size,
+        compress_level=compress_level,
+        policy=policy
+    )
+    return _f20221310104_artifact(
+        matrix, png_bytes, box_size, payload_format, len(encoded_data), compress_level
+    )
+
+
+@f20221310104_traced()
+def f20221310104_create_envelope_qris_artifact(
+    envelope: SignatureEnvelope,
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+    box_size: int = 10,
+    embed_public_keys: Optional[bool] = None,
+    policy: Optional[QrPolicy] = None
+) -> QrisArtifact:
+    """
+    Buat QRIS envelope multi-signer dan enkode sekali menjadi PNG
+
+    Args:
+        envelope: Envelope dengan minimal satu signer
+        compress_level: Level kompresi zlib untuk PNG (0-9)
+        box_size: Ukuran setiap box dalam pixel
+        embed_public_keys: True, False, atau None (otomatis sesuai
+            kapasitas QR di bawah ``policy``); lihat
+            f20221310104_encode_envelope_payload
+        policy: Kebijakan versi/error correction (default: level H tetap)
+
+    Returns:
+        QrisArtifact berisi PNG bytes (palette 1-bit) dan metadata
+    """
+    encoded_data = f20221310104_encode_envelope_payload(
+        envelope, embed_public_keys, f20221310104_max_payload_length(PAYLOAD_FORMAT_ENVELOPE, policy)
+    )
+    matrix, png_bytes = f20221310104_render_qris_cached(
+        encoded_data,
+        box_size=box_size,
+        compress_level=compress_level,
+        policy=policy
+    )
+    return _f20221310104_artifact(
+        matrix, png_bytes, box_size, PAYLOAD_FORMAT_ENVELOPE, len(encoded_data), compress_level
+    )
+
+
+def _f20221310104_payload_parity(data: bytes) -> int:
+    """Parity Structured Append: XOR seluruh byte payload"""
+    return reduce(int.__xor__, data, 0)
+
+
+def f20221310104_split_payload(encoded_data: str, max_part_length: int = DEFAULT_PART_LENGTH) -> List[str]:
+    """
+    Pecah payload QRIS menjadi beberapa bagian dengan header urutan
+
+    Setara dengan QR Structured Append: setiap bagian diawali ``DSM:`` lalu
+    index dan total bagian dikurangi satu (masing-masing 1 digit hex, seperti
+    nibble Structured Append) serta parity (XOR seluruh byte payload,
+    2 digit hex). Header hanya memakai alfabet QR
+    alphanumeric sehingga bagian dari payload compact tetap dienkode dalam
+    mode alphanumeric. Payload dibagi rata sehingga semua QR berukuran
+    hampir sama.
+
+    Args:
+        encoded_data: Payload QRIS lengkap
+        max_part_length: Panjang maksimum satu bagian termasuk header
+
+    Returns:
+        List bagian payload; payload yang sudah muat dikembalikan apa adanya
+        sebagai satu elemen (tanpa header)
+
+    Raises:
+        ValueError: Jika payload membutuhkan lebih dari MAX_PAYLOAD_PARTS bagian
+    """
+    if len(encoded_data) <= max_part_length:
+        return [encoded_data]
+
+    chunk_length = max_part_length - _MULTIPART_HEADER_LENGTH
+    if chunk_length < 1:
+        raise ValueError("max_part_length terlalu kecil untuk header multi-QR")
+    total = -(-len(encoded_data) // chunk_length)
+    if total > MAX_PAYLOAD_PARTS:
+        raise ValueError(
+            f"Payload {len(encoded_data)} karakter membutuhkan {total} QR "
+            f"(maksimum {MAX_PAYLOAD_PARTS})"
+        )
+
+    chunk_length = -(-len(encoded_data) // total)
+    parity = _f20221310104_payload_parity(encoded_data.encode('utf-8'))
+    return [
+        f"{MULTIPART_PREFIX}{index:X}{total - 1:X}{parity:02X}:"
+        + encoded_data[index * chunk_length:(index + 1) * chunk_length]
+        for index in range(total)
+    ]
+
+
+def f20221310104_join_payload_parts(parts: Iterable[str]) -> str:
+    """
+    Gabungkan bagian payload multi-QR dengan urutan bebas
+
+    Args:
+        parts: Bagian payload (hasil pemindaian, urutan apa saja; duplikat
+            diabaikan). Satu payload tanpa header dikembalikan apa adanya.
+
+    Returns:
+        Payload QRIS lengkap
+
+    Raises:
+        ValueError: Jika header tidak valid, bagian berasal dari payload
+            berbeda, ada bagian yang hilang, atau parity tidak cocok
+    """
+    chunks: Dict[int, str] = {}
+    set_header: Optional[Tuple[int, int]] = None
+    plain: List[str] = []
+    for part in parts:
+        # Spasi termasuk alfabet base45: hanya newline/tab di akhir yang dibuang
+        # agar potongan yang berakhir dengan spasi tidak terpotong
+        part = part.lstrip().rstrip("\r\n\t")
+        if not part.startswith(MULTIPART_PREFIX):
+            plain.append(part)
+            continue
+        header = part[len(MULTIPART_PREFIX):_MULTIPART_HEADER_LENGTH]
+        try:
+            index, total, parity = int(header[0], 16), int(header[1], 16) + 1, int(header[2:4], 16)
+        except (ValueError, IndexError):
+            raise ValueError("Header bagian multi-QR tidak valid") from None
+        if len(header) != 5 or header[4] != ":" or index >= total:
+            raise ValueError("Header bagian multi-QR tidak valid")
+        if set_header is None:
+            set_header = (total, parity)
+        elif set_header != (total, parity):
+            raise ValueError("Bagian multi-QR berasal dari payload yang berbeda")
+        chunks[index] = part[_MULTIPART_HEADER_LENGTH:]
+
+    if set_header is None:
+        if len(plain) != 1:
+            raise ValueError("Diharapkan tepat satu payload QRIS")
+        return plain[0]
+    if plain:
+        raise ValueError("Payload QRIS biasa tercampur dengan bagian multi-QR")
+
+    total, parity = set_header
+    missing = [str(index + 1) for index in range(total) if index not in chunks]
+    if missing:
+        raise ValueError(f"Bagian multi-QR belum lengkap: bagian {', '.join(missing)} dari {total} belum ada")
+    encoded_data = ''.join(chunks[index] for index in range(total))
+    if _f20221310104_payload_parity(encoded_data.encode('utf-8')) != parity:
+        raise ValueError("Parity multi-QR tidak cocok")
+    return encoded_data
+
+
+def f20221310104_render_qris_parts(
+    parts: List[str],
+    box_size: int = 10,
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+    executor: Optional[Executor] = None,
+    cache: Optional[QrRenderCache] = None,
+    policy: Optional[QrPolicy] = None
+) -> List[Tuple[QrMatrix, bytes]]:
+    """
+    Render beberapa bagian payload secara paralel melalui render cache
+
+    Bagian yang sudah ada di cache tidak dirender ulang. Sisanya dirender di
+    ``executor`` milik pemanggil; tanpa executor bagian dirender berurutan
+    di proses ini. Jumlah bagian multi-QR kecil (paling banyak
+    MAX_PAYLOAD_PARTS), sehingga membuat pool per panggilan lebih mahal
+    daripada render-nya dan fork dari proses multi-thread (Streamlit,
+    service) tidak aman.
+
+    Args:
+        parts: Bagian payload dari f20221310104_split_payload
+        box_size: Ukuran setiap box dalam pixel
+        compress_level: Level kompresi zlib untuk PNG (0-9)
+        executor: Executor opsional untuk render paralel
+        cache: QrRenderCache yang dipakai (default: cache bersama)
+        policy: Kebijakan versi/error correction (default: level H tetap)
+
+    Returns:
+        List (QrMatrix, PNG bytes) dengan urutan yang sama seperti ``parts``
+    """
+    cache = cache or _f20221310104_render_cache
+    keys = [cache.make_key(part, ERROR_CORRECT_H, box_size, 4, compress_level, policy) for part in parts]
+    results: List[Optional[Tuple[QrMatrix, bytes]]] = [cache.get(key) for key in keys]
+    missing = [index for index, result in enumerate(results) if result is None]
+
+    if executor is None:
+        rendered = [f20221310104_render_qris_cached(parts[index], box_size=box_size,
+                                                    compress_level=compress_level, cache=cache,
+                                                    policy=policy)
+                    for index in missing]
+    else:
+        futures = [
+            executor.submit(_f20221310104_render_part, parts[index], box_size, compress_level, policy)
+            for index in missing
+        ]
+        rendered = [future.result() for future in futures]
+        for index, (matrix, png_bytes) in zip(missing, rendered):
+            cache.put(keys[index], matrix, png_bytes)
+
+    for index, result in zip(missing, rendered):
+        results[index] = result
+    return results
+
+
+def _f20221310104_render_part(
+    data: str,
+    box_size: int,
+    compress_level: int,
+    policy: Optional[QrPolicy] = None
+) -> Tuple[QrMatrix, bytes]:
+    """Render satu bagian tanpa cache (dijalankan di worker process)"""
+    matrix = f20221310104_build_qr_matrix(data, policy=policy)
+    return matrix, f20221310104_render_qr_png(matrix, box_size, compress_level)
+
+
+@f20221310104_traced()
+def f20221310104_create_signature_qris_artifacts(
+    message: str,
+    signature: str,
+    public_key_pem: str,
+    payload_format: str = PAYLOAD_FORMAT_COMPACT,
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+    box_size: int = 10,
+    embed_public_key: bool = True,
+    max_part_length: Optional[int] = DEFAULT_PART_LENGTH,
+    executor: Optional[Executor] = None,
+    policy: Optional[QrPolicy] = None
+) -> List[QrisArtifact]:
+    """
+    Buat QRIS signature sebagai satu atau beberapa QR (multi-QR)
+
+    Payload yang lebih panjang dari ``max_part_length`` dipecah dengan
+    f20221310104_split_payload lalu setiap bagian dirender paralel. Panjang
+    bagian dibatasi kapasitas satu QR di bawah ``policy``.
+
+    Args:
+        message: Pesan asli
+        signature: Digital signature dalam format base64
+        public_key_pem: Public key dalam format PEM
+        payload_format: PAYLOAD_FORMAT_JSON ("1.0") atau
+            PAYLOAD_FORMAT_COMPACT ("2.0")
+        compress_level: Level kompresi zlib untuk PNG (0-9)
+        box_size: Ukuran setiap box dalam pixel
+        embed_public_key: Sertakan public key; jika False hanya key ID
+        max_part_length: Panjang maksimum payload per QR (None: kapasitas
+            penuh satu QR di bawah ``policy``)
+        executor: Executor opsional untuk render paralel
+        policy: Kebijakan versi/error correction (default: level H tetap)
+
+    Returns:
+        List QrisArtifact sesuai urutan bagian (``part_index``/``part_total``)
+    """
+    encoded_data = f20221310104_encode_qris_payload(
+        message, signature, public_key_pem, payload_format, embed_public_key
+    )
+    capacity = f20221310104_max_payload_length(payload_format, policy)
+    parts = f20221310104_split_payload(encoded_data, min(max_part_length or capacity, capacity))
+    rendered = f20221310104_render_qris_parts(parts, box_size, compress_level, executor, policy=policy)
+    return [
+        _f20221310104_artifact(
+            matrix, png_bytes, box_size, payload_format, len(part), compress_level, index, len(parts)
+        )
+        for index, (part, (matrix, png_bytes)) in enumerate(zip(parts, rendered))
+    ]
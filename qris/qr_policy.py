@@ -0,0 +1,302 @@
+"""
+QR Policy Module
+Pemilihan level error correction dan versi QR dari tabel kapasitas
+
+Kapasitas data (bit) setiap kombinasi versi 1-40 dan level L/M/Q/H
+dihitung sekali saat import dari tabel blok Reed-Solomon milik ``qrcode``.
+Kebutuhan bit payload dihitung sekali per kelompok versi (panjang field
+character count berubah di versi 10 dan 27), lalu versi dipilih dengan
+``bisect`` pada tabel sehingga tidak ada percobaan ``make(fit=True)``
+berulang.
+
+Kebijakan yang tersedia:
+    fixed     Level tetap (default H), versi terkecil yang muat
+    smallest  Versi terkecil (opsional dibatasi jumlah module), lalu level
+              dinaikkan setinggi mungkin tanpa menambah versi
+    max_ecc   Level tertinggi yang muat pada versi tertentu
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from qrcode import util
+from qrcode.constants import ERROR_CORRECT_H, ERROR_CORRECT_L, ERROR_CORRECT_M, ERROR_CORRECT_Q
+
+
+POLICY_FIXED = "fixed"
+POLICY_SMALLEST = "smallest"
+POLICY_MAX_ECC = "max_ecc"
+
+# Level error correction dari yang paling lemah ke paling kuat
+# (konstanta qrcode tidak berurutan: M=0, L=1, H=2, Q=3)
+ERROR_CORRECTION_LEVELS = (ERROR_CORRECT_L, ERROR_CORRECT_M, ERROR_CORRECT_Q, ERROR_CORRECT_H)
+ERROR_CORRECTION_NAMES = {
+    ERROR_CORRECT_L: "L",
+    ERROR_CORRECT_M: "M",
+    ERROR_CORRECT_Q: "Q",
+    ERROR_CORRECT_H: "H",
+}
+
+QR_MIN_VERSION = 1
+QR_MAX_VERSION = 40
+
+# Kelompok versi dengan panjang field character count yang sama
+_VERSION_BANDS = ((1, 9), (10, 26), (27, 40))
+
+# Kapasitas data (bit) per level, diindeks dengan nomor versi (indeks 0 tidak dipakai)
+QR_CAPACITY_BITS: Dict[int, Tuple[int, ...]] = {
+    level: tuple(util.BIT_LIMIT_TABLE[level]) for level in ERROR_CORRECTION_LEVELS
+}
+
+
+class QrCapacityError(ValueError):
+    """Payload tidak muat dengan batasan kebijakan QR"""
+
+
+class QrPolicy(NamedTuple):
+    """
+    Kebijakan pemilihan level error correction dan versi QR
+
+    Buat lewat f20221310104_fixed_ecc_policy,
+    f20221310104_smallest_version_policy, atau f20221310104_max_ecc_policy.
+    """
+    kind: str
+    error_correction: int = ERROR_CORRECT_H  # Level tetap (fixed) atau level minimum (smallest)
+    max_modules: Optional[int] = None        # Batas sisi QR dalam module, tanpa border (smallest)
+    version: Optional[int] = None            # Versi QR (max_ecc)
+
+
+class QrLayout(NamedTuple):
+    """Versi dan level error correction terpilih beserta pemakaian kapasitas"""
+    version: int
+    error_correction: int
+    size: int            # Sisi QR dalam module, tanpa border
+    data_bits: int       # Bit payload termasuk header mode dan character count
+    capacity_bits: int   # Kapasitas data versi dan level terpilih
+
+    @property
+    def error_correction_name(self) -> str:
+        return ERROR_CORRECTION_NAMES[self.error_correction]
+
+
+def f20221310104_qr_size(version: int) -> int:
+    """Sisi QR dalam module (tanpa border) untuk satu versi"""
+    return 17 + 4 * version
+
+
+def _f20221310104_check_version(version: int) -> None:
+    if not QR_MIN_VERSION <= version <= QR_MAX_VERSION:
+        raise ValueError(f"Versi QR harus {QR_MIN_VERSION}-{QR_MAX_VERSION}, bukan {version}")
+
+
+def _f20221310104_check_level(error_correction: int) -> None:
+    if error_correction not in ERROR_CORRECTION_NAMES:
+        raise ValueError(f"Level error correction tidak dikenal: {error_correction!r}")
+
+
+def f20221310104_error_correction_level(level: Union[str, int]) -> int:
+    """
+    Ubah nama level ("L", "M", "Q", "H") menjadi konstanta qrcode
+
+    Args:
+        level: Nama level (tidak case-sensitive) atau konstanta qrcode
+
+    Returns:
+        Konstanta error correction qrcode
+
+    Raises:
+        ValueError: Jika level tidak dikenal
+    """
+    if isinstance(level, str):
+        for constant, name in ERROR_CORRECTION_NAMES.items():
+            if name == level.strip().upper():
+                return constant
+        raise ValueError(f"Level error correction tidak dikenal: {level!r}")
+    _f20221310104_check_level(level)
+    return level
+
+
+def f20221310104_fixed_ecc_policy(error_correction: int = ERROR_CORRECT_H) -> QrPolicy:
+    """Kebijakan level tetap dengan versi terkecil yang muat (perilaku awal: H)"""
+    _f20221310104_check_level(error_correction)
+    return QrPolicy(POLICY_FIXED, error_correction)
+
+
+def f20221310104_smallest_version_policy(
+    max_modules: Optional[int] = None,
+    min_error_correction: int = ERROR_CORRECT_L
+) -> QrPolicy:
+    """
+    Kebijakan versi terkecil lalu level tertinggi yang muat di versi tersebut
+
+    Cocok untuk layar-ke-layar: QR sekecil mungkin, sisa kapasitas di versi
+    terpilih dipakai untuk menaikkan error correction.
+
+    Args:
+        max_modules: Sisi QR maksimum dalam module (tanpa border), misalnya
+            57 untuk versi 10; None untuk tanpa batas
+        min_error_correction: Level minimum (default L)
+
+    Returns:
+        QrPolicy
+    """
+    _f20221310104_check_level(min_error_correction)
+    if max_modules is not None and max_modules < f20221310104_qr_size(QR_MIN_VERSION):
+        raise ValueError(f"max_modules minimal {f20221310104_qr_size(QR_MIN_VERSION)} (versi 1)")
+    return QrPolicy(POLICY_SMALLEST, min_error_correction, max_modules=max_modules)
+
+
+def f20221310104_max_ecc_policy(version: int) -> QrPolicy:
+    """Kebijakan level error correction tertinggi yang muat pada versi ``version``"""
+    _f20221310104_check_version(version)
+    return QrPolicy(POLICY_MAX_ECC, ERROR_CORRECT_L, version=version)
+
+
+DEFAULT_QR_POLICY = f20221310104_fixed_ecc_policy(ERROR_CORRECT_H)
+
+
+def f20221310104_segment_qr_data(data: str) -> List[util.QRData]:
+    """
+    Pecah data menjadi segmen mode QR (numeric/alphanumeric/byte)
+
+    Sama dengan pemecahan ``QRCode.add_data`` sehingga segmen bisa dipakai
+    untuk menghitung kebutuhan bit sekaligus mengisi QRCode.
+    """
+    return list(util.optimal_data_chunks(data, minimum=20))
+
+
+def _f20221310104_band_bits(segments: Sequence[util.QRData]) -> Tuple[int, int, int]:
+    """Kebutuhan bit payload untuk setiap kelompok versi"""
+    buffer = util.BitBuffer()
+    for segment in segments:
+        segment.write(buffer)
+    payload_bits = len(buffer)
+    return tuple(
+        payload_bits + sum(4 + util.mode_sizes_for_version(low)[segment.mode] for segment in segments)
+        for low, _ in _VERSION_BANDS
+    )
+
+
+def _f20221310104_needed_bits(band_bits: Tuple[int, int, int], version: int) -> int:
+    return band_bits[0 if version < 10 else 1 if version < 27 else 2]
+
+
+def _f20221310104_smallest_version(band_bits: Tuple[int, int, int], error_correction: int) -> Optional[int]:
+    """Versi terkecil yang muat pada satu level (satu bisect per kelompok versi)"""
+    capacity = QR_CAPACITY_BITS[error_correction]
+    for (low, high), needed in zip(_VERSION_BANDS, band_bits):
+        version = bisect_left(capacity, needed, low, high + 1)
+        if version <= high:
+            return version
+    return None
+
+
+def _f20221310104_strongest_level(band_bits: Tuple[int, int, int], version: int, minimum: int) -> Optional[int]:
+    """Level tertinggi (>= minimum) yang muat pada versi tertentu"""
+    needed = _f20221310104_needed_bits(band_bits, version)
+    for level in reversed(ERROR_CORRECTION_LEVELS[ERROR_CORRECTION_LEVELS.index(minimum):]):
+        if QR_CAPACITY_BITS[level][version] >= needed:
+            return level
+    return None
+
+
+def _f20221310104_layout(band_bits: Tuple[int, int, int], policy: QrPolicy) -> QrLayout:
+    if policy.kind == POLICY_FIXED:
+        error_correction = policy.error_correction
+        version = _f20221310104_smallest_version(band_bits, error_correction)
+        if version is None:
+            raise QrCapacityError(
+                f"Payload {band_bits[2]} bit melebihi kapasitas QR versi {QR_MAX_VERSION} "
+                f"level {ERROR_CORRECTION_NAMES[error_correction]}"
+            )
+    elif policy.kind == POLICY_SMALLEST:
+        version = _f20221310104_smallest_version(band_bits, policy.error_correction)
+        if version is None or (
+            policy.max_modules is not None and f20221310104_qr_size(version) > policy.max_modules
+        ):
+            raise QrCapacityError(
+                f"Payload tidak muat di QR {policy.max_modules or f20221310104_qr_size(QR_MAX_VERSION)} "
+                f"module level {ERROR_CORRECTION_NAMES[policy.error_correction]}"
+            )
+        error_correction = _f20221310104_strongest_level(band_bits, version, policy.error_correction)
+    elif policy.kind == POLICY_MAX_ECC:
+        version = policy.version
+        error_correction = _f20221310104_strongest_level(band_bits, version, ERROR_CORRECT_L)
+        if error_correction is None:
+            raise QrCapacityError(f"Payload tidak muat di QR versi {version} bahkan dengan level L")
+    else:
+        raise ValueError(f"Kebijakan QR tidak dikenal: {policy.kind!r}")
+
+    return QrLayout(
+        version,
+        error_correction,
+        f20221310104_qr_size(version),
+        _f20221310104_needed_bits(band_bits, version),
+        QR_CAPACITY_BITS[error_correction][version],
+    )
+
+
+def f20221310104_select_qr_layout(
+    data: Union[str, Sequence[util.QRData]],
+    policy: Optional[QrPolicy] = None
+) -> QrLayout:
+    """
+    Pilih versi dan level error correction untuk data sesuai kebijakan
+
+    Args:
+        data: Data QR atau segmen dari f20221310104_segment_qr_data
+        policy: QrPolicy (default: DEFAULT_QR_POLICY, level H tetap)
+
+    Returns:
+        QrLayout terpilih
+
+    Raises:
+        QrCapacityError: Jika data tidak muat dengan batasan kebijakan
+    """
+    segments = f20221310104_segment_qr_data(data) if isinstance(data, str) else data
+    return _f20221310104_layout(_f20221310104_band_bits(segments), policy or DEFAULT_QR_POLICY)
+
+
+def f20221310104_qr_capacity(version: int, error_correction: int = ERROR_CORRECT_H, mode: int = util.MODE_ALPHA_NUM) -> int:
+    """
+    Kapasitas satu segmen dalam karakter (tabel kapasitas standar QR)
+
+    Args:
+        version: Versi QR (1-40)
+        error_correction: Level error correction (konstanta qrcode)
+        mode: util.MODE_NUMBER, util.MODE_ALPHA_NUM, atau util.MODE_8BIT_BYTE
+
+    Returns:
+        Jumlah karakter maksimum
+    """
+    _f20221310104_check_version(version)
+    bits = QR_CAPACITY_BITS[error_correction][version] - 4 - util.length_in_bits(mode, version)
+    if mode == util.MODE_NUMBER:
+        return bits // 10 * 3 + (2 if bits % 10 >= 7 else 1 if bits % 10 >= 4 else 0)
+    if mode == util.MODE_ALPHA_NUM:
+        return bits // 11 * 2 + (1 if bits % 11 >= 6 else 0)
+    return bits // 8
+
+
+def f20221310104_policy_capacity(policy: Optional[QrPolicy] = None, mode: int = util.MODE_ALPHA_NUM) -> int:
+    """
+    Panjang payload maksimum untuk satu QR di bawah kebijakan
+
+    Dipakai sebagai batas pemecahan multi-QR: fixed memakai versi 40 pada
+    levelnya, smallest memakai versi terbesar dalam batas module pada level
+    minimum, dan max_ecc memakai versinya pada level L.
+
+    Args:
+        policy: QrPolicy (default: DEFAULT_QR_POLICY)
+        mode: Mode segmen payload (alphanumeric untuk compact, byte untuk JSON)
+
+    Returns:
+        Jumlah karakter maksimum
+    """
+    policy = policy or DEFAULT_QR_POLICY
+    if policy.kind == POLICY_MAX_ECC:
+        return f20221310104_qr_capacity(policy.version, ERROR_CORRECT_L, mode)
+    version = QR_MAX_VERSION
+    if policy.kind == POLICY_SMALLEST and policy.max_modules is not None:
+        version = min(QR_MAX_VERSION, (policy.max_modules - 17) // 4)
+    return f20221310104_qr_capacity(version, policy.error_correction, mode)
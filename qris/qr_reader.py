@@ -0,0 +1,213 @@
+"""
+QRIS Reader Module
+Modul untuk membaca (decode) QRIS dari gambar PNG/JPEG yang diupload
+"""
+
+from PIL import Image, ImageOps
+from io import BytesIO
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import time
+
+try:
+    # zxing-cpp: decoder QR dengan wheel siap pakai (tanpa library sistem)
+    import zxingcpp
+except ImportError:  # pragma: no cover - dependency opsional
+    zxingcpp = None
+
+from .qr_generator import MULTIPART_PREFIX, f20221310104_decode_qris_data, f20221310104_join_payload_parts
+
+
+# Sisi terpanjang gambar setelah downscale; foto kamera 12MP cukup
+# diperkecil ke ukuran ini tanpa kehilangan module QR
+DEFAULT_MAX_SIDE = 1024
+
+
+class QrisReadResult(NamedTuple):
+    """Hasil pembacaan QRIS dari gambar"""
+    data: Optional[str]
+    payload: Optional[Dict[str, Any]]
+    timings: Dict[str, float]
+    error: Optional[str] = None
+
+
+def f20221310104_preprocess_image(image_bytes: bytes, max_side: int = DEFAULT_MAX_SIDE) -> Image.Image:
+    """
+    Load gambar lalu ubah ke grayscale dan perkecil jika terlalu besar
+
+    Untuk JPEG, ``draft`` membuat decoder langsung men-decode pada skala
+    yang lebih kecil sehingga foto besar tidak perlu di-decode penuh.
+
+    Args:
+        image_bytes: Isi file gambar (PNG/JPEG)
+        max_side: Panjang maksimum sisi gambar dalam pixel
+
+    Returns:
+        PIL Image grayscale (mode "L")
+    """
+    image = Image.open(BytesIO(image_bytes))
+    image.draft('L', (max_side, max_side))
+    image = ImageOps.exif_transpose(image)
+
+    if image.mode in ('RGBA', 'LA', 'P'):
+        # Area transparan dianggap putih agar tidak terbaca sebagai module gelap
+        image = image.convert('RGBA')
+        background = Image.new('RGBA', image.size, 'white')
+        image = Image.alpha_composite(background, image)
+
+    image = image.convert('L')
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.Resampling.BOX)
+    return image
+
+
+def f20221310104_binarize_image(image: Image.Image) -> Image.Image:
+    """
+    Binarisasi gambar grayscale dengan threshold dari histogram (Otsu)
+
+    Args:
+        image: PIL Image grayscale
+
+    Returns:
+        PIL Image hitam-putih (mode "L", nilai 0/255)
+    """
+    image = ImageOps.autocontrast(image)
+    histogram = image.histogram()
+    total = sum(histogram)
+    sum_all = sum(i * count for i, count in enumerate(histogram))
+
+    sum_background = 0
+    weight_background = 0
+    best_threshold = 127
+    best_variance = 0.0
+    for level, count in enumerate(histogram):
+        weight_background += count
+        if weight_background == 0:
+            continue
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+        sum_background += level * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_variance = variance
+            best_threshold = level
+
+    return image.point(lambda value: 255 if value > best_threshold else 0)
+
+
+def _f20221310104_detect_texts(
+    image_bytes: bytes,
+    max_side: int,
+    timings: Dict[str, float]
+) -> Tuple[List[str], Optional[str]]:
+    """
+    Deteksi semua QR pada satu gambar
+
+    Returns:
+        Tuple (list teks QR, pesan error atau None)
+    """
+    if zxingcpp is None:
+        return [], "Package zxing-cpp belum terinstall"
+
+    start = time.perf_counter()
+    try:
+        image = f20221310104_preprocess_image(image_bytes, max_side)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        return [], f"Gambar tidak dapat dibaca: {e}"
+    timings["preprocess"] = timings.get("preprocess", 0.0) + (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    results = zxingcpp.read_barcodes(image, formats=zxingcpp.BarcodeFormat.QRCode)
+    timings["detect"] = timings.get("detect", 0.0) + (time.perf_counter() - start) * 1000
+
+    if not results:
+        # Foto dengan pencahayaan tidak rata: coba lagi setelah binarisasi
+        start = time.perf_counter()
+        binary = f20221310104_binarize_image(image)
+        timings["binarize"] = timings.get("binarize", 0.0) + (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        results = zxingcpp.read_barcodes(
+            binary,
+            formats=zxingcpp.BarcodeFormat.QRCode,
+            binarizer=zxingcpp.Binarizer.FixedThreshold
+        )
+        timings["detect_binarized"] = timings.get("detect_binarized", 0.0) + (time.perf_counter() - start) * 1000
+
+    if not results:
+        return [], "QR code tidak ditemukan pada gambar"
+    return [result.text for result in results], None
+
+
+def _f20221310104_parse_texts(texts: List[str], timings: Dict[str, float]) -> QrisReadResult:
+    """Parse teks QR (satu payload atau bagian multi-QR) menjadi QrisReadResult"""
+    parts = [text for text in texts if text.strip().startswith(MULTIPART_PREFIX)]
+
+    start = time.perf_counter()
+    if parts:
+        # Bagian multi-QR: gabungkan (urutan bebas) sebelum parse
+        try:
+            data = f20221310104_join_payload_parts(parts)
+        except ValueError as e:
+            timings["parse"] = (time.perf_counter() - start) * 1000
+            return QrisReadResult(None, None, timings, str(e))
+    else:
+        data = texts[0]
+    payload = f20221310104_decode_qris_data(data)
+    timings["parse"] = (time.perf_counter() - start) * 1000
+
+    if payload is None:
+        return QrisReadResult(data, None, timings, "QR code bukan QRIS digital signature")
+    return QrisReadResult(data, payload, timings)
+
+
+def f20221310104_read_qris_image(image_bytes: bytes, max_side: int = DEFAULT_MAX_SIDE) -> QrisReadResult:
+    """
+    Decode QRIS dari bytes gambar menjadi payload
+
+    Tahapan: load + downscale, deteksi QR (zxing-cpp), binarisasi dan
+    deteksi ulang jika gagal, lalu parse payload dengan
+    f20221310104_decode_qris_data. Jika gambar memuat beberapa bagian
+    multi-QR sekaligus, bagian-bagian tersebut digabung. Waktu tiap tahap
+    dicatat dalam milidetik.
+
+    Args:
+        image_bytes: Isi file gambar (PNG/JPEG)
+        max_side: Panjang maksimum sisi gambar sebelum deteksi
+
+    Returns:
+        QrisReadResult berisi data mentah QR, payload, timing, dan error
+    """
+    timings: Dict[str, float] = {}
+    texts, error = _f20221310104_detect_texts(image_bytes, max_side, timings)
+    if error is not None:
+        return QrisReadResult(None, None, timings, error)
+    return _f20221310104_parse_texts(texts, timings)
+
+
+def f20221310104_read_qris_images(images: Iterable[bytes], max_side: int = DEFAULT_MAX_SIDE) -> QrisReadResult:
+    """
+    Decode QRIS dari beberapa gambar (misalnya setiap bagian multi-QR)
+
+    Semua QR dari semua gambar dikumpulkan lalu bagian multi-QR digabung
+    dalam urutan apa saja. Waktu tiap tahap dijumlahkan untuk semua gambar.
+
+    Args:
+        images: Iterable berisi bytes gambar (PNG/JPEG)
+        max_side: Panjang maksimum sisi gambar sebelum deteksi
+
+    Returns:
+        QrisReadResult untuk payload gabungan
+    """
+    timings: Dict[str, float] = {}
+    texts: List[str] = []
+    for index, image_bytes in enumerate(images):
+        image_texts, error = _f20221310104_detect_texts(image_bytes, max_side, timings)
+        if error is not None:
+            return QrisReadResult(None, None, timings, f"Gambar {index + 1}: {error}")
+        texts.extend(image_texts)
+    if not texts:
+        return QrisReadResult(None, None, timings, "Tidak ada gambar")
+    return _f20221310104_parse_texts(texts, timings)
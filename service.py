@@ -0,0 +1,569 @@
+"""
+Digital Signature HTTP Service
+Layanan HTTP headless (asyncio, tanpa dependency tambahan) untuk signing,
+verifikasi, dan render QRIS di samping aplikasi Streamlit
+
+Jalankan:
+    python service.py --host 127.0.0.1 --port 8080
+
+Endpoint:
+    GET  /health        status layanan
+    GET  /metrics       latensi per endpoint (count, error, p50/p95/p99)
+    POST /keys          {"algorithm", "key_size"} -> pasangan kunci (RSA dari key pool) + key_id
+    POST /sign          {"message", "private_key"} -> signature
+    POST /verify        {"message", "signature", "public_key" | "key_id"} atau {"qris"} / {"parts"} (termasuk envelope)
+    POST /envelope      {"message" | "envelope", "private_key", "embed_public_keys"} -> envelope multi-signer
+    POST /qris          {"message", "signature", "public_key", "format", "embed_public_key",
+                         "error_correction" | "max_modules" | "qr_version"} -> PNG
+    POST /qris/decode   {"qris"} atau {"parts": [bagian multi-QR, urutan bebas]} -> payload
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from crypto.rsa_utils import (
+    f20221310104_export_private_key,
+    f20221310104_export_public_key,
+    f20221310104_import_private_key
+)
+from crypto.algorithms import ALGORITHM_RSA, SUPPORTED_ALGORITHMS, f20221310104_generate_signing_key_pair
+from crypto.key_registry import (
+    KeyIdCollisionError,
+    KeyNotFoundError,
+    f20221310104_get_key_registry,
+    f20221310104_resolve_public_key
+)
+from crypto.signature import SignatureEnvelope, f20221310104_get_hash_hex, f20221310104_sign_message
+from crypto.verification_cache import f20221310104_get_verification_cache, f20221310104_verify_signature_cached
+from qris.qr_generator import (
+    PAYLOAD_FORMAT_COMPACT,
+    f20221310104_create_signature_qris_artifact,
+    f20221310104_decode_envelope_payload,
+    f20221310104_decode_qris_data,
+    f20221310104_encode_envelope_payload
+)
+from qris.qr_policy import (
+    QrPolicy,
+    f20221310104_error_correction_level,
+    f20221310104_fixed_ecc_policy,
+    f20221310104_max_ecc_policy,
+    f20221310104_smallest_version_policy
+)
+
+
+# Batas ukuran body request (byte)
+MAX_BODY_BYTES = 4 * 1024 * 1024
+
+# Jumlah sampel latensi terakhir yang disimpan per endpoint
+LATENCY_WINDOW = 2048
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    """Error yang dikembalikan ke client sebagai response JSON"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class LatencyMetrics:
+    """
+    Metrik latensi per endpoint
+
+    Menyimpan total request dan error serta jendela sampel latensi terakhir
+    untuk menghitung percentile.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        """
+        Args:
+            window: Jumlah sampel latensi terakhir per endpoint
+        """
+        self._window = window
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, route: str, seconds: float, error: bool) -> None:
+        """
+        Catat satu request
+
+        Args:
+            route: Nama endpoint (misalnya "POST /sign")
+            seconds: Latensi request dalam detik
+            error: True jika response berstatus >= 400
+        """
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = {"count": 0, "errors": 0, "total": 0.0, "samples": deque(maxlen=self._window)}
+            self._routes[route] = stats
+        stats["count"] += 1
+        stats["errors"] += int(error)
+        stats["total"] += seconds
+        stats["samples"].append(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Ringkasan metrik semua endpoint
+
+        Returns:
+            Dictionary {route: {count, errors, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}
+        """
+        report = {}
+        for route, stats in self._routes.items():
+            samples = sorted(stats["samples"])
+            report[route] = {
+                "count": stats["count"],
+                "errors": stats["errors"],
+                "mean_ms": stats["total"] / stats["count"] * 1000,
+                "p50_ms": _f20221310104_percentile(samples, 50) * 1000,
+                "p95_ms": _f20221310104_percentile(samples, 95) * 1000,
+                "p99_ms": _f20221310104_percentile(samples, 99) * 1000,
+                "max_ms": samples[-1] * 1000,
+            }
+        return report
+
+
+def _f20221310104_percentile(sorted_samples: List[float], percent: float) -> float:
+    """Percentile (nearest-rank) dari sampel yang sudah terurut"""
+    index = max(0, min(len(sorted_samples) - 1, round(percent / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+@lru_cache(maxsize=32)
+def _f20221310104_private_key_from_pem(private_key_pem: str):
+    # Import private key memvalidasi ulang faktor prima (puluhan ms);
+    # cache per proses agar client yang memakai key sama tidak membayar ulang
+    return f20221310104_import_private_key(private_key_pem)
+
+
+# Job CPU-bound: fungsi top-level dengan argumen string agar bisa dijalankan
+# di thread pool maupun process pool
+
+
+def _f20221310104_job_generate_keys(key_size: int, algorithm: str = ALGORITHM_RSA) -> Dict[str, str]:
+    private_key, public_key = f20221310104_generate_signing_key_pair(algorithm, key_size)
+    return {
+        "algorithm": algorithm,
+        "private_key": f20221310104_export_private_key(private_key),
+        "public_key": f20221310104_export_public_key(public_key),
+    }
+
+
+def _f20221310104_job_sign(message: str, private_key_pem: str) -> Dict[str, str]:
+    private_key = _f20221310104_private_key_from_pem(private_key_pem)
+    return {
+        "signature": f20221310104_sign_message(message, private_key),
+        "hash": f20221310104_get_hash_hex(message),
+    }
+
+
+def _f20221310104_job_verify(
+    message: str,
+    signature: str,
+    public_key_pem: str,
+    algorithm: Optional[str] = None
+) -> Dict[str, Any]:
+    # Scan ulang QR yang sama dilayani dari cache hasil verifikasi
+    return {"valid": f20221310104_verify_signature_cached(message, signature, public_key_pem, algorithm)}
+
+
+def _f20221310104_job_verify_envelope(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Signer yang sudah pernah diverifikasi (misalnya sebelum countersign) dari cache
+    envelope = SignatureEnvelope.from_payload(payload)
+    results = envelope.verify(cache=f20221310104_get_verification_cache())
+    return {
+        "valid": all(result.valid for result in results),
+        "signers": [
+            {"key_id": entry.key_id, "algorithm": entry.algorithm, "valid": result.valid, "error": result.error}
+            for entry, result in zip(envelope.signatures, results)
+        ],
+    }
+
+
+def _f20221310104_job_sign_envelope(
+    private_key_pem: str,
+    message: Optional[str] = None,
+    encoded_envelope: Optional[str] = None,
+    embed_public_keys: Optional[bool] = None
+) -> Dict[str, Any]:
+    if encoded_envelope is not None:
+        envelope = SignatureEnvelope.from_payload(f20221310104_decode_envelope_payload(encoded_envelope))
+    else:
+        envelope = SignatureEnvelope(message)
+    entry = envelope.sign(_f20221310104_private_key_from_pem(private_key_pem))
+    return {
+        "envelope": f20221310104_encode_envelope_payload(envelope, embed_public_keys),
+        "signers": len(envelope),
+        "key_id": entry.key_id,
+        "public_key": entry.public_key_pem,
+    }
+
+
+def _f20221310104_job_render(
+    message: str,
+    signature: str,
+    public_key_pem: str,
+    payload_format: str,
+    embed_public_key: bool = True,
+    policy: Optional[QrPolicy] = None
+) -> bytes:
+    artifact = f20221310104_create_signature_qris_artifact(
+        message, signature, public_key_pem, payload_format, embed_public_key=embed_public_key, policy=policy
+    )
+    return artifact.png_bytes
+
+
+def _f20221310104_policy_from_body(body: Dict[str, Any]) -> Optional[QrPolicy]:
+    """
+    Kebijakan QR dari body request
+
+    ``qr_version`` -> ECC maksimum pada versi tersebut, ``max_modules`` ->
+    versi terkecil (``error_correction`` sebagai level minimum), hanya
+    ``error_correction`` -> level tetap. Tanpa ketiganya: default (H).
+    """
+    try:
+        if body.get("qr_version") is not None:
+            return f20221310104_max_ecc_policy(int(body["qr_version"]))
+        level = body.get("error_correction")
+        if body.get("max_modules") is not None:
+            return f20221310104_smallest_version_policy(
+                int(body["max_modules"]) or None,
+                f20221310104_error_correction_level(level or "L")
+            )
+        if level is not None:
+            return f20221310104_fixed_ecc_policy(f20221310104_error_correction_level(level))
+    except (TypeError, ValueError) as e:
+        raise HttpError(400, f"Kebijakan QR tidak valid: {e}")
+    return None
+
+
+def _f20221310104_decode_body_qris(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode field ``qris`` (satu payload) atau ``parts`` (bagian multi-QR) atau lempar HttpError 400"""
+    if "parts" in body:
+        parts = body["parts"]
+        if not isinstance(parts, list) or not parts or not all(isinstance(part, str) for part in parts):
+            raise HttpError(400, "parts harus berupa list string yang tidak kosong")
+        payload = f20221310104_decode_qris_data(parts)
+    else:
+        (encoded_data,) = _f20221310104_require(body, "qris")
+        payload = f20221310104_decode_qris_data(encoded_data)
+    if payload is None:
+        raise HttpError(400, "Data QRIS tidak valid")
+    return payload
+
+
+def _f20221310104_check_envelope_signers(signers: Any) -> None:
+    """Validasi list ``signatures`` envelope atau lempar HttpError 400"""
+    if not isinstance(signers, list) or not signers:
+        raise HttpError(400, "signatures harus berupa list yang tidak kosong")
+    for position, signer in enumerate(signers, 1):
+        if not isinstance(signer, dict):
+            raise HttpError(400, f"Signer {position} harus berupa object")
+        if not isinstance(signer.get("signature"), str) or not signer["signature"]:
+            raise HttpError(400, f"Signer {position}: signature harus berupa string")
+        for field in ("public_key", "key_id", "algorithm"):
+            if signer.get(field) is not None and not isinstance(signer[field], str):
+                raise HttpError(400, f"Signer {position}: {field} harus berupa string")
+        if not signer.get("public_key") and not signer.get("key_id"):
+            raise HttpError(400, f"Signer {position}: public_key atau key_id wajib diisi")
+
+
+def _f20221310104_require(body: Dict[str, Any], *fields: str) -> Tuple[Any, ...]:
+    """Ambil field wajib dari body JSON atau lempar HttpError 400"""
+    missing = [field for field in fields if not isinstance(body.get(field), str) or not body[field]]
+    if missing:
+        raise HttpError(400, f"Field wajib tidak ada: {', '.join(missing)}")
+    return tuple(body[field] for field in fields)
+
+
+class SignatureService:
+    """
+    Aplikasi HTTP untuk fungsi crypto dan qris
+
+    Parsing HTTP dan routing berjalan di event loop, sedangkan operasi RSA,
+    hashing, dan render QR dikirim ke executor agar tidak memblok loop.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, max_body_bytes: int = MAX_BODY_BYTES):
+        """
+        Args:
+            executor: Executor untuk pekerjaan CPU-bound (default: thread pool)
+            max_body_bytes: Batas ukuran body request
+        """
+        self.executor = executor or ThreadPoolExecutor(thread_name_prefix="digisign")
+        self.max_body_bytes = max_body_bytes
+        self.metrics = LatencyMetrics()
+        self._routes: Dict[Tuple[str, str], Callable] = {
+            ("GET", "/health"): self._handle_health,
+            ("GET", "/metrics"): self._handle_metrics,
+            ("POST", "/keys"): self._handle_keys,
+            ("POST", "/sign"): self._handle_sign,
+            ("POST", "/verify"): self._handle_verify,
+            ("POST", "/qris"): self._handle_qris,
+            ("POST", "/qris/decode"): self._handle_qris_decode,
+            ("POST", "/envelope"): self._handle_envelope,
+        }
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def _handle_health(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {"status": "ok"}
+
+    async def _handle_metrics(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        # Statistik cache verifikasi hanya mencakup proses ini (bukan worker process pool)
+        return {**self.metrics.snapshot(), "verification_cache": f20221310104_get_verification_cache().stats()}
+
+    async def _handle_keys(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        key_size = body.get("key_size", 2048)
+        if key_size not in (1024, 2048, 3072, 4096):
+            raise HttpError(400, "key_size harus 1024, 2048, 3072, atau 4096")
+        algorithm = body.get("algorithm", ALGORITHM_RSA)
+        if algorithm not in SUPPORTED_ALGORITHMS:
+            raise HttpError(400, f"algorithm harus salah satu dari: {', '.join(SUPPORTED_ALGORITHMS)}")
+        keys = await self._run(_f20221310104_job_generate_keys, key_size, algorithm)
+        # Registry di proses utama: job bisa berjalan di process pool
+        try:
+            keys["key_id"] = f20221310104_get_key_registry().register(keys["public_key"])
+        except KeyIdCollisionError as e:
+            raise HttpError(409, str(e))
+        return keys
+
+    async def _handle_sign(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        message, private_key_pem = _f20221310104_require(body, "message", "private_key")
+        try:
+            return await self._run(_f20221310104_job_sign, message, private_key_pem)
+        except (ValueError, IndexError, TypeError) as e:
+            raise HttpError(400, f"Private key tidak valid: {e}")
+
+    async def _handle_verify(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        if "qris" in body or "parts" in body:
+            body = _f20221310104_decode_body_qris(body)
+        if "signatures" in body:
+            return await self._verify_envelope(body)
+        message, signature = _f20221310104_require(body, "message", "signature")
+        try:
+            public_key_pem = f20221310104_resolve_public_key(body)
+        except KeyNotFoundError as e:
+            raise HttpError(400, str(e))
+        try:
+            return await self._run(
+                _f20221310104_job_verify, message, signature, public_key_pem, body.get("algorithm")
+            )
+        except (ValueError, IndexError, TypeError) as e:
+            raise HttpError(400, f"Public key tidak valid: {e}")
+
+    async def _verify_envelope(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        _f20221310104_require(payload, "message")
+        _f20221310104_check_envelope_signers(payload["signatures"])
+        # Key ID di-resolve di proses utama: job bisa berjalan di process pool
+        registry = f20221310104_get_key_registry()
+        signers = []
+        for signer in payload["signatures"]:
+            if not signer.get("public_key") and signer.get("key_id") in registry:
+                signer = {**signer, "public_key": registry.resolve(signer["key_id"])}
+            signers.append(signer)
+        try:
+            return await self._run(_f20221310104_job_verify_envelope, {**payload, "signatures": signers})
+        except ValueError as e:
+            raise HttpError(400, str(e))
+
+    async def _handle_envelope(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        (private_key_pem,) = _f20221310104_require(body, "private_key")
+        if "envelope" in body:
+            (encoded_envelope,) = _f20221310104_require(body, "envelope")
+            message = None
+        else:
+            (message,) = _f20221310104_require(body, "message")
+            encoded_envelope = None
+        embed_public_keys = body.get("embed_public_keys")
+        if embed_public_keys not in (None, True, False):
+            raise HttpError(400, "embed_public_keys harus true, false, atau null")
+        try:
+            result = await self._run(
+                _f20221310104_job_sign_envelope, private_key_pem, message, encoded_envelope, embed_public_keys
+            )
+        except (ValueError, IndexError, TypeError) as e:
+            raise HttpError(400, f"Envelope tidak dapat dibuat: {e}")
+        # Registry di proses utama agar layout key ID bisa diverifikasi lewat /verify
+        try:
+            f20221310104_get_key_registry().register(result.pop("public_key"))
+        except KeyIdCollisionError as e:
+            raise HttpError(409, str(e))
+        return result
+
+    async def _handle_qris(self, body: Dict[str, Any]) -> bytes:
+        message, signature, public_key_pem = _f20221310104_require(body, "message", "signature", "public_key")
+        payload_format = body.get("format", PAYLOAD_FORMAT_COMPACT)
+        embed_public_key = body.get("embed_public_key", True) is not False
+        policy = _f20221310104_policy_from_body(body)
+        try:
+            return await self._run(
+                _f20221310104_job_render, message, signature, public_key_pem, payload_format, embed_public_key, policy
+            )
+        except ValueError as e:
+            raise HttpError(400, f"QRIS tidak dapat dibuat: {e}")
+
+    async def _handle_qris_decode(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return _f20221310104_decode_body_qris(body)
+
+    async def dispatch(self, method: str, path: str, raw_body: bytes) -> Tuple[int, str, bytes]:
+        """
+        Jalankan handler untuk satu request
+
+        Args:
+            method: HTTP method
+            path: Path request (tanpa query string)
+            raw_body: Body request
+
+        Returns:
+            Tuple (status, content_type, body)
+        """
+        handler = self._routes.get((method, path))
+        try:
+            if handler is None:
+                if any(route_path == path for _, route_path in self._routes):
+                    raise HttpError(405, "Method tidak didukung")
+                raise HttpError(404, "Endpoint tidak ditemukan")
+
+            body: Dict[str, Any] = {}
+            if raw_body:
+                try:
+                    body = json.loads(raw_body)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    raise HttpError(400, "Body harus JSON")
+                if not isinstance(body, dict):
+                    raise HttpError(400, "Body harus object JSON")
+
+            result = await handler(body)
+            if isinstance(result, bytes):
+                return 200, "image/png", result
+            return 200, "application/json", json.dumps(result, ensure_ascii=False).encode('utf-8')
+        except HttpError as e:
+            return e.status, "application/json", json.dumps({"error": e.message}).encode('utf-8')
+        except Exception as e:
+            return 500, "application/json", json.dumps({"error": str(e)}).encode('utf-8')
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Layani satu koneksi HTTP/1.1 (mendukung keep-alive)
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                start = time.perf_counter()
+                lines = head.decode('latin-1').split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                path = target.split("?", 1)[0]
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                try:
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    length = -1
+                if length < 0 or length > self.max_body_bytes:
+                    status, content_type = 413 if length > 0 else 400, "application/json"
+                    payload = json.dumps({"error": "Content-Length tidak valid"}).encode('utf-8')
+                    keep_alive = False
+                else:
+                    raw_body = await reader.readexactly(length) if length else b""
+                    status, content_type, payload = await self.dispatch(method, path, raw_body)
+
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                    + payload
+                )
+                await writer.drain()
+
+                route = f"{method} {path}" if (method, path) in self._routes else "unmatched"
+                self.metrics.record(route, time.perf_counter() - start, status >= 400)
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def f20221310104_serve(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    executor: Optional[Executor] = None
+) -> None:
+    """
+    Jalankan layanan HTTP sampai dihentikan
+
+    Args:
+        host: Alamat bind
+        port: Port bind
+        executor: Executor untuk pekerjaan CPU-bound
+    """
+    service = SignatureService(executor)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def f20221310104_main() -> None:
+    """Entry point command line"""
+    parser = argparse.ArgumentParser(description="DigiSign HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah worker executor")
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Gunakan process pool (multi-core) alih-alih thread pool"
+    )
+    args = parser.parse_args()
+
+    if args.processes:
+        executor: Executor = ProcessPoolExecutor(max_workers=args.workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="digisign")
+
+    print(f"DigiSign service listening on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(f20221310104_serve(args.host, args.port, executor))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    f20221310104_main()
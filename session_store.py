@@ -0,0 +1,366 @@
+"""
+Session Store Module
+State penandatanganan per sesi Streamlit yang ringkas dengan spill/eviksi
+
+Setiap sesi hanya menyimpan referensi private key, key ID, signature mentah
+(bytes), dan QRIS yang sudah dienkode PNG (satu atau beberapa bagian
+multi-QR). Public key PEM tidak disalin per sesi: PEM diambil dari key
+registry (satu salinan per key untuk seluruh proses) dan key object-nya
+dari cache import public key.
+
+Sesi yang tidak aktif selama SESSION_SPILL_AFTER detik memindahkan
+signature dan PNG QRIS ke file sementara; setelah SESSION_EVICT_AFTER detik
+seluruh state sesi (termasuk referensi private key) dibuang. Private key
+tidak pernah ditulis ke file spill.
+"""
+
+import base64
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import crypto
+import qris
+
+
+# Detik tanpa aktivitas sebelum signature/QRIS dipindah ke disk
+SESSION_SPILL_AFTER = 300.0
+
+# Detik tanpa aktivitas sebelum state sesi dibuang seluruhnya
+SESSION_EVICT_AFTER = 1800.0
+
+# Interval minimum antar sweep otomatis (detik)
+SWEEP_INTERVAL = 30.0
+
+
+def _f20221310104_key_memory(key: Any) -> int:
+    """Perkiraan memori komponen key (bilangan besar) dalam byte"""
+    if key is None:
+        return 0
+    if crypto.f20221310104_key_algorithm(key) == crypto.ALGORITHM_RSA:
+        components = ("n", "e", "d", "p", "q", "u") if key.has_private() else ("n", "e")
+        values = [getattr(key, component) for component in components]
+    else:
+        values = [key.pointQ.x, key.pointQ.y]
+        if key.has_private():
+            values.append(key.d)
+    return sys.getsizeof(key) + sum(sys.getsizeof(int(value)) for value in values)
+
+
+class SigningSession:
+    """
+    State penandatanganan satu sesi
+
+    Memakai ``__slots__`` sehingga tidak ada ``__dict__`` per instance;
+    public key diturunkan dari key ID saat dibutuhkan.
+    """
+
+    __slots__ = (
+        "session_id",
+        "private_key",
+        "key_id",
+        "signature",
+        "qris_artifacts",
+        "last_access",
+        "spill_path",
+    )
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.private_key = None
+        self.key_id: Optional[str] = None
+        self.signature: Optional[bytes] = None
+        self.qris_artifacts: Tuple[Any, ...] = ()
+        self.last_access = time.monotonic()
+        self.spill_path: Optional[str] = None
+
+    def set_key(self, private_key: Any, public_key_pem: Optional[str] = None) -> str:
+        """
+        Jadikan private key sebagai kunci aktif dan daftarkan public key-nya
+
+        Args:
+            private_key: Private key (RSA atau ECC)
+            public_key_pem: Public key PEM jika sudah diketahui (misalnya dari
+                index keystore) agar tidak perlu export ulang
+
+        Returns:
+            Key ID dari public key
+        """
+        public_key_pem = public_key_pem or crypto.f20221310104_export_public_key(private_key.public_key())
+        self.private_key = private_key
+        # Registry menyimpan satu salinan PEM per key untuk seluruh proses
+        self.key_id = crypto.f20221310104_get_key_registry().register(public_key_pem)
+        return self.key_id
+
+    @property
+    def public_key_pem(self) -> Optional[str]:
+        """Public key PEM dari key registry (None jika belum ada kunci)"""
+        if self.key_id is None:
+            return None
+        return crypto.f20221310104_get_key_registry().resolve(self.key_id)
+
+    @property
+    def public_key(self) -> Any:
+        """Public key object dari cache import (dipakai bersama antar sesi)"""
+        public_key_pem = self.public_key_pem
+        if public_key_pem is None:
+            return None
+        return crypto.f20221310104_import_public_key_cached(public_key_pem)
+
+    @property
+    def signature_b64(self) -> Optional[str]:
+        """Signature dalam bentuk base64 (None jika belum ada)"""
+        if self.signature is None:
+            return None
+        return base64.b64encode(self.signature).decode('ascii')
+
+    @property
+    def spilled(self) -> bool:
+        """True jika signature/QRIS sedang berada di file spill"""
+        return self.spill_path is not None
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Perkiraan memori yang dipegang sesi ini
+
+        Returns:
+            Dictionary {key, signature, qris, total} dalam byte
+        """
+        signature = sys.getsizeof(self.signature) if self.signature is not None else 0
+        qris = sys.getsizeof(self.qris_artifacts) + sum(
+            sys.getsizeof(artifact) + sys.getsizeof(artifact.png_bytes) for artifact in self.qris_artifacts
+        )
+        key = _f20221310104_key_memory(self.private_key)
+        return {
+            "key": key,
+            "signature": signature,
+            "qris": qris,
+            "total": sys.getsizeof(self) + key + signature + qris,
+        }
+
+    def _spill(self, directory: str) -> None:
+        """Pindahkan signature dan PNG QRIS ke file lalu lepaskan dari memori"""
+        if self.spilled or (self.signature is None and not self.qris_artifacts):
+            return
+        # Header JSON berisi metadata tiap QR (tanpa PNG) lalu PNG disambung
+        header = {
+            "signature": self.signature_b64,
+            "artifacts": [
+                {field: value for field, value in artifact._asdict().items() if field != "png_bytes"}
+                for artifact in self.qris_artifacts
+            ],
+            "png_lengths": [len(artifact.png_bytes) for artifact in self.qris_artifacts],
+        }
+        path = os.path.join(directory, f"{self.session_id}.spill")
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b"\n")
+            for artifact in self.qris_artifacts:
+                f.write(artifact.png_bytes)
+        self.signature = None
+        self.qris_artifacts = ()
+        self.spill_path = path
+
+    def _restore(self) -> None:
+        """Muat kembali signature dan PNG QRIS dari file spill"""
+        if not self.spilled:
+            return
+        with open(self.spill_path, 'rb') as f:
+            header = json.loads(f.readline())
+            self.qris_artifacts = tuple(
+                qris.QrisArtifact(**dict(metadata, png_bytes=f.read(length)))
+                for metadata, length in zip(header["artifacts"], header["png_lengths"])
+            )
+        if header.get("signature") is not None:
+            self.signature = base64.b64decode(header["signature"])
+        self._discard_spill()
+
+    def _discard_spill(self) -> None:
+        if self.spill_path is not None:
+            try:
+                os.remove(self.spill_path)
+            except FileNotFoundError:
+                pass
+            self.spill_path = None
+
+
+class SessionStore:
+    """
+    Kumpulan SigningSession per proses dengan spill dan eviksi saat idle
+
+    Sweep dijalankan otomatis dari ``get`` paling sering sekali per
+    SWEEP_INTERVAL detik sehingga tidak butuh thread latar.
+    """
+
+    def __init__(
+        self,
+        spill_after: float = SESSION_SPILL_AFTER,
+        evict_after: float = SESSION_EVICT_AFTER,
+        spill_dir: Optional[str] = None
+    ):
+        """
+        Args:
+            spill_after: Detik idle sebelum signature/QRIS di-spill ke disk
+            evict_after: Detik idle sebelum state sesi dibuang
+            spill_dir: Direktori file spill (default: direktori sementara
+                yang dibuat saat spill pertama)
+        """
+        if not 0 < spill_after <= evict_after:
+            raise ValueError("Harus 0 < spill_after <= evict_after")
+
+        self._spill_after = spill_after
+        self._evict_after = evict_after
+        self._spill_dir = spill_dir
+        self._owns_spill_dir = spill_dir is None
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, SigningSession] = {}
+        self._last_sweep = time.monotonic()
+        self._spills = 0
+        self._restores = 0
+        self._evictions = 0
+
+    def _spill_directory(self) -> str:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="digisign-sessions-")
+        return self._spill_dir
+
+    def new_session_id(self) -> str:
+        """Buat ID sesi acak"""
+        return uuid.uuid4().hex
+
+    def get(self, session_id: str) -> SigningSession:
+        """
+        Ambil (atau buat) state sesi dan tandai sebagai aktif
+
+        Signature/QRIS yang sudah di-spill dimuat kembali dari disk.
+
+        Args:
+            session_id: ID sesi
+
+        Returns:
+            SigningSession
+        """
+        now = time.monotonic()
+        if now - self._last_sweep >= SWEEP_INTERVAL:
+            self.sweep(now)
+
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = SigningSession(session_id)
+            session.last_access = now
+            if session.spilled:
+                session._restore()
+                self._restores += 1
+            return session
+
+    def sweep(self, now: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Spill sesi yang idle dan buang sesi yang sudah terlalu lama idle
+
+        Args:
+            now: Waktu monotonic saat ini (default: time.monotonic())
+
+        Returns:
+            Tuple (jumlah sesi yang di-spill, jumlah sesi yang dibuang)
+        """
+        now = time.monotonic() if now is None else now
+        spilled = evicted = 0
+        with self._lock:
+            self._last_sweep = now
+            for session_id, session in list(self._sessions.items()):
+                idle = now - session.last_access
+                if idle >= self._evict_after:
+                    session._discard_spill()
+                    del self._sessions[session_id]
+                    evicted += 1
+                elif idle >= self._spill_after and not session.spilled:
+                    if session.signature is not None or session.qris_artifacts:
+                        session._spill(self._spill_directory())
+                        spilled += 1
+            self._spills += spilled
+            self._evictions += evicted
+        return spilled, evicted
+
+    def discard(self, session_id: str) -> None:
+        """Buang state satu sesi beserta file spill-nya"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                session._discard_spill()
+
+    def close(self) -> None:
+        """Buang semua sesi dan hapus direktori spill milik store"""
+        with self._lock:
+            for session in self._sessions.values():
+                session._discard_spill()
+            self._sessions.clear()
+            if self._owns_spill_dir and self._spill_dir is not None:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                self._spill_dir = None
+
+    def memory_report(self) -> List[Dict[str, Any]]:
+        """
+        Laporan memori per sesi, terbesar lebih dulu
+
+        Returns:
+            List dictionary {session, idle_s, spilled, key_bytes,
+            signature_bytes, qris_bytes, total_bytes}
+        """
+        now = time.monotonic()
+        with self._lock:
+            sessions = list(self._sessions.values())
+        rows = []
+        for session in sessions:
+            usage = session.memory_usage()
+            rows.append({
+                "session": session.session_id[:8],
+                "idle_s": round(now - session.last_access, 1),
+                "spilled": session.spilled,
+                "key_bytes": usage["key"],
+                "signature_bytes": usage["signature"],
+                "qris_bytes": usage["qris"],
+                "total_bytes": usage["total"],
+            })
+        rows.sort(key=lambda row: row["total_bytes"], reverse=True)
+        return rows
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistik store
+
+        Returns:
+            Dictionary {sessions, spilled, spills, restores, evictions,
+            total_bytes}
+        """
+        rows = self.memory_report()
+        return {
+            "sessions": len(rows),
+            "spilled": sum(1 for row in rows if row["spilled"]),
+            "spills": self._spills,
+            "restores": self._restores,
+            "evictions": self._evictions,
+            "total_bytes": sum(row["total_bytes"] for row in rows),
+        }
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+_f20221310104_session_store = SessionStore()
+
+
+def f20221310104_get_session_store() -> SessionStore:
+    """
+    Dapatkan instance SessionStore bersama (satu per proses)
+
+    Returns:
+        SessionStore bersama
+    """
+    return _f20221310104_session_store
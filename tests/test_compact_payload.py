@@ -0,0 +1,38 @@
+"""Dekompresi body payload compact (DS2/DS3)"""
+
+import zlib
+
+import pytest
+
+from qris.qr_generator import (
+    COMPACT_PREFIX,
+    ENVELOPE_PREFIX,
+    MAX_DECOMPRESSED_BYTES,
+    _f20221310104_base45_encode,
+    f20221310104_decode_compact_payload,
+    f20221310104_decode_envelope_payload,
+)
+
+# Byte versi + flag zlib di depan body
+COMPACT_HEADER = bytes([0x02, 0x01])
+ENVELOPE_HEADER = bytes([0x03, 0x01])
+
+
+@pytest.mark.parametrize("prefix, header, decode", [
+    (COMPACT_PREFIX, COMPACT_HEADER, f20221310104_decode_compact_payload),
+    (ENVELOPE_PREFIX, ENVELOPE_HEADER, f20221310104_decode_envelope_payload),
+])
+def test_decode_rejects_oversized_decompression(prefix, header, decode):
+    bomb = zlib.compress(bytes(MAX_DECOMPRESSED_BYTES + 1), 9)
+    encoded_data = prefix + _f20221310104_base45_encode(header + bomb)
+
+    with pytest.raises(ValueError, match="melebihi"):
+        decode(encoded_data)
+
+
+def test_decode_rejects_truncated_stream():
+    body = zlib.compress(b"\x01\x05Halo!" * 20, 9)
+    encoded_data = COMPACT_PREFIX + _f20221310104_base45_encode(COMPACT_HEADER + body[:-4])
+
+    with pytest.raises(ValueError, match="terpotong"):
+        f20221310104_decode_compact_payload(encoded_data)
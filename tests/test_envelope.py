@@ -0,0 +1,98 @@
+"""Envelope multi-signer dan endpoint /verify untuk envelope"""
+
+import asyncio
+import json
+
+import pytest
+
+from crypto.algorithms import (
+    ALGORITHM_ECDSA_P256,
+    ALGORITHM_ED25519,
+    ALGORITHM_RSA,
+    f20221310104_generate_signing_key_pair,
+)
+from crypto.signature import SignatureEnvelope, f20221310104_sign_message
+from service import SignatureService
+
+ALGORITHMS = (ALGORITHM_RSA, ALGORITHM_ECDSA_P256, ALGORITHM_ED25519)
+
+
+@pytest.fixture(scope="module")
+def private_keys():
+    return [f20221310104_generate_signing_key_pair(algorithm)[0] for algorithm in ALGORITHMS]
+
+
+@pytest.fixture
+def envelope(private_keys):
+    envelope = SignatureEnvelope("Kontrak kerja sama")
+    for private_key in private_keys:
+        envelope.sign(private_key)
+    return envelope
+
+
+def _f20221310104_dispatch(path: str, body: dict):
+    service = SignatureService()
+    try:
+        status, _, payload = asyncio.run(service.dispatch("POST", path, json.dumps(body).encode('utf-8')))
+    finally:
+        service.executor.shutdown()
+    return status, json.loads(payload)
+
+
+def test_multi_signer_sign_and_roundtrip(envelope):
+    assert len(envelope) == len(ALGORITHMS)
+    assert [entry.algorithm for entry in envelope.signatures] == list(ALGORITHMS)
+    assert envelope.is_valid()
+
+    restored = SignatureEnvelope.from_payload(envelope.to_payload())
+    assert restored.digest == envelope.digest
+    assert restored.is_valid()
+
+
+def test_incremental_verify_flags_only_tampered_signer(envelope, private_keys, monkeypatch):
+    checked = []
+    original_check = SignatureEnvelope._check
+
+    def counting_check(self, index, *args):
+        checked.append(index)
+        return original_check(self, index, *args)
+
+    monkeypatch.setattr(SignatureEnvelope, "_check", counting_check)
+    assert all(result.valid for result in envelope.verify())
+    assert checked == [0, 1, 2]
+
+    # Signer baru dengan signature atas pesan lain (key ID berbeda agar tidak
+    # ditolak sebagai duplikat): hanya signer ini yang diperiksa
+    forged = f20221310104_sign_message("Kontrak lain", private_keys[1])
+    envelope.add(forged, envelope.signatures[1].public_key_pem, key_id="00" * 8)
+    checked.clear()
+    results = envelope.verify()
+
+    assert checked == [3]
+    assert [result.valid for result in results] == [True, True, True, False]
+    assert results[3].error
+
+
+def test_verify_endpoint_reports_tampered_signer(envelope):
+    payload = envelope.to_payload()
+    payload["signatures"][2]["signature"] = payload["signatures"][0]["signature"]
+
+    status, result = _f20221310104_dispatch("/verify", payload)
+
+    assert status == 200
+    assert result["valid"] is False
+    assert [signer["valid"] for signer in result["signers"]] == [True, True, False]
+
+
+@pytest.mark.parametrize("signatures", [
+    [],
+    ["bukan object"],
+    [{"public_key": "x"}],
+    [{"signature": "abc"}],
+    [{"signature": "abc", "key_id": 123}],
+])
+def test_verify_endpoint_rejects_malformed_signer(signatures):
+    status, result = _f20221310104_dispatch("/verify", {"message": "Halo", "signatures": signatures})
+
+    assert status == 400
+    assert result["error"]
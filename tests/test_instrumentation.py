@@ -0,0 +1,62 @@
+"""Scope tracing per sesi pada instrumentation"""
+
+import threading
+
+import pytest
+
+from instrumentation import (
+    f20221310104_get_stage_stats,
+    f20221310104_stage,
+    f20221310104_traced,
+    f20221310104_tracing_enabled,
+    f20221310104_tracing_scope,
+)
+
+
+@f20221310104_traced("test.work")
+def _f20221310104_work() -> int:
+    return 1
+
+
+def test_scope_records_only_inside_block():
+    histograms = {}
+    with f20221310104_tracing_scope(histograms):
+        assert f20221310104_tracing_enabled()
+        _f20221310104_work()
+        with f20221310104_stage("test.block"):
+            pass
+
+    assert set(histograms) == {"test.work", "test.block"}
+    assert not f20221310104_tracing_enabled()
+    _f20221310104_work()
+    assert histograms["test.work"].count == 1
+    assert f20221310104_get_stage_stats() == {}
+
+
+def test_scope_left_by_exception_does_not_leak():
+    with pytest.raises(RuntimeError):
+        with f20221310104_tracing_scope({}):
+            raise RuntimeError("sesi ditutup")
+
+    assert not f20221310104_tracing_enabled()
+    with f20221310104_stage("test.after") as stage:
+        assert stage is None
+
+
+def test_scope_is_not_visible_to_other_threads():
+    inside = threading.Event()
+    release = threading.Event()
+
+    def session():
+        with f20221310104_tracing_scope({}):
+            inside.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=session)
+    thread.start()
+    try:
+        assert inside.wait(5)
+        assert not f20221310104_tracing_enabled()
+    finally:
+        release.set()
+        thread.join()
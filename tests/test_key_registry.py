@@ -0,0 +1,67 @@
+"""Registry public key berdasarkan key ID"""
+
+import hashlib
+
+import pytest
+
+from crypto import key_registry
+from crypto.algorithms import ALGORITHM_ECDSA_P256, f20221310104_generate_signing_key_pair
+from crypto.key_registry import KeyIdCollisionError, KeyNotFoundError, KeyRegistry
+from crypto.rsa_utils import f20221310104_export_public_key
+
+
+def _f20221310104_public_key_pem() -> str:
+    private_key, _ = f20221310104_generate_signing_key_pair(ALGORITHM_ECDSA_P256)
+    return f20221310104_export_public_key(private_key.public_key())
+
+
+def test_register_and_resolve():
+    registry = KeyRegistry()
+    public_key_pem = _f20221310104_public_key_pem()
+    key_id = registry.register(public_key_pem, label="kantor")
+
+    assert len(key_id) == key_registry.KEY_ID_LENGTH
+    assert registry.resolve(key_id.upper()) == public_key_pem
+    assert registry.label(key_id) == "kantor"
+    with pytest.raises(KeyNotFoundError):
+        registry.resolve("0" * key_registry.KEY_ID_LENGTH)
+
+
+def test_same_key_can_be_registered_again():
+    registry = KeyRegistry()
+    public_key_pem = _f20221310104_public_key_pem()
+    key_id = registry.register(public_key_pem)
+
+    assert registry.register(public_key_pem.replace("\n", "\r\n"), label="baru") == key_id
+    assert registry.label(key_id) == "baru"
+
+
+def test_colliding_key_id_does_not_replace_trusted_key(monkeypatch):
+    # Fingerprint palsu: prefix (key ID) sama untuk semua key, sisanya berbeda
+    monkeypatch.setattr(
+        key_registry,
+        "f20221310104_public_key_fingerprint",
+        lambda pem: "0" * key_registry.KEY_ID_LENGTH + hashlib.sha256(pem.encode()).hexdigest()
+    )
+    registry = KeyRegistry()
+    trusted_pem = _f20221310104_public_key_pem()
+    key_id = registry.register(trusted_pem)
+
+    with pytest.raises(KeyIdCollisionError):
+        registry.register(_f20221310104_public_key_pem())
+    assert registry.resolve(key_id) == trusted_pem
+
+
+@pytest.mark.parametrize("filename", ["registry.db", "registry.json"])
+def test_registry_persists(tmp_path, filename):
+    path = str(tmp_path / filename)
+    public_key_pem = _f20221310104_public_key_pem()
+    registry = KeyRegistry(path)
+    key_id = registry.register(public_key_pem, label="kantor")
+    registry.close()
+
+    reopened = KeyRegistry(path)
+    assert reopened.resolve(key_id) == public_key_pem
+    assert reopened.label(key_id) == "kantor"
+    assert len(reopened) == 1
+    reopened.close()
@@ -0,0 +1,59 @@
+"""Penyimpanan private key terenkripsi di keystore"""
+
+import os
+
+import pytest
+
+from crypto import keystore as keystore_module
+from crypto.algorithms import ALGORITHM_ECDSA_P256, f20221310104_generate_signing_key_pair
+from crypto.key_registry import KeyNotFoundError
+from crypto.keystore import IncorrectPassphraseError, KeyStore, f20221310104_open_keystore
+
+
+@pytest.fixture
+def private_key():
+    return f20221310104_generate_signing_key_pair(ALGORITHM_ECDSA_P256)[0]
+
+
+def test_save_load_roundtrip(tmp_path, private_key):
+    key_id = KeyStore(str(tmp_path), "rahasia").save(private_key, label="kantor")
+
+    loaded = KeyStore(str(tmp_path), "rahasia").load(key_id)
+    assert loaded == private_key
+    assert oct(os.stat(tmp_path / f"{key_id}.pem").st_mode & 0o777) == "0o600"
+
+
+def test_wrong_passphrase_raises(tmp_path, private_key):
+    key_id = KeyStore(str(tmp_path), "rahasia").save(private_key)
+
+    with pytest.raises(IncorrectPassphraseError):
+        KeyStore(str(tmp_path), "salah").load(key_id)
+
+
+def test_index_persists_without_passphrase(tmp_path, private_key):
+    writer = KeyStore(str(tmp_path), "rahasia")
+    key_id = writer.save(private_key, label="kantor")
+
+    reader = KeyStore(str(tmp_path))
+    entry = reader.entry(key_id)
+    assert (entry.label, entry.algorithm) == ("kantor", ALGORITHM_ECDSA_P256)
+    assert [item.key_id for item in reader.entries()] == [key_id]
+
+    writer.delete(key_id)
+    assert reader.entries() == []
+    with pytest.raises(KeyNotFoundError):
+        KeyStore(str(tmp_path)).entry(key_id)
+
+
+def test_open_keystore_is_bounded_and_creates_no_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(keystore_module, "_f20221310104_keystores", keystore_module.OrderedDict())
+    directory = tmp_path / "keystore"
+
+    first = f20221310104_open_keystore("0", str(directory))
+    assert f20221310104_open_keystore("0", str(directory)) is first
+    for index in range(1, keystore_module.MAX_OPEN_KEYSTORES + 1):
+        f20221310104_open_keystore(str(index), str(directory))
+
+    assert len(keystore_module._f20221310104_keystores) == keystore_module.MAX_OPEN_KEYSTORES
+    assert f20221310104_open_keystore("0", str(directory)) is not first
+    assert not directory.exists()
@@ -0,0 +1,74 @@
+"""Pemecahan dan penggabungan payload multi-QR"""
+
+import random
+import string
+
+import pytest
+
+from crypto.algorithms import ALGORITHM_ECDSA_P256, f20221310104_generate_signing_key_pair
+from crypto.rsa_utils import f20221310104_export_public_key
+from crypto.signature import f20221310104_sign_message
+from qris.qr_generator import (
+    MAX_PAYLOAD_PARTS,
+    PAYLOAD_FORMAT_COMPACT,
+    f20221310104_decode_qris_data,
+    f20221310104_encode_qris_payload,
+    f20221310104_join_payload_parts,
+    f20221310104_split_payload,
+)
+
+# Panjang header "DSM:" + index + total - 1 + parity + ":"
+HEADER_LENGTH = 9
+MAX_PART_LENGTH = 40
+
+
+def _f20221310104_payload(parts: int) -> str:
+    """Payload compact yang tepat membutuhkan ``parts`` bagian"""
+    rng = random.Random(parts)
+    length = parts * (MAX_PART_LENGTH - HEADER_LENGTH) - len("DS2:")
+    return "DS2:" + "".join(rng.choice(string.ascii_uppercase + string.digits) for _ in range(length))
+
+
+@pytest.mark.parametrize("total", [2, MAX_PAYLOAD_PARTS - 1, MAX_PAYLOAD_PARTS])
+def test_split_join_roundtrip(total):
+    encoded_data = _f20221310104_payload(total)
+    parts = f20221310104_split_payload(encoded_data, MAX_PART_LENGTH)
+
+    assert len(parts) == total
+    assert all(len(part) <= MAX_PART_LENGTH for part in parts)
+    assert f20221310104_join_payload_parts(reversed(parts)) == encoded_data
+
+
+def test_decode_signed_payload_at_limit():
+    private_key, _ = f20221310104_generate_signing_key_pair(ALGORITHM_ECDSA_P256)
+    public_key_pem = f20221310104_export_public_key(private_key.public_key())
+    message = random.Random(0).randbytes(600).hex()
+    signature = f20221310104_sign_message(message, private_key)
+    encoded_data = f20221310104_encode_qris_payload(message, signature, public_key_pem, PAYLOAD_FORMAT_COMPACT)
+
+    chunk_length = -(-len(encoded_data) // MAX_PAYLOAD_PARTS)
+    parts = f20221310104_split_payload(encoded_data, chunk_length + HEADER_LENGTH)
+    assert len(parts) == MAX_PAYLOAD_PARTS
+
+    payload = f20221310104_decode_qris_data(parts[::-1])
+    assert payload["message"] == message
+    assert payload["signature"] == signature
+
+
+def test_split_rejects_more_than_limit():
+    with pytest.raises(ValueError):
+        f20221310104_split_payload(_f20221310104_payload(MAX_PAYLOAD_PARTS + 1), MAX_PART_LENGTH)
+
+
+def test_join_reports_missing_part():
+    parts = f20221310104_split_payload(_f20221310104_payload(MAX_PAYLOAD_PARTS), MAX_PART_LENGTH)
+    with pytest.raises(ValueError, match="belum lengkap"):
+        f20221310104_join_payload_parts(parts[1:])
+
+
+def test_join_keeps_trailing_space_in_chunk():
+    encoded_data = "DS2:ABC DEFGHIJK"
+    parts = f20221310104_split_payload(encoded_data, HEADER_LENGTH + 4)
+
+    assert parts[1].endswith("ABC ")
+    assert f20221310104_join_payload_parts(parts) == encoded_data
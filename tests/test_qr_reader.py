@@ -0,0 +1,26 @@
+"""Pembacaan QRIS dari gambar upload"""
+
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from qris import qr_reader
+from qris.qr_reader import f20221310104_read_qris_images
+
+pytestmark = pytest.mark.skipif(qr_reader.zxingcpp is None, reason="zxing-cpp belum terinstall")
+
+
+def _f20221310104_png(size: int) -> bytes:
+    buffer = BytesIO()
+    Image.new('L', (size, size), 255).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def test_decompression_bomb_returns_error_result(monkeypatch):
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 100)
+
+    result = f20221310104_read_qris_images([_f20221310104_png(64)])
+
+    assert result.payload is None
+    assert "tidak dapat dibaca" in result.error
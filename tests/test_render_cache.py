@@ -0,0 +1,14 @@
+"""Key cache dan tier disk QrRenderCache"""
+
+from qris.qr_generator import QrRenderCache, f20221310104_render_qris_cached
+
+
+def test_disk_roundtrip_with_default_compress_level_and_wide_border(tmp_path):
+    options = {"box_size": 1, "border": 300, "compress_level": -1}
+    matrix, png_bytes = f20221310104_render_qris_cached(
+        "DS2:ABC", cache=QrRenderCache(disk_dir=str(tmp_path)), **options
+    )
+
+    cache = QrRenderCache(disk_dir=str(tmp_path))
+    assert f20221310104_render_qris_cached("DS2:ABC", cache=cache, **options) == (matrix, png_bytes)
+    assert cache.stats()["disk_hits"] == 1
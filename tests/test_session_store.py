@@ -0,0 +1,75 @@
+"""Spill, restore, dan eviksi state sesi di SessionStore"""
+
+import os
+
+import pytest
+
+from qris.qr_generator import PAYLOAD_FORMAT_COMPACT, QrisArtifact
+from session_store import SessionStore
+
+SIGNATURE = bytes(range(256))
+ARTIFACTS = (
+    QrisArtifact(b"\x89PNG bagian 1" + bytes(300), 370, 370, PAYLOAD_FORMAT_COMPACT, 120, part_total=2),
+    QrisArtifact(b"\x89PNG bagian 2\n\x00", 370, 370, PAYLOAD_FORMAT_COMPACT, 80, part_index=1, part_total=2),
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(spill_after=10, evict_after=60, spill_dir=str(tmp_path))
+    yield store
+    store.close()
+
+
+def _f20221310104_signed_session(store):
+    session = store.get(store.new_session_id())
+    session.signature = SIGNATURE
+    session.qris_artifacts = ARTIFACTS
+    return session
+
+
+def test_spill_and_restore_keep_bytes_intact(store):
+    session = _f20221310104_signed_session(store)
+
+    assert store.sweep(session.last_access + 5) == (0, 0)
+    assert store.sweep(session.last_access + 10) == (1, 0)
+    assert session.spilled and session.signature is None and session.qris_artifacts == ()
+    spill_path = session.spill_path
+    assert os.path.exists(spill_path)
+
+    restored = store.get(session.session_id)
+    assert restored is session
+    assert restored.signature == SIGNATURE
+    assert restored.qris_artifacts == ARTIFACTS
+    assert not restored.spilled and not os.path.exists(spill_path)
+    assert store.stats()["restores"] == 1
+
+
+def test_evict_removes_session_and_spill_file(store):
+    session = _f20221310104_signed_session(store)
+    store.sweep(session.last_access + 10)
+    spill_path = session.spill_path
+
+    assert store.sweep(session.last_access + 60) == (0, 1)
+    assert len(store) == 0
+    assert not os.path.exists(spill_path)
+
+
+def test_close_removes_spill_files(store):
+    session = _f20221310104_signed_session(store)
+    store.sweep(session.last_access + 10)
+    spill_path = session.spill_path
+
+    store.close()
+    assert len(store) == 0
+    assert not os.path.exists(spill_path)
+
+
+def test_close_removes_owned_spill_directory():
+    store = SessionStore(spill_after=1, evict_after=2)
+    session = _f20221310104_signed_session(store)
+    store.sweep(session.last_access + 1)
+    directory = os.path.dirname(session.spill_path)
+
+    store.close()
+    assert not os.path.exists(directory)
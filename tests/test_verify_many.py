@@ -0,0 +1,63 @@
+"""Verifikasi batch: hasil per payload dan resolusi key ID/algoritma"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from crypto.algorithms import ALGORITHM_ECDSA_P256, ALGORITHM_RSA, f20221310104_generate_signing_key_pair
+from crypto.key_registry import f20221310104_get_key_registry
+from crypto.rsa_utils import f20221310104_export_public_key
+from crypto.signature import f20221310104_sign_message, f20221310104_verify_many
+from qris.qr_generator import (
+    PAYLOAD_FORMAT_COMPACT,
+    PAYLOAD_FORMAT_JSON,
+    f20221310104_decode_qris_data,
+    f20221310104_encode_qris_payload,
+)
+
+
+def _f20221310104_signed(algorithm, message):
+    private_key, _ = f20221310104_generate_signing_key_pair(algorithm)
+    public_key_pem = f20221310104_export_public_key(private_key.public_key())
+    return public_key_pem, f20221310104_sign_message(message, private_key)
+
+
+def test_malformed_item_does_not_abort_batch():
+    public_key_pem, signature = _f20221310104_signed(ALGORITHM_RSA, "a")
+    results = list(f20221310104_verify_many([
+        {"message": "a", "signature": signature, "public_key": public_key_pem},
+        {"message": "a", "signature": signature, "public_key": None},
+        {"message": "a", "signature": signature, "public_key": 123},
+        ("a", signature, public_key_pem),
+    ]))
+
+    assert [result.valid for result in results] == [True, False, False, True]
+    assert all(result.error for result in results if not result.valid)
+
+
+def test_key_id_payloads_and_algorithm():
+    public_key_pem, signature = _f20221310104_signed(ALGORITHM_ECDSA_P256, "b")
+    f20221310104_get_key_registry().register(public_key_pem)
+    payloads = [
+        f20221310104_decode_qris_data(
+            f20221310104_encode_qris_payload("b", signature, public_key_pem, payload_format, embed_public_key=False)
+        )
+        for payload_format in (PAYLOAD_FORMAT_JSON, PAYLOAD_FORMAT_COMPACT)
+    ]
+    payloads.append({"message": "b", "signature": signature, "public_key": public_key_pem, "algorithm": ALGORITHM_RSA})
+    payloads.append({"message": "b", "signature": signature, "key_id": "tidak-terdaftar"})
+
+    results = list(f20221310104_verify_many(payloads))
+
+    assert [result.valid for result in results] == [True, True, False, False]
+
+
+def test_caller_executor_is_reused_and_not_shut_down():
+    public_key_pem, signature = _f20221310104_signed(ALGORITHM_ECDSA_P256, "c")
+    payloads = [("c", signature, public_key_pem)] * 10 + [("x", signature, public_key_pem)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for _ in range(2):
+            results = list(f20221310104_verify_many(
+                payloads, chunk_size=3, max_workers=2, serial_threshold=2, executor=executor
+            ))
+            assert [result.valid for result in results] == [True] * 10 + [False]
+        assert executor.submit(lambda: 1).result() == 1